@@ -80,6 +80,14 @@ def main() -> None:
     controller = build_controller_from_env(core_api=core_api, apps_api=apps_api)
 
     leader_election_enabled = _parse_bool_env("LEADER_ELECTION_ENABLED", default=True)
+    if leader_election_enabled and controller.hash_state_path:
+        # Another replica can lead between this replica's terms, so a file it
+        # wrote when losing the lease may not describe the deployments when it
+        # wins the lease back.
+        logging.getLogger(__name__).warning(
+            "HASH_STATE_PATH is ignored while leader election is enabled"
+        )
+        controller.hash_state_path = None
     leader_ready = threading.Event() if leader_election_enabled else None
     health_port = env_int("HEALTH_PORT", 8080, minimum=1, maximum=65535)
     health_server = start_health_server(
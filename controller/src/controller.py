@@ -1,25 +1,34 @@
 from __future__ import annotations
 
-import json
+import heapq
 import logging
 import math
 import os
 import random
 import re
+import socket
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache, partial
 from hashlib import sha256
 from typing import Any
 
 from kubernetes import watch
 from kubernetes.client import ApiException, AppsV1Api, CoreV1Api
 
-from controller.src.kube import patch_deployment_restart
+from controller.src import fastpath
+from controller.src.kube import ConfigMapWatch, patch_deployment_restart
 from controller.src.metrics import METRICS
 
+_ANNOTATION_SANITIZER = re.compile(r"[^A-Za-z0-9_.-]+")
+_ANNOTATION_CACHE_SIZE = 2048
+_COUNTER_FLUSH_SECONDS = 1.0
+_SELECTOR_CLAUSE = re.compile(r"(?:^|,)\s*([^=,\s]+)\s*=\s*([^,]*?)\s*(?=,|$)")
+
 
 @dataclass(frozen=True)
 class RestartResult:
@@ -44,32 +53,63 @@ def utc_now_rfc3339() -> str:
     return datetime.now(UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
+@dataclass(slots=True)
+class _KeyState:
+    """Mutable bookkeeping for one ``(env, configmap_name)`` key.
+
+    Packing every per-key field into a single slotted record means each
+    event performs one dict lookup instead of one per concern.
+    """
+
+    data_hash: int | None = None
+    config_hash: str | None = None
+    reconciled_hash: str | None = None
+    resource_version: str | None = None
+    last_restart: float | None = None
+    pending_due: float | None = None
+    retry_attempt: int = 0
+    last_change: float | None = None
+    debounce_window: float = 0.0
+
+
 class ConfigMapReloader:
     """Watches ConfigMaps in a namespace and triggers rolling restarts on data changes.
 
     The controller uses the Kubernetes watch API to stream ConfigMap events.  It
-    maintains a SHA-256 hash of each ConfigMap's ``data`` field keyed by
-    ``(env, configmap_name)`` and only triggers a restart when the hash actually
-    changes.  This avoids spurious restarts caused by metadata-only updates or
-    repeated watch ADDED events during re-list.
+    maintains a fast (non-cryptographic) digest of each ConfigMap's ``data``
+    field keyed by ``(env, configmap_name)`` and only triggers a restart when
+    the digest actually changes.  This avoids spurious restarts caused by
+    metadata-only updates or repeated watch ADDED events during re-list.
 
     A per-key debounce window (default 5 s) coalesces rapid successive changes
     so that a burst of ``kubectl patch`` calls results in a single restart
-    rather than a storm.
+    rather than a storm.  When ``debounce_max_seconds`` exceeds the base
+    window, the window adapts: it doubles for each change arriving within
+    twice the base window of the previous one (capped at the maximum) and
+    resets to the base once the key goes quiet.
 
     Key internal state:
-        ``_last_data_hash``
-            Maps ``(env, configmap_name)`` to the last-seen SHA-256 digest.
-        ``_last_restart``
-            Maps the same key to the ``time.monotonic()`` timestamp of the
-            last restart, used for debounce calculation.
-        ``_pending_restarts``
-            Maps keys to a monotonic due-at timestamp when a restart was
-            deferred because the debounce window had not yet elapsed, or when
-            a failed restart was queued for retry.
-        ``_pending_retry_attempts``
-            Tracks retry attempt counters per key for bounded exponential
-            backoff when restart patch operations fail.
+        ``_state``
+            Maps ``(env, configmap_name)`` to a :class:`_KeyState` holding:
+            the last-seen fast data digest (``data_hash``) and the
+            ``resourceVersion`` it was computed from; the SHA-256
+            digest persisted in the deployment ``config-hash-<name>``
+            annotation (``config_hash``, only recomputed when the fast
+            digest changes); the ``config_hash`` last confirmed on the
+            matching deployments (``reconciled_hash``, the only hashes
+            persisted across restarts); the ``monotonic_fn()`` timestamp of the last
+            restart used for debounce (``last_restart``); the monotonic
+            due-at of a deferred or retried restart (``pending_due``); the
+            retry attempt counter for bounded exponential backoff
+            (``retry_attempt``); and the adaptive debounce window state
+            (``last_change``, ``debounce_window``).
+        ``_pending_count``
+            Number of keys with a ``pending_due`` set, kept in step with the
+            ``configmap_reload_pending_restarts`` gauge.
+        ``_pending_heap``
+            Min-heap of ``(due_at, key)`` mirroring ``pending_due`` so the
+            earliest due restart can be found without a full scan.  Entries
+            are invalidated lazily: ``_state`` is the source of truth.
     """
 
     def __init__(
@@ -81,8 +121,15 @@ class ConfigMapReloader:
         rollout_annotation_key: str,
         debounce_seconds: int,
         config_map_name: str | None = None,
+        debounce_max_seconds: int | None = None,
+        patch_workers: int = 8,
+        hash_state_path: str | None = None,
+        parsed_selector: Mapping[str, str] | None = None,
         logger: logging.Logger | None = None,
         now_fn: Callable[[], str] = utc_now_rfc3339,
+        monotonic_fn: Callable[[], float] = time.monotonic,
+        watch_factory: Callable[[], ConfigMapWatch] = ConfigMapWatch,
+        jitter_fn: Callable[[], float] | None = None,
     ) -> None:
         self.core_api = core_api
         self.apps_api = apps_api
@@ -90,50 +137,108 @@ class ConfigMapReloader:
         self.app_selector = app_selector
         self.rollout_annotation_key = rollout_annotation_key
         self.debounce_seconds = debounce_seconds
+        self.debounce_max_seconds = max(debounce_seconds, debounce_max_seconds or 0)
         # Backward-compatibility with older constructor shape used by tests/consumers.
         self.config_map_name = config_map_name
         self.logger = logger or logging.getLogger(__name__)
         self.now_fn = now_fn
-
-        # Debounce bookkeeping keyed by (env, configmap_name)
-        self._last_restart: dict[tuple[str, str], float] = {}
-        self._last_data_hash: dict[tuple[str, str], str] = {}
-        self._pending_restarts: dict[tuple[str, str], float] = {}
-        self._pending_retry_attempts: dict[tuple[str, str], int] = {}
+        # Clock for debounce, retry and drain deadlines; injectable for tests.
+        self.monotonic_fn = monotonic_fn
+        # Builds the run_forever watcher; injectable so tests need no patching.
+        self.watch_factory = watch_factory
+        # Optional file persisting config hashes across process restarts.
+        self.hash_state_path = hash_state_path
+        self._persisted_config_hashes: dict[tuple[str, str], str] = {}
+
+        # Debounce/retry/hash bookkeeping keyed by (env, configmap_name)
+        self._state: dict[tuple[str, str], _KeyState] = {}
+        self._pending_count = 0
+        self._pending_heap: list[tuple[float, tuple[str, str]]] = []
+        self._annotation_cache: dict[tuple[str, str], dict[str, str]] = {}
         METRICS.pending_restarts.set(0)
-
-        self._app_label_filters = self._parse_selector(app_selector)
+        # Debounce counts accumulated per env and flushed to Prometheus at
+        # most once per _COUNTER_FLUSH_SECONDS, so event storms take one
+        # counter lock per env instead of one per event.
+        self._debounced_counts: dict[str, int] = {}
+        self._next_counter_flush = 0.0
+
+        # Pool for concurrent deployment patches within one restart; created
+        # on first use and shut down by ``close()``, which ``run_forever``
+        # calls on return.
+        self._patch_workers = max(1, patch_workers)
+        self._patch_executor: ThreadPoolExecutor | None = None
+
+        # Callers that already validated the selector pass the parsed form so
+        # validation and matching can never disagree.
+        self._app_label_filters = (
+            dict(parsed_selector)
+            if parsed_selector is not None
+            else self._parse_selector(app_selector)
+        )
+        self._app_label_filter_items = frozenset(self._app_label_filters.items())
+        # Normalised base for deployment selectors; keeps every original
+        # clause (including set-based ones) so only the env suffix varies.
+        self._deployment_selector_base = ",".join(
+            part.strip() for part in app_selector.split(",") if part.strip()
+        )
+        self._env_selector_cache: dict[str, str] = {}
         self.ready = threading.Event()
         self._external_stop = threading.Event()
+        # Stop event of the most recent run_forever call; request_stop() sets
+        # it so a backoff sleeping on it wakes immediately.
+        self._run_stop: threading.Event | None = None
+        # Written only by the run_forever thread and read by request_stop();
+        # a single attribute store/load is atomic, so no lock is needed.
         self._active_watcher: watch.Watch | None = None
-        self._watcher_lock = threading.Lock()
+        # Per-replica jitter source for reconnect backoff.  Seeding from the
+        # pod identity and start time decorrelates replicas that start from
+        # the same image at the same moment; bound once for the hot path.
+        # ``jitter_fn`` overrides it with a fixed draw in tests.
+        self._rng = random.Random(  # noqa: S311
+            hash((socket.gethostname(), os.getpid(), time.time_ns()))
+        )
+        self._rand: Callable[[], float] = jitter_fn or self._rng.random
 
     @staticmethod
     def _parse_selector(selector: str) -> dict[str, str]:
-        """Parse a Kubernetes label selector string (``k=v,k2=v2``) into a dict."""
-        result: dict[str, str] = {}
-        for part in selector.split(","):
-            part = part.strip()
-            if "=" in part:
-                key, value = part.split("=", 1)
-                result[key.strip()] = value.strip()
-        return result
+        """Parse a Kubernetes label selector string (``k=v,k2=v2``) into a dict.
+
+        Clauses without ``=`` (e.g. set-based ``k in (a,b)``) are ignored.
+        """
+        return dict(_SELECTOR_CLAUSE.findall(selector))
 
     def _matches_app_labels(self, labels: dict[str, str]) -> bool:
         """Return True if *labels* contain every key-value pair from the app selector."""
-        return all(labels.get(k) == v for k, v in self._app_label_filters.items())
+        return fastpath.matches_labels(labels, self._app_label_filter_items)
 
     def _deployment_selector_for_env(self, env: str) -> str:
         """Build a label selector that targets deployments for a specific environment.
 
         Extends the base ``app_selector`` with ``env=<env>`` so that a
         ConfigMap change in the *test* environment only restarts *test*
-        deployments, not *prod* ones.
+        deployments, not *prod* ones.  Results are memoized per env; the app
+        selector is fixed after construction and envs are few.
         """
-        clauses = [part.strip() for part in self.app_selector.split(",") if part.strip()]
-        if not any(part.startswith("env=") for part in clauses):
-            clauses.append(f"env={env}")
-        return ",".join(clauses)
+        selector = self._env_selector_cache.get(env)
+        if selector is None:
+            base = self._deployment_selector_base
+            if "env" in self._app_label_filters:
+                selector = base
+            else:
+                selector = f"{base},env={env}" if base else f"env={env}"
+            self._env_selector_cache[env] = selector
+        return selector
+
+    def _key_state(self, key: tuple[str, str]) -> _KeyState:
+        """Return the bookkeeping record for *key*, creating it on first use."""
+        state = self._state.get(key)
+        if state is None:
+            state = self._state[key] = _KeyState()
+        return state
+
+    def _pending_keys(self) -> list[tuple[str, str]]:
+        """Return keys with a queued (debounced or retry) restart."""
+        return [key for key, state in self._state.items() if state.pending_due is not None]
 
     def _debounce_remaining(self, env: str, config_map_name: str, now_monotonic: float) -> float:
         """Return seconds remaining in the debounce window for a given key.
@@ -149,13 +254,35 @@ class ConfigMapReloader:
         if self.debounce_seconds <= 0:
             return 0.0
 
-        key = (env, config_map_name)
-        last_seen = self._last_restart.get(key)
-        if last_seen is None:
+        state = self._state.get((env, config_map_name))
+        if state is None or state.last_restart is None:
             return 0.0
 
-        elapsed = now_monotonic - last_seen
-        return max(0.0, float(self.debounce_seconds) - elapsed)
+        window = (
+            state.debounce_window if state.last_change is not None else float(self.debounce_seconds)
+        )
+        elapsed = now_monotonic - state.last_restart
+        return max(0.0, window - elapsed)
+
+    def _advance_debounce_window(
+        self, env: str, config_map_name: str, now_monotonic: float
+    ) -> None:
+        """Update the adaptive debounce window for a key on a meaningful change.
+
+        A change arriving within twice the base window of the previous one
+        doubles the key's window (up to ``debounce_max_seconds``); a change
+        after a quiet period resets it to ``debounce_seconds``.
+        """
+        if self.debounce_seconds <= 0:
+            return
+
+        state = self._key_state((env, config_map_name))
+        base = float(self.debounce_seconds)
+        window = base
+        if state.last_change is not None and now_monotonic - state.last_change < 2 * base:
+            window = min(state.debounce_window * 2, float(self.debounce_max_seconds))
+        state.last_change = now_monotonic
+        state.debounce_window = window
 
     def _schedule_pending_restart(
         self,
@@ -173,43 +300,101 @@ class ConfigMapReloader:
         uses the *latest* change within the window.
         """
         key = (env, config_map_name)
+        state = self._key_state(key)
         due_at = now_monotonic + delay_seconds
-        existing_due = self._pending_restarts.get(key)
-        if existing_due is None or due_at > existing_due:
-            self._pending_restarts[key] = due_at
-            METRICS.pending_restarts.set(len(self._pending_restarts))
+        if state.pending_due is None or due_at > state.pending_due:
+            self._set_pending_due(key, state, due_at)
         if reset_retry_attempt:
-            self._pending_retry_attempts.pop(key, None)
+            state.retry_attempt = 0
+
+    def _set_pending_due(self, key: tuple[str, str], state: _KeyState, due_at: float) -> None:
+        """Record *due_at* for *key* in both its state record and the due-at heap."""
+        if state.pending_due is None:
+            self._pending_count += 1
+            METRICS.pending_restarts.set(self._pending_count)
+        state.pending_due = due_at
+        heapq.heappush(self._pending_heap, (due_at, key))
+
+    def _clear_pending(self, state: _KeyState) -> None:
+        """Drop any queued restart and retry state for a key.
+
+        The pending gauge is only touched when the count actually changes,
+        since ``Gauge.set`` takes a lock and this runs on every restart.
+        """
+        if state.pending_due is not None:
+            state.pending_due = None
+            self._pending_count -= 1
+            METRICS.pending_restarts.set(self._pending_count)
+        state.retry_attempt = 0
+
+    def _is_current_pending(self, key: tuple[str, str], due_at: float) -> bool:
+        state = self._state.get(key)
+        return state is not None and state.pending_due == due_at
+
+    def _nearest_pending_due(self) -> float | None:
+        """Return the earliest pending due-at, discarding stale heap entries."""
+        heap = self._pending_heap
+        if not self._pending_count:
+            heap.clear()
+            return None
+        while heap and not self._is_current_pending(heap[0][1], heap[0][0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _pop_due_pending(self, now_monotonic: float) -> list[tuple[str, str]]:
+        """Pop and return keys whose current due-at is at or before *now_monotonic*."""
+        heap = self._pending_heap
+        due: dict[tuple[str, str], None] = {}
+        while heap and heap[0][0] <= now_monotonic:
+            due_at, key = heapq.heappop(heap)
+            if self._is_current_pending(key, due_at):
+                due[key] = None
+        return list(due)
 
     def _mark_restart_executed(self, env: str, config_map_name: str, now_monotonic: float) -> None:
-        key = (env, config_map_name)
-        self._last_restart[key] = now_monotonic
-        self._pending_restarts.pop(key, None)
-        self._pending_retry_attempts.pop(key, None)
-        METRICS.pending_restarts.set(len(self._pending_restarts))
+        state = self._key_state((env, config_map_name))
+        state.last_restart = now_monotonic
+        state.reconciled_hash = state.config_hash
+        self._clear_pending(state)
 
     def request_stop(self) -> None:
-        """Request a cooperative stop and immediately interrupt any open watch stream."""
+        """Request a cooperative stop and immediately interrupt any open watch stream.
+
+        Also sets the stop event the running loop waits on, so a reconnect
+        backoff (up to 30 s) ends at once instead of running out its timeout.
+        """
         self._external_stop.set()
-        with self._watcher_lock:
-            active_watcher = self._active_watcher
+        run_stop = self._run_stop
+        if run_stop is not None:
+            run_stop.set()
+        active_watcher = self._active_watcher
         if active_watcher is not None:
             active_watcher.stop()
 
     def _should_stop(self, stop_event: threading.Event) -> bool:
         return stop_event.is_set() or self._external_stop.is_set()
 
+    def _sleep_backoff(self, stop: threading.Event, current: int) -> int:
+        """Wait a jittered ``current`` seconds and return the next backoff.
+
+        Jitter spans 0.5x-1.5x of *current* so replicas recovering from the
+        same outage do not reconnect in lockstep; the backoff doubles up to
+        a 30 s cap.
+        """
+        stop.wait(timeout=current * (0.5 + self._rand()))
+        return current + current if current < 15 else 30
+
     def _schedule_retry(self, env: str, config_map_name: str, now_monotonic: float) -> None:
         """Schedule a retry after a failed restart attempt using bounded exponential backoff."""
         key = (env, config_map_name)
-        retry_attempt = self._pending_retry_attempts.get(key, 0) + 1
-        self._pending_retry_attempts[key] = retry_attempt
+        state = self._key_state(key)
+        state.retry_attempt += 1
+        retry_attempt = state.retry_attempt
 
         delay_seconds = min(30.0, float(2 ** (retry_attempt - 1)))
         due_at = now_monotonic + delay_seconds
-        self._pending_restarts[key] = due_at
-        METRICS.pending_restarts.set(len(self._pending_restarts))
-        METRICS.retry_total.labels(env=env).inc()
+        self._set_pending_due(key, state, due_at)
+        METRICS.for_env(env).retries.inc()
 
         self.logger.warning(
             "Restart for %s/%s failed; scheduling retry attempt %d in %.1fs",
@@ -221,101 +406,138 @@ class ConfigMapReloader:
 
     @staticmethod
     def _record_restart_result(result: RestartResult) -> None:
-        METRICS.restarts_total.labels(env=result.environment).inc(result.restarted)
-        METRICS.errors_total.labels(env=result.environment).inc(result.failed)
+        counters = METRICS.for_env(result.environment)
+        counters.restarts.inc(result.restarted)
+        counters.errors.inc(result.failed)
 
     def _restart_and_record(
         self,
         env: str,
-        config_map_name: str,
+        config_map_names: Sequence[str],
         now_monotonic: float,
         *,
         force: bool = False,
     ) -> RestartResult:
         """Execute one restart attempt and reconcile queue state.
 
-        Failed attempts are retried with bounded exponential backoff unless
-        ``force=True`` (shutdown/handoff flush), in which case the intent is
-        dropped after recording failure to avoid blocking termination forever.
+        All *config_map_names* share *env*, so their deployments are listed
+        and patched once.  Failed attempts are retried per key with bounded
+        exponential backoff unless ``force=True`` (shutdown/handoff flush),
+        in which case the intent is dropped after recording failure to avoid
+        blocking termination forever.
         """
-        result = self._restart_deployments_for_env(env=env, config_map_name=config_map_name)
+        result = self._restart_deployments_for_env(env=env, config_map_names=config_map_names)
         self._record_restart_result(result)
         if result.failed == 0:
-            self._mark_restart_executed(
+            for config_map_name in config_map_names:
+                self._mark_restart_executed(
+                    env=env,
+                    config_map_name=config_map_name,
+                    now_monotonic=now_monotonic,
+                )
+            return result
+
+        for config_map_name in config_map_names:
+            if force:
+                self._clear_pending(self._key_state((env, config_map_name)))
+                METRICS.dropped_restarts_total.inc()
+                self.logger.error(
+                    "Forced restart for %s/%s failed during shutdown; dropping pending intent",
+                    env,
+                    config_map_name,
+                )
+                continue
+
+            self._schedule_retry(
                 env=env,
                 config_map_name=config_map_name,
                 now_monotonic=now_monotonic,
             )
-            return result
-
-        if force:
-            key = (env, config_map_name)
-            self._pending_restarts.pop(key, None)
-            self._pending_retry_attempts.pop(key, None)
-            METRICS.pending_restarts.set(len(self._pending_restarts))
-            METRICS.dropped_restarts_total.inc()
-            self.logger.error(
-                "Forced restart for %s/%s failed during shutdown; dropping pending intent",
-                env,
-                config_map_name,
-            )
-            return result
-
-        self._schedule_retry(
-            env=env,
-            config_map_name=config_map_name,
-            now_monotonic=now_monotonic,
-        )
         return result
 
+    @staticmethod
+    def _group_by_env(keys: list[tuple[str, str]]) -> dict[str, list[str]]:
+        """Group ``(env, configmap_name)`` keys by env, preserving first-seen order."""
+        grouped: dict[str, list[str]] = {}
+        for env, config_map_name in keys:
+            grouped.setdefault(env, []).append(config_map_name)
+        return grouped
+
     def _drain_pending_restarts(self, now_monotonic: float) -> None:
         """Process all pending restarts whose debounce window has elapsed.
 
-        Iterates through scheduled restarts and executes any whose due-at
-        timestamp is at or before *now_monotonic*.  Executed entries are
-        removed from the pending map by ``_restart_and_record``.
+        Pops due entries off ``_pending_heap`` (O(log N) each) and executes
+        any whose due-at timestamp is at or before *now_monotonic*.  Due
+        ConfigMaps in the same env are batched into a single deployment
+        list and one patch per deployment.  Executed entries are cleared
+        from ``_state`` by ``_restart_and_record``.  Batched debounce counts
+        are flushed once the queue empties or the flush interval elapses.
         """
-        due_restarts = [
-            key for key, due_at in self._pending_restarts.items() if due_at <= now_monotonic
-        ]
-        for env, config_map_name in due_restarts:
+        due_restarts = self._pop_due_pending(now_monotonic)
+        grouped = list(self._group_by_env(due_restarts).items())
+        for position, (env, config_map_names) in enumerate(grouped):
             self.logger.info(
                 "Processing debounced ConfigMap restart for %s/%s",
                 env,
-                config_map_name,
-            )
-            self._restart_and_record(
-                env=env,
-                config_map_name=config_map_name,
-                now_monotonic=now_monotonic,
+                ",".join(config_map_names),
             )
+            try:
+                self._restart_and_record(
+                    env=env,
+                    config_map_names=config_map_names,
+                    now_monotonic=now_monotonic,
+                )
+            except BaseException:
+                # Keep unprocessed intents reachable from the heap so the
+                # next drain retries them after the caller's backoff.
+                for pending_env, pending_names in grouped[position:]:
+                    for config_map_name in pending_names:
+                        key = (pending_env, config_map_name)
+                        state = self._state.get(key)
+                        if state is not None and state.pending_due is not None:
+                            heapq.heappush(self._pending_heap, (state.pending_due, key))
+                raise
+
+        if self._debounced_counts and (
+            not self._pending_count or now_monotonic >= self._next_counter_flush
+        ):
+            self._flush_debounced_counts()
+            self._next_counter_flush = now_monotonic + _COUNTER_FLUSH_SECONDS
+
+    def _flush_debounced_counts(self) -> None:
+        """Publish accumulated debounce counts to the per-env counters."""
+        for env, count in self._debounced_counts.items():
+            METRICS.for_env(env).debounced.inc(count)
+        self._debounced_counts.clear()
 
-    def _flush_pending_restarts_on_shutdown(self) -> None:
+    def _flush_pending_restarts_on_shutdown(self) -> set[tuple[str, str]]:
         """Force-process all pending restarts before shutdown.
 
         Restarts still inside the debounce window are executed immediately so
         leadership handoff or process termination cannot silently lose a
         previously observed ConfigMap change.
+
+        Returns the keys whose intent was dropped because the forced restart
+        failed, so they are not persisted as reconciled.
         """
-        if not self._pending_restarts:
-            return
+        dropped: set[tuple[str, str]] = set()
+        if not self._pending_count:
+            return dropped
 
-        pending_count = len(self._pending_restarts)
-        self.logger.warning(
-            "Forcing %d pending restart(s) before shutdown", pending_count
-        )
+        pending_keys = self._pending_keys()
+        self.logger.warning("Forcing %d pending restart(s) before shutdown", len(pending_keys))
 
-        for env, config_map_name in list(self._pending_restarts.keys()):
+        for env, config_map_names in self._group_by_env(pending_keys).items():
             self.logger.warning(
                 "Forcing pending ConfigMap restart for %s/%s due to shutdown or leadership handoff",
                 env,
-                config_map_name,
+                ",".join(config_map_names),
             )
             try:
-                self._restart_and_record(
+                result = self._restart_and_record(
                     env=env,
-                    config_map_name=config_map_name,
-                    now_monotonic=time.monotonic(),
+                    config_map_names=config_map_names,
+                    now_monotonic=self.monotonic_fn(),
                     force=True,
                 )
             except Exception:
@@ -323,12 +545,87 @@ class ConfigMapReloader:
                 self.logger.exception(
                     "Failed forced pending restart for %s/%s during shutdown",
                     env,
-                    config_map_name,
+                    ",".join(config_map_names),
                 )
-                self._pending_restarts.pop((env, config_map_name), None)
-                self._pending_retry_attempts.pop((env, config_map_name), None)
-                METRICS.pending_restarts.set(len(self._pending_restarts))
-                METRICS.dropped_restarts_total.inc()
+                for config_map_name in config_map_names:
+                    self._clear_pending(self._key_state((env, config_map_name)))
+                    METRICS.dropped_restarts_total.inc()
+                    dropped.add((env, config_map_name))
+                continue
+            if result.failed:
+                dropped.update((env, config_map_name) for config_map_name in config_map_names)
+        return dropped
+
+    def _load_hash_state(self) -> None:
+        """Load config hashes persisted by a previous run from ``hash_state_path``.
+
+        The file is consumed: it is removed as soon as it has been read, so
+        it only vouches for the run that wrote it on a clean shutdown, and a
+        later crash leaves no file.  It does not survive changes made by
+        another leader, so the entrypoint disables persistence when leader
+        election is enabled.
+
+        A missing or unreadable file is not an error: startup drift
+        reconciliation simply checks every ConfigMap, as it would without
+        persistence.
+        """
+        self._persisted_config_hashes = {}
+        if not self.hash_state_path:
+            return
+        try:
+            with open(self.hash_state_path, "rb") as handle:
+                raw = fastpath.loads_json(handle.read())
+        except FileNotFoundError:
+            return
+        except OSError, ValueError:
+            self.logger.warning(
+                "Ignoring unreadable hash state file %s", self.hash_state_path, exc_info=True
+            )
+            return
+        try:
+            os.remove(self.hash_state_path)
+        except OSError:
+            # A file that cannot be consumed could be trusted again after a
+            # crash, so it is not trusted now either.
+            self.logger.warning(
+                "Ignoring hash state file %s that could not be removed",
+                self.hash_state_path,
+                exc_info=True,
+            )
+            return
+        if not isinstance(raw, dict):
+            return
+        for encoded_key, config_hash in raw.items():
+            env, _, config_map_name = str(encoded_key).partition("/")
+            if env and config_map_name and isinstance(config_hash, str):
+                self._persisted_config_hashes[(env, config_map_name)] = config_hash
+
+    def _save_hash_state(self, exclude: set[tuple[str, str]]) -> None:
+        """Atomically persist reconciled config hashes to ``hash_state_path``.
+
+        Only keys whose current ``config_hash`` was confirmed on the
+        deployments this run (``reconciled_hash``) are written; keys that
+        were never checked, whose drift check failed, or that are in
+        *exclude* (restarts dropped at shutdown) are omitted so the next run
+        still drift-checks them.  Write failures are logged and otherwise
+        ignored.
+        """
+        if not self.hash_state_path:
+            return
+        payload = {
+            f"{env}/{config_map_name}": state.config_hash
+            for (env, config_map_name), state in self._state.items()
+            if state.config_hash is not None
+            and state.reconciled_hash == state.config_hash
+            and (env, config_map_name) not in exclude
+        }
+        tmp_path = f"{self.hash_state_path}.tmp"
+        try:
+            with open(tmp_path, "wb") as handle:
+                handle.write(fastpath.dumps_json(payload))
+            os.replace(tmp_path, self.hash_state_path)
+        except OSError:
+            self.logger.exception("Failed to persist hash state to %s", self.hash_state_path)
 
     def _next_watch_timeout_seconds(self, now_monotonic: float) -> int:
         """Return the next watch timeout in seconds, shortened for pending restarts.
@@ -337,46 +634,54 @@ class ConfigMapReloader:
         loop wakes up in time to drain them.  Without pending restarts
         the default 30-second timeout is returned.
         """
-        if not self._pending_restarts:
+        nearest_due = self._nearest_pending_due()
+        if nearest_due is None:
             return 30
 
-        nearest_due = min(self._pending_restarts.values())
         remaining = max(1.0, nearest_due - now_monotonic)
         return min(30, max(1, math.ceil(remaining)))
 
-    @staticmethod
-    def _normalize_data(raw_data: Any) -> dict[str, str]:
-        """Coerce ConfigMap ``data`` into a stable ``dict[str, str]``.
-
-        Handles ``None`` values (possible when a key exists with no value)
-        and non-dict inputs gracefully so that downstream hashing is
-        deterministic.
-        """
-        if not isinstance(raw_data, dict):
-            return {}
-        return {
-            k: ("" if v is None else str(v))
-            for k, v in raw_data.items()
-            if isinstance(k, str)
-        }
+    _normalize_data = staticmethod(fastpath.normalize_data)
+    _hash_data = staticmethod(fastpath.hash_data)
+    _config_hash = staticmethod(fastpath.config_hash)
 
-    @staticmethod
-    def _hash_data(data: dict[str, str]) -> str:
-        """Return a SHA-256 hex digest of the ConfigMap data.
+    def _observe_data(self, key: tuple[str, str], config_map: Any) -> tuple[int | None, int]:
+        """Record the latest data digest for *key* and return ``(previous, current)``.
 
-        We hash the data content (rather than comparing ``resourceVersion``)
-        because ``resourceVersion`` changes on *any* object mutation
-        including label or annotation edits that do not affect the
-        application.  Hashing only ``data`` avoids false-positive restarts.
+        An object whose ``resourceVersion`` matches the last one observed for
+        *key* (watch replay, re-list) cannot have new data, so hashing is
+        skipped entirely.  Otherwise the SHA-256 annotation hash is refreshed
+        only when the fast digest changes, keeping metadata-only edits off the
+        cryptographic path.
         """
-        stable_payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
-        return sha256(stable_payload.encode("utf-8")).hexdigest()
+        state = self._key_state(key)
+        resource_version = fastpath.resource_version(config_map)
+        if (
+            resource_version
+            and resource_version == state.resource_version
+            and state.data_hash is not None
+        ):
+            return state.data_hash, state.data_hash
+
+        data = self._normalize_data(getattr(config_map, "data", None))
+        current_hash = self._hash_data(data)
+        previous_hash = state.data_hash
+        state.data_hash = current_hash
+        state.resource_version = resource_version
+        if previous_hash != current_hash or state.config_hash is None:
+            state.config_hash = self._config_hash(data)
+        return previous_hash, current_hash
 
     def _config_hash_annotation_key(self, config_map_name: str) -> str:
         """Return the deployment template annotation key storing ConfigMap data hash."""
         prefix, separator, _ = self.rollout_annotation_key.partition("/")
+        return self._compute_hash_annotation_key(prefix, separator, config_map_name)
 
-        normalized_name = re.sub(r"[^A-Za-z0-9_.-]+", "-", config_map_name).strip("-.")
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _compute_hash_annotation_key(prefix: str, separator: str, config_map_name: str) -> str:
+        """Build the annotation key; memoized because inputs repeat on every event."""
+        normalized_name = _ANNOTATION_SANITIZER.sub("-", config_map_name).strip("-.")
         if not normalized_name:
             normalized_name = "configmap"
 
@@ -393,30 +698,38 @@ class ConfigMapReloader:
             return f"{prefix}/{annotation_name}"
         return annotation_name
 
-    @staticmethod
-    def _deployment_template_annotations(deployment: Any) -> dict[str, str]:
-        """Extract pod template annotations from a deployment object safely."""
-        spec = getattr(deployment, "spec", None)
-        template = getattr(spec, "template", None)
-        metadata = getattr(template, "metadata", None)
-        annotations = getattr(metadata, "annotations", None)
-        if not isinstance(annotations, dict):
-            return {}
-        return {
-            k: ("" if v is None else str(v))
-            for k, v in annotations.items()
-            if isinstance(k, str)
-        }
-
-    def _sync_cache_from_list(self, config_maps: Any, restart_on_change: bool = False) -> None:
-        """Seed or refresh the data-hash cache from a full ConfigMap listing.
+    def _deployment_template_annotations(self, deployment: Any) -> dict[str, str]:
+        """Return pod template annotations, cached by deployment ``resourceVersion``.
 
-        Called at startup (``restart_on_change=False``) to populate the
-        baseline, and after a ``410 Gone`` re-list (``restart_on_change=True``)
-        to detect changes that occurred while the watch was disconnected.
+        A deployment's template cannot change without its ``resourceVersion``
+        moving, so the normalised dict is shared across drift checks and
+        restart skip-path comparisons.  Callers must not mutate the result.
+        """
+        metadata = getattr(deployment, "metadata", None)
+        name = getattr(metadata, "name", None)
+        resource_version = getattr(metadata, "resource_version", None)
+        if not isinstance(name, str) or not isinstance(resource_version, str):
+            return fastpath.deployment_template_annotations(deployment)
+
+        cache_key = (name, resource_version)
+        cached = self._annotation_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        annotations = fastpath.deployment_template_annotations(deployment)
+        if len(self._annotation_cache) >= _ANNOTATION_CACHE_SIZE:
+            # Evict the oldest insertion; dicts preserve insertion order.
+            del self._annotation_cache[next(iter(self._annotation_cache))]
+        self._annotation_cache[cache_key] = annotations
+        return annotations
+
+    def _iter_relevant_config_maps(self, config_maps: Any) -> Iterator[tuple[str, str, Any]]:
+        """Yield ``(env, configmap_name, config_map)`` for listed ConfigMaps we manage.
+
+        Applies the shared filtering for list-driven paths: metadata present,
+        app labels matched, and non-empty ``env`` label and name.
         """
-        items = getattr(config_maps, "items", None) or []
-        for config_map in items:
+        for config_map in getattr(config_maps, "items", None) or []:
             metadata = getattr(config_map, "metadata", None)
             if metadata is None:
                 continue
@@ -427,19 +740,30 @@ class ConfigMapReloader:
 
             env = labels.get("env")
             config_map_name = getattr(metadata, "name", None)
-            if not env or not config_map_name:
-                continue
+            if env and config_map_name:
+                yield env, config_map_name, config_map
 
-            key = (env, config_map_name)
-            current_hash = self._hash_data(self._normalize_data(getattr(config_map, "data", None)))
-            previous_hash = self._last_data_hash.get(key)
-            self._last_data_hash[key] = current_hash
+    def _sync_cache_from_list(self, config_maps: Any, restart_on_change: bool = False) -> None:
+        """Seed or refresh the data-hash cache from a full ConfigMap listing.
+
+        Called at startup (``restart_on_change=False``) to populate the
+        baseline, and after a ``410 Gone`` re-list (``restart_on_change=True``)
+        to detect changes that occurred while the watch was disconnected.
+        A single monotonic reading is shared by every item in the listing.
+        """
+        now_monotonic = self.monotonic_fn() if restart_on_change else 0.0
+        for env, config_map_name, config_map in self._iter_relevant_config_maps(config_maps):
+            previous_hash, current_hash = self._observe_data((env, config_map_name), config_map)
 
             if not restart_on_change:
                 continue
             if previous_hash is None or previous_hash == current_hash:
                 continue
-            now_monotonic = time.monotonic()
+            self._advance_debounce_window(
+                env=env,
+                config_map_name=config_map_name,
+                now_monotonic=now_monotonic,
+            )
             debounce_remaining = self._debounce_remaining(
                 env=env,
                 config_map_name=config_map_name,
@@ -462,7 +786,7 @@ class ConfigMapReloader:
             )
             self._restart_and_record(
                 env=env,
-                config_map_name=config_map_name,
+                config_map_names=(config_map_name,),
                 now_monotonic=now_monotonic,
             )
 
@@ -473,44 +797,46 @@ class ConfigMapReloader:
         but only for deployments where a prior controller-managed hash annotation
         already exists (or where rollout annotations indicate an older controller
         version that did not persist hash metadata).
-        """
-        items = getattr(config_maps, "items", None) or []
-        for config_map in items:
-            metadata = getattr(config_map, "metadata", None)
-            if metadata is None:
-                continue
 
-            labels = metadata.labels or {}
-            if not self._matches_app_labels(labels):
-                continue
-
-            env = labels.get("env")
-            config_map_name = getattr(metadata, "name", None)
-            if not env or not config_map_name:
+        Deployments are listed at most once per env selector; ConfigMaps that
+        share an env reuse the cached listing.  A failed listing is cached as
+        ``None`` so it is not retried for every ConfigMap in that env, and
+        its ConfigMaps are left unreconciled so their hashes are not
+        persisted.
+        """
+        deployments_by_selector: dict[str, list[Any] | None] = {}
+        for env, config_map_name, _ in self._iter_relevant_config_maps(config_maps):
+            state = self._state.get((env, config_map_name))
+            if state is None or state.config_hash is None:
                 continue
-
-            key = (env, config_map_name)
-            current_hash = self._last_data_hash.get(key)
-            if current_hash is None:
+            current_hash = state.config_hash
+            if self._persisted_config_hashes.get((env, config_map_name)) == current_hash:
+                # Unchanged since the previous run persisted it as reconciled.
+                state.reconciled_hash = current_hash
                 continue
 
             selector = self._deployment_selector_for_env(env)
-            try:
-                deployments = self.apps_api.list_namespaced_deployment(
-                    namespace=self.namespace,
-                    label_selector=selector,
-                )
-            except ApiException:
-                self.logger.exception(
-                    "Failed startup drift check for %s/%s (selector=%s)",
-                    env,
-                    config_map_name,
-                    selector,
-                )
-                continue
+            if selector not in deployments_by_selector:
+                try:
+                    deployments = self.apps_api.list_namespaced_deployment(
+                        namespace=self.namespace,
+                        label_selector=selector,
+                    )
+                    deployments_by_selector[selector] = deployments.items or []
+                except ApiException:
+                    self.logger.exception(
+                        "Failed startup drift check for %s/%s (selector=%s)",
+                        env,
+                        config_map_name,
+                        selector,
+                    )
+                    deployments_by_selector[selector] = None
 
-            deployment_items = deployments.items or []
+            deployment_items = deployments_by_selector[selector]
+            if deployment_items is None:
+                continue
             if not deployment_items:
+                state.reconciled_hash = current_hash
                 continue
 
             hash_annotation_key = self._config_hash_annotation_key(config_map_name)
@@ -544,6 +870,7 @@ class ConfigMapReloader:
                 )
 
             if not stale_deployments:
+                state.reconciled_hash = current_hash
                 continue
 
             self.logger.warning(
@@ -555,8 +882,8 @@ class ConfigMapReloader:
             )
             self._restart_and_record(
                 env=env,
-                config_map_name=config_map_name,
-                now_monotonic=time.monotonic(),
+                config_map_names=(config_map_name,),
+                now_monotonic=self.monotonic_fn(),
             )
 
     def _has_meaningful_data_change(
@@ -571,16 +898,13 @@ class ConfigMapReloader:
         Returns ``False`` (suppress restart) when:
         - The event is an initial ``ADDED`` with no prior baseline — this
           happens during watch replay when the controller first starts.
-        - The SHA-256 digest of ``data`` is identical to the last-seen hash,
+        - The digest of ``data`` is identical to the last-seen digest,
           meaning only metadata (labels, annotations, resourceVersion) changed.
 
-        Always updates ``_last_data_hash`` as a side effect so the next
+        Always updates the key's ``data_hash`` as a side effect so the next
         comparison uses the freshest baseline.
         """
-        key = (env, config_map_name)
-        current_hash = self._hash_data(self._normalize_data(getattr(config_map, "data", None)))
-        previous_hash = self._last_data_hash.get(key)
-        self._last_data_hash[key] = current_hash
+        previous_hash, current_hash = self._observe_data((env, config_map_name), config_map)
 
         if previous_hash is None:
             if event_type == "ADDED":
@@ -598,13 +922,20 @@ class ConfigMapReloader:
 
         return True
 
-    def _restart_deployments_for_env(self, env: str, config_map_name: str) -> RestartResult:
+    def _restart_deployments_for_env(
+        self, env: str, config_map_names: Sequence[str]
+    ) -> RestartResult:
         """Patch every matching Deployment's pod template to trigger a rolling restart.
 
         Finds deployments by the computed label selector for *env*, then patches
         each with a ``shipshape.io/restartedAt`` annotation containing an
         RFC 3339 timestamp.  Kubernetes treats this as a template change and
         performs a zero-downtime rolling update.
+
+        The config-hash annotations of every name in *config_map_names* are
+        merged into one patch, so a batch costs one list call and at most one
+        patch per deployment.  A deployment is skipped only when all of its
+        hash annotations are already current.
         """
         selector = self._deployment_selector_for_env(env)
         try:
@@ -621,14 +952,14 @@ class ConfigMapReloader:
         items = deployments.items or []
         restarted = 0
         failed = 0
+        to_patch: list[str] = []
         timestamp = self.now_fn()
-        config_hash = self._last_data_hash.get((env, config_map_name))
-        hash_annotation_key = self._config_hash_annotation_key(config_map_name)
-        hash_annotations = (
-            {hash_annotation_key: config_hash}
-            if config_hash is not None
-            else None
-        )
+        hash_annotations: dict[str, str] = {}
+        for config_map_name in config_map_names:
+            state = self._state.get((env, config_map_name))
+            if state is not None and state.config_hash is not None:
+                hash_annotation_key = self._config_hash_annotation_key(config_map_name)
+                hash_annotations[hash_annotation_key] = state.config_hash
 
         for deployment in items:
             deployment_name = getattr(getattr(deployment, "metadata", None), "name", None)
@@ -639,25 +970,40 @@ class ConfigMapReloader:
                 )
                 continue
 
-            if config_hash is not None:
+            if hash_annotations:
                 annotations = self._deployment_template_annotations(deployment)
-                if annotations.get(hash_annotation_key) == config_hash:
+                if annotations.items() >= hash_annotations.items():
                     self.logger.info(
                         "Deployment %s in env %s already has config hash %s; skipping patch",
                         deployment_name,
                         env,
-                        config_hash,
+                        ",".join(hash_annotations.values()),
                     )
                     continue
+            to_patch.append(deployment_name)
+
+        patch = partial(
+            patch_deployment_restart,
+            apps_api=self.apps_api,
+            namespace=self.namespace,
+            annotation_key=self.rollout_annotation_key,
+            timestamp=timestamp,
+            extra_annotations=hash_annotations or None,
+        )
+        # Patches are independent network round-trips; fan them out so N
+        # deployments cost roughly one RTT.  A single patch runs inline.
+        futures: list[Future[None]] = []
+        if len(to_patch) > 1:
+            futures = [self._patch_pool().submit(patch, deployment_name=name) for name in to_patch]
+            # Settle every patch before inspecting results, so an unexpected
+            # error re-raised below never abandons patches still in flight.
+            wait(futures)
+        for index, deployment_name in enumerate(to_patch):
             try:
-                patch_deployment_restart(
-                    apps_api=self.apps_api,
-                    namespace=self.namespace,
-                    deployment_name=deployment_name,
-                    annotation_key=self.rollout_annotation_key,
-                    timestamp=timestamp,
-                    extra_annotations=hash_annotations,
-                )
+                if futures:
+                    futures[index].result()
+                else:
+                    patch(deployment_name=deployment_name)
                 restarted += 1
                 self.logger.info(
                     "Triggered rolling restart for deployment %s in env %s", deployment_name, env
@@ -671,7 +1017,7 @@ class ConfigMapReloader:
         if not items:
             self.logger.warning(
                 "ConfigMap %s changed, but no deployments matched selector %s",
-                config_map_name,
+                ",".join(config_map_names),
                 selector,
             )
 
@@ -682,13 +1028,21 @@ class ConfigMapReloader:
             failed=failed,
         )
 
-    def handle_configmap_event(self, event_type: str, config_map: Any) -> RestartResult | None:
+    def handle_configmap_event(
+        self,
+        event_type: str,
+        config_map: Any,
+        now_monotonic: float | None = None,
+    ) -> RestartResult | None:
         """Process a single ConfigMap watch event.
 
         Filters out irrelevant events (wrong labels, no ``env`` label,
         replay ADDED events, unchanged data), applies debounce logic, and
         either restarts immediately or schedules a deferred restart.
 
+        *now_monotonic* is the watch loop's cached tick for this event; it
+        is read from ``monotonic_fn`` only when not supplied.
+
         Returns a :class:`RestartResult` when a restart was executed
         immediately, or ``None`` when the event was filtered, debounced,
         or invalid.
@@ -714,8 +1068,6 @@ class ConfigMapReloader:
             self.logger.warning("Skipping ConfigMap with empty name in env %s", env)
             return None
 
-        key = (env, config_map_name)
-
         if not self._has_meaningful_data_change(
             env=env,
             config_map_name=config_map_name,
@@ -724,7 +1076,13 @@ class ConfigMapReloader:
         ):
             return None
 
-        now_monotonic = time.monotonic()
+        if now_monotonic is None:
+            now_monotonic = self.monotonic_fn()
+        self._advance_debounce_window(
+            env=env,
+            config_map_name=config_map_name,
+            now_monotonic=now_monotonic,
+        )
         debounce_remaining = self._debounce_remaining(
             env=env,
             config_map_name=config_map_name,
@@ -744,27 +1102,46 @@ class ConfigMapReloader:
                 config_map_name,
                 debounce_remaining,
             )
-            METRICS.debounced_total.labels(env=env).inc()
+            self._debounced_counts[env] = self._debounced_counts.get(env, 0) + 1
             return None
 
         # A fresh immediate restart attempt supersedes older retry state
         # associated with previous failures for the same key.
-        self._pending_restarts.pop(key, None)
-        self._pending_retry_attempts.pop(key, None)
-        METRICS.pending_restarts.set(len(self._pending_restarts))
+        self._clear_pending(self._key_state((env, config_map_name)))
 
         return self._restart_and_record(
             env=env,
-            config_map_name=config_map_name,
+            config_map_names=(config_map_name,),
             now_monotonic=now_monotonic,
         )
 
+    def _patch_pool(self) -> ThreadPoolExecutor:
+        if self._patch_executor is None:
+            self._patch_executor = ThreadPoolExecutor(
+                max_workers=self._patch_workers, thread_name_prefix="deployment-patch"
+            )
+        return self._patch_executor
+
+    def close(self) -> None:
+        """Shut down the deployment patch pool and join its worker threads.
+
+        ``run_forever`` calls this on return.  Callers that drive
+        :meth:`handle_configmap_event` or the drain helpers directly own the
+        pool's lifetime and must call it themselves.  The reloader stays
+        usable: the next multi-deployment restart starts a fresh pool.
+        """
+        executor, self._patch_executor = self._patch_executor, None
+        if executor is not None:
+            # Every submitted patch is settled before its restart returns,
+            # so waiting only joins the idle workers.
+            executor.shutdown(wait=True)
+
     def run_forever(self, shutdown_event: threading.Event | None = None) -> None:
         """Main control loop — list-then-watch ConfigMaps until shutdown.
 
         1. Retries the initial ConfigMap list with exponential backoff so
            transient API startup failures do not crash-loop the controller.
-        2. Performs an initial list to seed ``_last_data_hash`` baselines.
+        2. Performs an initial list to seed per-key ``data_hash`` baselines.
         3. Reconciles startup drift by comparing ConfigMap hashes with
            deployment hash annotations.
         4. Opens a streaming watch from the list's ``resourceVersion``.
@@ -783,9 +1160,19 @@ class ConfigMapReloader:
         ``401`` / ``403`` responses from the Kubernetes API are treated as
         configuration errors (RBAC/auth) and terminate the loop immediately
         with a clear log message rather than retrying forever.
+
+        The deployment patch pool is closed on return, after the shutdown
+        flush; a later call starts a fresh one.
         """
+        try:
+            self._run(shutdown_event)
+        finally:
+            self.close()
+
+    def _run(self, shutdown_event: threading.Event | None) -> None:
         stop = shutdown_event or threading.Event()
         self._external_stop.clear()
+        self._run_stop = stop
 
         resource_version: str | None = None
         startup_backoff_seconds = 1
@@ -795,11 +1182,11 @@ class ConfigMapReloader:
                     namespace=self.namespace,
                     label_selector=self.app_selector,
                 )
-                resource_version = getattr(
-                    getattr(initial, "metadata", None), "resource_version", None
-                )
+                resource_version = fastpath.resource_version(initial)
                 self._sync_cache_from_list(initial, restart_on_change=False)
+                self._load_hash_state()
                 self._reconcile_startup_drift(initial)
+                self._persisted_config_hashes = {}
                 self.ready.set()
                 self.logger.info("Starting watch from resourceVersion %s", resource_version)
                 break
@@ -818,9 +1205,7 @@ class ConfigMapReloader:
                 self.logger.exception("Unexpected error during initial ConfigMap list")
                 METRICS.watch_errors_total.inc()
 
-            jittered = startup_backoff_seconds * (0.5 + random.random())  # noqa: S311
-            stop.wait(timeout=jittered)
-            startup_backoff_seconds = min(startup_backoff_seconds * 2, 30)
+            startup_backoff_seconds = self._sleep_backoff(stop, startup_backoff_seconds)
 
         if self._should_stop(stop):
             self.ready.clear()
@@ -832,99 +1217,119 @@ class ConfigMapReloader:
         backoff_seconds = 1
         watch_stream_count = 0
 
-        while not self._should_stop(stop):
-            self._drain_pending_restarts(now_monotonic=time.monotonic())
-            watcher = watch.Watch()
-            with self._watcher_lock:
-                self._active_watcher = watcher
-            try:
-                timeout_seconds = self._next_watch_timeout_seconds(now_monotonic=time.monotonic())
-                if watch_stream_count > 0:
-                    METRICS.watch_reconnects_total.inc()
-                watch_stream_count += 1
-                stream = watcher.stream(
-                    self.core_api.list_namespaced_config_map,
-                    namespace=self.namespace,
-                    label_selector=self.app_selector,
-                    resource_version=resource_version,
-                    timeout_seconds=timeout_seconds,
-                )
+        # One watcher (and its ApiClient) serves every reconnect; it is
+        # published once so request_stop() can interrupt whichever stream
+        # is open, and re-armed with reset() before each new stream.
+        watcher = self.watch_factory()
+        self._active_watcher = watcher
 
-                for event in stream:
-                    if self._should_stop(stop):
-                        break
+        try:
+            while not self._should_stop(stop):
+                # One monotonic tick per loop iteration / event; helpers take it
+                # as an argument instead of re-reading the clock.  Drains are
+                # skipped outright while nothing is pending and no debounce
+                # counts await publishing; an immediate restart can clear the
+                # last pending key before its counts are flushed.
+                now_monotonic = self.monotonic_fn()
+                if self._pending_count or self._debounced_counts:
+                    self._drain_pending_restarts(now_monotonic=now_monotonic)
+                watcher.reset()
+                # request_stop() sets the flag before stopping the watcher, so a
+                # stop racing with reset() is still observed here.
+                if self._should_stop(stop):
+                    break
+                try:
+                    timeout_seconds = self._next_watch_timeout_seconds(now_monotonic=now_monotonic)
+                    if watch_stream_count > 0:
+                        METRICS.watch_reconnects_total.inc()
+                    watch_stream_count += 1
+                    # The app selector is applied server-side so unrelated
+                    # ConfigMaps never reach this process; _matches_app_labels
+                    # remains as a defensive client-side check.
+                    stream = watcher.stream(
+                        self.core_api.list_namespaced_config_map,
+                        namespace=self.namespace,
+                        label_selector=self.app_selector,
+                        resource_version=resource_version,
+                        timeout_seconds=timeout_seconds,
+                    )
 
-                    obj = event.get("object")
-                    if obj is None:
-                        continue
+                    for event in stream:
+                        if self._should_stop(stop):
+                            break
 
-                    metadata = getattr(obj, "metadata", None)
-                    if metadata and metadata.resource_version:
-                        resource_version = metadata.resource_version
+                        obj = event.get("object")
+                        if obj is None:
+                            continue
 
-                    event_type = str(event.get("type", ""))
-                    self.handle_configmap_event(event_type=event_type, config_map=obj)
-                    self._drain_pending_restarts(now_monotonic=time.monotonic())
+                        event_resource_version = fastpath.resource_version(obj)
+                        if event_resource_version:
+                            resource_version = event_resource_version
 
-                backoff_seconds = 1
-                self._drain_pending_restarts(now_monotonic=time.monotonic())
-            except ApiException as exc:
-                # 410 Gone means etcd compacted past our resourceVersion.
-                # We must re-list to get a fresh snapshot and resume watching
-                # from the new resourceVersion.
-                if exc.status == 410:
-                    self.logger.warning("Watch resource version expired, re-listing")
-                    try:
-                        fresh = self.core_api.list_namespaced_config_map(
-                            namespace=self.namespace,
-                            label_selector=self.app_selector,
-                        )
-                        resource_version = getattr(
-                            getattr(fresh, "metadata", None), "resource_version", None
+                        event_type = str(event.get("type", ""))
+                        now_monotonic = self.monotonic_fn()
+                        self.handle_configmap_event(
+                            event_type=event_type,
+                            config_map=obj,
+                            now_monotonic=now_monotonic,
                         )
-                        self._sync_cache_from_list(fresh, restart_on_change=True)
-                    except ApiException as relist_exc:
-                        if relist_exc.status in {401, 403}:
-                            self.logger.error(
-                                "Kubernetes API access denied during 410 re-list (status=%s). "
-                                "Check controller RBAC and service account permissions.",
-                                relist_exc.status,
+                        if self._pending_count or self._debounced_counts:
+                            self._drain_pending_restarts(now_monotonic=now_monotonic)
+
+                    backoff_seconds = 1
+                    if self._pending_count or self._debounced_counts:
+                        self._drain_pending_restarts(now_monotonic=self.monotonic_fn())
+                except ApiException as exc:
+                    # 410 Gone means etcd compacted past our resourceVersion.
+                    # We must re-list to get a fresh snapshot and resume watching
+                    # from the new resourceVersion.
+                    if exc.status == 410:
+                        self.logger.warning("Watch resource version expired, re-listing")
+                        try:
+                            fresh = self.core_api.list_namespaced_config_map(
+                                namespace=self.namespace,
+                                label_selector=self.app_selector,
                             )
-                            self.ready.clear()
-                            return
-                        self.logger.exception("Failed to re-list after 410")
+                            resource_version = fastpath.resource_version(fresh)
+                            self._sync_cache_from_list(fresh, restart_on_change=True)
+                        except ApiException as relist_exc:
+                            if relist_exc.status in {401, 403}:
+                                self.logger.error(
+                                    "Kubernetes API access denied during 410 re-list (status=%s). "
+                                    "Check controller RBAC and service account permissions.",
+                                    relist_exc.status,
+                                )
+                                self.ready.clear()
+                                return
+                            self.logger.exception("Failed to re-list after 410")
+                            METRICS.watch_errors_total.inc()
+                            resource_version = None
+                        continue
+
+                    if exc.status in {401, 403}:
+                        self.logger.error(
+                            "Kubernetes API watch denied (status=%s). "
+                            "Check controller RBAC and service account permissions.",
+                            exc.status,
+                        )
                         METRICS.watch_errors_total.inc()
-                        resource_version = None
-                    continue
+                        self.ready.clear()
+                        return
 
-                if exc.status in {401, 403}:
-                    self.logger.error(
-                        "Kubernetes API watch denied (status=%s). "
-                        "Check controller RBAC and service account permissions.",
-                        exc.status,
-                    )
+                    self.logger.exception("Kubernetes API watch error")
                     METRICS.watch_errors_total.inc()
-                    self.ready.clear()
-                    return
-
-                self.logger.exception("Kubernetes API watch error")
-                METRICS.watch_errors_total.inc()
-                jittered = backoff_seconds * (0.5 + random.random())  # noqa: S311
-                stop.wait(timeout=jittered)
-                backoff_seconds = min(backoff_seconds * 2, 30)
-            except Exception:
-                self.logger.exception("Unexpected watch error")
-                METRICS.watch_errors_total.inc()
-                jittered = backoff_seconds * (0.5 + random.random())  # noqa: S311
-                stop.wait(timeout=jittered)
-                backoff_seconds = min(backoff_seconds * 2, 30)
-            finally:
-                watcher.stop()
-                with self._watcher_lock:
-                    if self._active_watcher is watcher:
-                        self._active_watcher = None
+                    backoff_seconds = self._sleep_backoff(stop, backoff_seconds)
+                except Exception:
+                    self.logger.exception("Unexpected watch error")
+                    METRICS.watch_errors_total.inc()
+                    backoff_seconds = self._sleep_backoff(stop, backoff_seconds)
+        finally:
+            watcher.stop()
+            self._active_watcher = None
 
-        self._flush_pending_restarts_on_shutdown()
+        dropped = self._flush_pending_restarts_on_shutdown()
+        self._save_hash_state(exclude=dropped)
+        self._flush_debounced_counts()
 
         self.ready.clear()
 
@@ -960,6 +1365,10 @@ def build_controller_from_env(core_api: CoreV1Api, apps_api: AppsV1Api) -> Confi
         ``APP_SELECTOR``     — Label selector for ConfigMaps (``app=helloworld``).
         ``ROLLOUT_ANNOTATION_KEY`` — Annotation set on pod templates (``shipshape.io/restartedAt``).
         ``DEBOUNCE_SECONDS`` — Minimum seconds between restarts per key (``5``).
+        ``DEBOUNCE_MAX_SECONDS`` — Cap for the adaptive debounce window during
+        change bursts (``DEBOUNCE_SECONDS``: fixed window, adaptation off).
+        ``HASH_STATE_PATH`` — File persisting config hashes across restarts so
+        startup drift checks skip unchanged ConfigMaps (unset: disabled).
     """
     namespace = os.getenv("WATCH_NAMESPACE", "shipshape")
     if not namespace.strip():
@@ -974,6 +1383,9 @@ def build_controller_from_env(core_api: CoreV1Api, apps_api: AppsV1Api) -> Confi
 
     rollout_annotation_key = os.getenv("ROLLOUT_ANNOTATION_KEY", "shipshape.io/restartedAt")
     debounce_seconds = env_int("DEBOUNCE_SECONDS", 5, minimum=0)
+    debounce_max_seconds = env_int(
+        "DEBOUNCE_MAX_SECONDS", debounce_seconds, minimum=debounce_seconds
+    )
 
     return ConfigMapReloader(
         core_api=core_api,
@@ -982,4 +1394,7 @@ def build_controller_from_env(core_api: CoreV1Api, apps_api: AppsV1Api) -> Confi
         app_selector=app_selector,
         rollout_annotation_key=rollout_annotation_key,
         debounce_seconds=debounce_seconds,
+        debounce_max_seconds=debounce_max_seconds,
+        hash_state_path=os.getenv("HASH_STATE_PATH") or None,
+        parsed_selector=parsed,
     )
@@ -0,0 +1,146 @@
+"""Per-event hot-path helpers for the ConfigMap reloader.
+
+Everything here is a pure, fully annotated function with no dependency on
+controller state, so the module can be compiled with mypyc
+(``mypyc controller/src/fastpath.py``) without changing callers.  The
+pure-Python module remains the default and is what tests exercise.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Mapping
+from functools import partial
+from hashlib import blake2b, sha256
+from operator import attrgetter
+from types import SimpleNamespace
+from typing import Any
+
+_data_digest: Callable[[], Any]
+try:
+    from xxhash import xxh3_128
+
+    _data_digest = xxh3_128
+except ImportError:  # pragma: no cover - optional speedup, stdlib fallback
+    _data_digest = partial(blake2b, digest_size=16)
+
+_orjson_dumps: Callable[[Any], bytes] | None
+loads_json: Callable[[str | bytes], Any]
+try:
+    import orjson
+
+    _orjson_dumps = partial(orjson.dumps, option=orjson.OPT_SORT_KEYS)
+    loads_json = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup, stdlib fallback
+    _orjson_dumps = None
+    loads_json = json.loads
+
+# C-level chained attribute lookup; replaces four Python-level getattr calls.
+_template_annotations = attrgetter("spec.template.metadata.annotations")
+_resource_version = attrgetter("metadata.resource_version")
+
+
+def normalize_data(raw_data: Any) -> dict[str, str]:
+    """Coerce ConfigMap ``data`` into a stable ``dict[str, str]``.
+
+    Handles ``None`` values (possible when a key exists with no value)
+    and non-dict inputs gracefully so that downstream hashing is
+    deterministic.
+    """
+    if not isinstance(raw_data, dict):
+        return {}
+    return {k: ("" if v is None else str(v)) for k, v in raw_data.items() if isinstance(k, str)}
+
+
+def hash_data(data: dict[str, str]) -> int:
+    """Return a fast digest of the ConfigMap data used for change detection.
+
+    We hash the data content (rather than comparing ``resourceVersion``)
+    because ``resourceVersion`` changes on *any* object mutation
+    including label or annotation edits that do not affect the
+    application.  Hashing only ``data`` avoids false-positive restarts.
+
+    The digest is only compared in-process, so it uses xxh3-128 (or
+    BLAKE2b when ``xxhash`` is unavailable) fed directly from sorted,
+    length-prefixed key/value bytes instead of a JSON intermediate, and is
+    returned as an ``int`` so no hex string is built per event.
+    """
+    digest = _data_digest()
+    for key in sorted(data):
+        key_bytes = key.encode("utf-8")
+        value_bytes = data[key].encode("utf-8")
+        digest.update(len(key_bytes).to_bytes(4, "big"))
+        digest.update(key_bytes)
+        digest.update(len(value_bytes).to_bytes(8, "big"))
+        digest.update(value_bytes)
+    return int.from_bytes(digest.digest(), "big")
+
+
+def config_hash(data: dict[str, str]) -> str:
+    """Return the SHA-256 hex digest stored in the deployment hash annotation.
+
+    The annotation is user-visible and compared across controller
+    versions during startup drift reconciliation, so its format stays
+    a stable SHA-256 over canonical JSON.
+
+    ``orjson`` serialises the payload when installed.  Its output matches
+    ``json.dumps`` byte-for-byte for printable ASCII; anything else (raw
+    UTF-8 or DEL, which ``json.dumps`` escapes) falls back to the stdlib so
+    the published hash never depends on which serialiser ran.
+    """
+    if _orjson_dumps is not None:
+        payload = _orjson_dumps(data)
+        if payload.isascii() and b"\x7f" not in payload:
+            return sha256(payload).hexdigest()
+    stable_payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return sha256(stable_payload.encode("utf-8")).hexdigest()
+
+
+def resource_version(obj: Any) -> str | None:
+    """Return ``obj.metadata.resource_version``, or None if any link is missing."""
+    try:
+        value = _resource_version(obj)
+    except AttributeError:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialise *obj* to compact, key-sorted JSON bytes (``orjson`` if installed)."""
+    if _orjson_dumps is not None:
+        return _orjson_dumps(obj)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def deployment_template_annotations(deployment: Any) -> dict[str, str]:
+    """Extract pod template annotations from a deployment object safely."""
+    try:
+        annotations = _template_annotations(deployment)
+    except AttributeError:
+        return {}
+    if not isinstance(annotations, dict):
+        return {}
+    return {k: ("" if v is None else str(v)) for k, v in annotations.items() if isinstance(k, str)}
+
+
+def matches_labels(labels: Mapping[str, str], required: frozenset[tuple[str, str]]) -> bool:
+    """Return True if *labels* contain every key-value pair in *required*."""
+    return labels.items() >= required
+
+
+def config_map_view(raw: Mapping[str, Any]) -> SimpleNamespace:
+    """Build a minimal ConfigMap facade from a raw watch event object.
+
+    Exposes only ``metadata.name``, ``metadata.labels``,
+    ``metadata.resource_version`` and ``data`` -- everything the reloader
+    reads -- without deserialising a full ``V1ConfigMap`` model.
+    """
+    metadata = raw.get("metadata") or {}
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            name=metadata.get("name"),
+            labels=metadata.get("labels"),
+            resource_version=metadata.get("resourceVersion"),
+        ),
+        data=raw.get("data"),
+    )
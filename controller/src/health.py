@@ -1,87 +1,258 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import threading
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Any
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from types import ModuleType
 
+prometheus_client: ModuleType | None
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover - metrics endpoint degrades to 501
+    prometheus_client = None
 
-class _HealthHandler(BaseHTTPRequestHandler):
-    """HTTP handler serving liveness, readiness, and Prometheus metrics endpoints."""
 
-    ready_event: threading.Event
-    leader_event: threading.Event | None
+def _render_response(status: int, body: bytes = b"") -> bytes:
+    """Render a complete HTTP/1.1 response with an explicit Content-Length."""
+    head = f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+    head += f"Content-Length: {len(body)}\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+# Probe responses never vary, so they are rendered once and written as-is.
+_OK_200 = _render_response(200, b"ok")
+_NOT_LEADER_503 = _render_response(503, b"not leader")
+_READYZ_RESPONSES: dict[tuple[bool, bool], bytes] = {
+    (ready, leader): _render_response(
+        200 if ready and leader else 503,
+        f"ready={str(ready).lower()} leader={str(leader).lower()}".encode(),
+    )
+    for ready in (True, False)
+    for leader in (True, False)
+}
+_NOT_FOUND_404 = _render_response(404)
+_BAD_REQUEST_400 = _render_response(400)
+_NOT_IMPLEMENTED_501 = _render_response(501)
+# Everything before the Content-Length value is fixed, so a scrape only
+# formats the body length.
+_METRICS_HEAD = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\nContent-Length: "
+)
+
+# Scrapes landing within this window (co-scraping Prometheus replicas,
+# sidecars) share one serialisation of the registry.
+_METRICS_CACHE_TTL_SECONDS = 1.0
+_metrics_cache: tuple[float, bytes] | None = None
+_metrics_lock = threading.Lock()
+
+# Probes and scrapes are trivially fast, so small fixed bounds suffice and
+# a flood of connections cannot grow the controller's memory or threads.
+_MAX_CONNECTIONS = 64
+_METRICS_WORKERS = 2
+# A connection that sends no complete request head within this window is
+# closed, so idle keep-alive clients cannot pin the connection cap.
+_IDLE_TIMEOUT_SECONDS = 5.0
+
+
+def _render_metrics(now_fn: Callable[[], float] = time.monotonic) -> bytes:
+    """Serialise the default Prometheus registry (runs on the executor)."""
+    global _metrics_cache
+    if prometheus_client is None:
+        return _NOT_IMPLEMENTED_501
+    cached = _metrics_cache
+    if cached is not None and now_fn() - cached[0] < _METRICS_CACHE_TTL_SECONDS:
+        return cached[1]
+    with _metrics_lock:
+        cached = _metrics_cache
+        now = now_fn()
+        if cached is not None and now - cached[0] < _METRICS_CACHE_TTL_SECONDS:
+            return cached[1]
+        body = prometheus_client.generate_latest()
+        response = b"".join((_METRICS_HEAD, str(len(body)).encode(), b"\r\n\r\n", body))
+        _metrics_cache = (now, response)
+        return response
+
+
+class HealthServer:
+    """Liveness, readiness and Prometheus metrics endpoints on one event loop.
+
+    All connections are serviced by a single asyncio loop running in a
+    daemon thread, so kubelet probes cost no thread creation.  Probe
+    responses are pre-rendered bytes selected by one lookup on the raw
+    request line; other requests are tokenised and routed by path.
+    ``/metrics`` serialisation runs on a small dedicated thread pool so a
+    slow scrape never blocks probes.  Connections are kept alive between
+    requests until idle for ``_IDLE_TIMEOUT_SECONDS`` and capped at
+    ``_MAX_CONNECTIONS``: at the cap a new connection evicts the oldest idle
+    one, and is only refused when every slot is mid-request.
+    """
+
+    def __init__(
+        self,
+        ready: threading.Event,
+        port: int,
+        leader: threading.Event | None = None,
+        host: str = "0.0.0.0",  # noqa: S104
+    ) -> None:
+        self.ready_event = ready
+        self.leader_event = leader
+        # Exact-path route table.  Probe handlers return pre-rendered bytes
+        # synchronously; only /metrics hands back an awaitable.
+        self._routes: dict[bytes, Callable[[], bytes | Awaitable[bytes]]] = {
+            b"/healthz": self._healthz,
+            b"/leadz": self._leadz,
+            b"/readyz": self._readyz,
+            b"/metrics": self._metrics,
+        }
+        # Probes arrive as fixed ``GET <path> HTTP/1.1`` lines, so the whole
+        # request line is the lookup key and needs no tokenising.
+        self._probe_lines: dict[bytes, Callable[[], bytes]] = {
+            b"GET " + path + b" HTTP/1.1": handler
+            for path, handler in (
+                (b"/healthz", self._healthz),
+                (b"/leadz", self._leadz),
+                (b"/readyz", self._readyz),
+            )
+        }
+        self._connections: set[asyncio.Task[None]] = set()
+        # Connections waiting for their next request, oldest first.
+        self._idle: dict[asyncio.Task[None], None] = {}
+        self._metrics_executor = ThreadPoolExecutor(
+            max_workers=_METRICS_WORKERS, thread_name_prefix="health-metrics"
+        )
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._serve_connection, host, port)
+        )
+        self.server_address: tuple[str, int] = self._server.sockets[0].getsockname()[:2]
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="health-server", daemon=True
+        )
+        self._thread.start()
 
     def _leader_ready(self) -> bool:
         return self.leader_event is None or self.leader_event.is_set()
 
-    def _respond(
-        self, status: int, body: bytes = b"", content_type: str | None = None
+    def _healthz(self) -> bytes:
+        return _OK_200
+
+    def _leadz(self) -> bytes:
+        return _OK_200 if self._leader_ready() else _NOT_LEADER_503
+
+    def _readyz(self) -> bytes:
+        return _READYZ_RESPONSES[(self.ready_event.is_set(), self._leader_ready())]
+
+    @staticmethod
+    def _not_found() -> bytes:
+        return _NOT_FOUND_404
+
+    def _metrics(self) -> Awaitable[bytes]:
+        return asyncio.get_running_loop().run_in_executor(self._metrics_executor, _render_metrics)
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
-        """Send an HTTP response with optional body and content type."""
-        self.send_response(status)
-        if content_type:
-            self.send_header("Content-Type", content_type)
-        self.end_headers()
-        if body:
-            self.wfile.write(body)
-
-    def do_GET(self) -> None:
-        if self.path == "/healthz":
-            self._respond(200, b"ok")
-        elif self.path == "/leadz":
-            if self._leader_ready():
-                self._respond(200, b"ok")
-            else:
-                self._respond(503, b"not leader")
-        elif self.path == "/readyz":
-            ready = self.ready_event.is_set()
-            leader_ready = self._leader_ready()
-            if ready and leader_ready:
-                self._respond(200, b"ready=true leader=true")
-            else:
-                ready_text = "true" if ready else "false"
-                leader_text = "true" if leader_ready else "false"
-                self._respond(503, f"ready={ready_text} leader={leader_text}".encode())
-        elif self.path == "/metrics":
-            try:
-                from prometheus_client import generate_latest
-
-                output = generate_latest()
-                self._respond(200, output, "text/plain; version=0.0.4; charset=utf-8")
-            except ImportError:
-                self._respond(501)
-        else:
-            self._respond(404)
-
-    def log_message(self, fmt: str, *args: Any) -> None:
-        logging.getLogger("controller.health").debug(fmt, *args)
-
-
-def make_health_handler(
-    ready: threading.Event, leader: threading.Event | None = None
-) -> type[_HealthHandler]:
-    """Return a handler class bound to the given readiness event.
-
-    Uses class-level attribute binding so the stdlib HTTPServer can
-    instantiate handlers without constructor arguments.
-    """
+        if len(self._connections) >= _MAX_CONNECTIONS and not self._evict_idle():
+            writer.close()
+            return
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            while True:
+                if task is not None:
+                    self._idle[task] = None
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), _IDLE_TIMEOUT_SECONDS
+                    )
+                except (
+                    asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError,
+                    ConnectionError,
+                    TimeoutError,
+                ):
+                    return
+                finally:
+                    if task is not None:
+                        self._idle.pop(task, None)
+
+                request_line, _, headers = head.partition(b"\r\n")
+                probe = self._probe_lines.get(request_line)
+                if probe is not None:
+                    writer.write(probe())
+                    http_11 = True
+                else:
+                    parts = request_line.split(b" ")
+                    if len(parts) != 3 or not parts[2].startswith(b"HTTP/1."):
+                        writer.write(_BAD_REQUEST_400)
+                        await writer.drain()
+                        return
+                    method, path, version = parts
+
+                    if method != b"GET":
+                        # Request bodies are never read, so close rather than
+                        # risk desynchronising the connection.
+                        writer.write(_NOT_IMPLEMENTED_501)
+                        await writer.drain()
+                        return
+
+                    response = self._routes.get(path, self._not_found)()
+                    if not isinstance(response, bytes):
+                        response = await response
+                    writer.write(response)
+                    http_11 = version == b"HTTP/1.1"
+                await writer.drain()
+
+                if not http_11 or b"connection: close" in headers.lower():
+                    return
+        except ConnectionError:
+            return
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+            writer.close()
+
+    def _evict_idle(self) -> bool:
+        """Cancel the oldest idle connection; False if every one is busy."""
+        if not self._idle:
+            return False
+        oldest = next(iter(self._idle))
+        del self._idle[oldest]
+        self._connections.discard(oldest)
+        oldest.cancel()
+        return True
 
-    class _BoundHealthHandler(_HealthHandler):
-        ready_event = ready
-        leader_event = leader
+    async def _close(self) -> None:
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
 
-    return _BoundHealthHandler
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop accepting connections, drop open ones and stop the loop thread."""
+        if self._loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), self._loop).result(timeout=timeout)
+        except FutureTimeoutError:
+            logging.getLogger(__name__).warning("Health server did not close within %ss", timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._metrics_executor.shutdown(wait=False, cancel_futures=True)
 
 
 def start_health_server(
     ready: threading.Event, port: int, leader: threading.Event | None = None
-) -> ThreadingHTTPServer:
+) -> HealthServer:
     """Start the health/metrics HTTP server in a daemon thread and return it."""
-    handler_class = make_health_handler(ready, leader=leader)
-    server = ThreadingHTTPServer(("0.0.0.0", port), handler_class)  # noqa: S104
-    server.daemon_threads = True
-    server.block_on_close = False
-    threading.Thread(target=server.serve_forever, daemon=True).start()
-    logging.getLogger(__name__).info("Health server listening on :%d", port)
+    server = HealthServer(ready, port, leader=leader)
+    logging.getLogger(__name__).info("Health server listening on :%d", server.server_address[1])
     return server
@@ -1,25 +1,33 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from typing import Any
 
-from kubernetes import client, config
+from kubernetes import client, config, watch
 from kubernetes.client import AppsV1Api, CoreV1Api
 from kubernetes.config.config_exception import ConfigException
 
+from controller.src.fastpath import config_map_view, loads_json
+
 LOGGER = logging.getLogger(__name__)
 
 
-def load_kube_configuration() -> None:
+def load_kube_configuration(
+    load_incluster: Callable[[], Any] = config.load_incluster_config,
+    load_kubeconfig: Callable[[], Any] = config.load_kube_config,
+) -> None:
     """Load Kubernetes client configuration.
 
     Attempts in-cluster config first (running inside a pod), falling back
-    to the local kubeconfig for development.
+    to the local kubeconfig for development.  The loaders are injectable
+    for tests.
     """
     try:
-        config.load_incluster_config()
+        load_incluster()
         LOGGER.info("Loaded in-cluster Kubernetes configuration")
     except ConfigException:
-        config.load_kube_config()
+        load_kubeconfig()
         LOGGER.info("Loaded local kubeconfig")
 
 
@@ -44,18 +52,53 @@ def patch_deployment_restart(
     """
     annotations = {annotation_key: timestamp, **(extra_annotations or {})}
 
-    body = {
-        "spec": {
-            "template": {
-                "metadata": {
-                    "annotations": annotations
-                }
-            }
-        }
-    }
+    body = {"spec": {"template": {"metadata": {"annotations": annotations}}}}
 
     apps_api.patch_namespaced_deployment(
         name=deployment_name,
         namespace=namespace,
         body=body,
     )
+
+
+_RAW_EVENT_TYPES = frozenset({"ERROR", "BOOKMARK"})
+
+
+class ConfigMapWatch(watch.Watch):
+    """Watch that decodes ConfigMap events into lightweight facades.
+
+    The stock client parses each event line, re-serialises the object and
+    deserialises it into a full ``V1ConfigMap``.  This subclass parses once
+    (with ``orjson`` when installed) and exposes only the fields the
+    reloader reads via :func:`config_map_view`.  ``ERROR``/``BOOKMARK``
+    events keep the stock ``raw_object`` shape so 410 handling is unchanged;
+    for ConfigMap events ``raw_object`` is ``None`` so the full parsed
+    object is not retained.
+    """
+
+    def reset(self) -> None:
+        """Re-arm a stopped watcher so it can open another stream."""
+        self._stop = False
+
+    def unmarshal_event(self, data: str, return_type: Any) -> dict[str, Any] | None:
+        if not data or data.isspace():
+            return None
+        try:
+            event = loads_json(data)
+        except ValueError:
+            return None
+        if not isinstance(event, dict):
+            return None
+
+        raw_object = event.get("object")
+        if event.get("type") in _RAW_EVENT_TYPES or not isinstance(raw_object, dict):
+            event["raw_object"] = raw_object
+            return event
+        # Only the view is kept: the parsed object (managedFields, other
+        # metadata) is released as soon as the event is decoded.
+        view = config_map_view(raw_object)
+        event["object"] = view
+        event["raw_object"] = None
+        if view.metadata.resource_version:
+            self.resource_version = view.metadata.resource_version
+        return event
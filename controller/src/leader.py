@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import logging
 import os
+import random
+import socket
 import threading
 import time
 from collections.abc import Callable
@@ -10,11 +12,15 @@ from datetime import UTC, datetime
 from kubernetes.client import CoordinationV1Api, V1Lease, V1LeaseSpec, V1ObjectMeta
 from kubernetes.client.exceptions import ApiException
 
-from controller.src.metrics import METRICS
+from controller.src.metrics import METRICS, ControllerMetrics
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
 class LeaseLeaderElector:
     """Lease-based leader election using the ``coordination.k8s.io/v1`` Lease API.
 
@@ -24,14 +30,17 @@ class LeaseLeaderElector:
     1. Try to read the Lease object.  If it does not exist, create it and
        become leader.
     2. If the Lease exists and *we* are the holder, renew it (update
-       ``renewTime``).
+       ``renewTime``).  While leading this is a single JSON-patch guarded
+       by a ``test`` on ``holderIdentity``, with no preceding read.
     3. If another identity holds the Lease, wait until
        ``renewTime + leaseDurationSeconds`` has passed (i.e. the holder
        failed to renew), then take over.
     4. On ``409 Conflict`` (concurrent update), retry on the next cycle.
 
     The ``retry_period_seconds`` (default 2 s) controls the polling
-    interval.  When leadership is lost (e.g. network partition longer
+    interval.  Standby replicas stretch it by up to 20 % of random jitter;
+    the leader renews on the exact period so it stays inside the renew
+    deadline.  When leadership is lost (e.g. network partition longer
     than the lease duration), ``on_stopped_leading`` is invoked so the
     controller watch loop can be stopped cleanly.
 
@@ -47,6 +56,8 @@ class LeaseLeaderElector:
         lease_duration_seconds: int = 15,
         renew_deadline_seconds: int = 10,
         retry_period_seconds: int = 2,
+        now_fn: Callable[[], datetime] = _utc_now,
+        metrics: ControllerMetrics = METRICS,
     ) -> None:
         if lease_duration_seconds < 1:
             raise ValueError("lease_duration_seconds must be >= 1")
@@ -66,18 +77,35 @@ class LeaseLeaderElector:
         self.lease_duration_seconds = lease_duration_seconds
         self.renew_deadline_seconds = renew_deadline_seconds
         self.retry_period_seconds = retry_period_seconds
+        # Wall clock for lease timestamps; injectable for tests.
+        self.now_fn = now_fn
+        self.metrics = metrics
+        self._renew_deadline_ns = renew_deadline_seconds * 1_000_000_000
+        self._acquired_transitions = metrics.leader_transitions_total.labels(transition="acquired")
+        self._lost_transitions = metrics.leader_transitions_total.labels(transition="lost")
         self._is_leader = False
+        # Per-replica jitter for acquire polling so standby replicas started
+        # together do not hit the Lease API in lockstep.
+        self._rng = random.Random(  # noqa: S311
+            hash((socket.gethostname(), os.getpid(), time.time_ns()))
+        )
 
     @property
     def is_leader(self) -> bool:
         return self._is_leader
 
     def _now_utc(self) -> datetime:
-        return datetime.now(UTC)
+        return self.now_fn()
 
     def _try_acquire_or_renew(self) -> bool:
-        """Attempt a single acquire-or-renew cycle.  Returns True on success."""
+        """Attempt a single acquire-or-renew cycle.  Returns True on success.
+
+        While leading, a renewal is a single guarded PATCH; the read-then-
+        replace path is only taken to acquire or when that PATCH fails.
+        """
         now = self._now_utc()
+        if self._is_leader and self._patch_renew_time(now):
+            return True
         try:
             lease = self.coordination_api.read_namespaced_lease(
                 name=self.lease_name,
@@ -108,6 +136,37 @@ class LeaseLeaderElector:
 
         return self._update_lease(lease, now)
 
+    def _patch_renew_time(self, now: datetime) -> bool:
+        """Renew a lease we hold with one JSON-patch round-trip.
+
+        The ``test`` operation makes the API server reject the patch (422)
+        if another replica has taken the lease, so a renewal can never
+        overwrite a different holder.  Returns False on any failure so the
+        caller falls back to the full read path.
+        """
+        body = [
+            {"op": "test", "path": "/spec/holderIdentity", "value": self.identity},
+            {
+                "op": "replace",
+                "path": "/spec/renewTime",
+                "value": now.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            },
+        ]
+        try:
+            self.coordination_api.patch_namespaced_lease(
+                name=self.lease_name,
+                namespace=self.namespace,
+                body=body,
+            )
+            return True
+        except ApiException as exc:
+            LOGGER.debug(
+                "Lease %s renew patch failed (status=%s), re-reading",
+                self.lease_name,
+                exc.status,
+            )
+            return False
+
     def _create_lease(self, now: datetime) -> bool:
         """Create a new Lease object, claiming leadership.
 
@@ -191,9 +250,11 @@ class LeaseLeaderElector:
             self.lease_name,
             self.identity,
         )
-        acquire_wait_started = time.monotonic()
-        last_renew_success = acquire_wait_started
-        METRICS.leader_state.set(0)
+        # Integer nanosecond clock: no float drift in the deadline compare.
+        acquire_wait_started_ns = time.monotonic_ns()
+        last_renew_success_ns = acquire_wait_started_ns
+        metrics = self.metrics
+        metrics.leader_state.set(0)
 
         while not stop_event.is_set():
             try:
@@ -204,40 +265,46 @@ class LeaseLeaderElector:
             if acquired and not self._is_leader:
                 self._is_leader = True
                 LOGGER.info("Became leader (identity=%s)", self.identity)
-                METRICS.leader_state.set(1)
-                METRICS.leader_transitions_total.labels(transition="acquired").inc()
-                acquired_at = time.monotonic()
-                last_renew_success = acquired_at
-                METRICS.leader_acquire_latency_seconds.observe(acquired_at - acquire_wait_started)
+                metrics.leader_state.set(1)
+                self._acquired_transitions.inc()
+                acquired_at_ns = time.monotonic_ns()
+                last_renew_success_ns = acquired_at_ns
+                metrics.leader_acquire_latency_seconds.observe(
+                    (acquired_at_ns - acquire_wait_started_ns) / 1e9
+                )
                 on_started_leading()
             elif acquired and self._is_leader:
-                last_renew_success = time.monotonic()
+                last_renew_success_ns = time.monotonic_ns()
             elif not acquired and self._is_leader:
-                elapsed_since_last_renew = time.monotonic() - last_renew_success
-                if elapsed_since_last_renew < self.renew_deadline_seconds:
+                elapsed_ns = time.monotonic_ns() - last_renew_success_ns
+                if elapsed_ns < self._renew_deadline_ns:
                     LOGGER.warning(
-                        "Lease renewal failed; holding leadership for up to %ss "
-                        "(elapsed %.2fs)",
+                        "Lease renewal failed; holding leadership for up to %ss (elapsed %.2fs)",
                         self.renew_deadline_seconds,
-                        elapsed_since_last_renew,
+                        elapsed_ns / 1e9,
                     )
                 else:
                     self._is_leader = False
                     LOGGER.warning(
                         "Lost leader lease after %.2fs without successful renewal",
-                        elapsed_since_last_renew,
+                        elapsed_ns / 1e9,
                     )
-                    METRICS.leader_state.set(0)
-                    METRICS.leader_transitions_total.labels(transition="lost").inc()
-                    acquire_wait_started = time.monotonic()
+                    metrics.leader_state.set(0)
+                    self._lost_transitions.inc()
+                    acquire_wait_started_ns = time.monotonic_ns()
                     on_stopped_leading()
-            stop_event.wait(timeout=self.retry_period_seconds)
+            if self._is_leader:
+                stop_event.wait(timeout=self.retry_period_seconds)
+            else:
+                stop_event.wait(
+                    timeout=self.retry_period_seconds * (1.0 + 0.2 * self._rng.random())
+                )
 
         if self._is_leader:
             self._release_lease()
             self._is_leader = False
-            METRICS.leader_state.set(0)
-            METRICS.leader_transitions_total.labels(transition="lost").inc()
+            metrics.leader_state.set(0)
+            self._lost_transitions.inc()
             on_stopped_leading()
 
 
@@ -247,4 +314,7 @@ def default_identity() -> str:
     In Kubernetes the ``HOSTNAME`` env var is set to the pod name by the
     downward API, giving each replica a stable identity for lease ownership.
     """
-    return os.getenv("HOSTNAME", os.getenv("POD_NAME", "unknown"))
+    hostname = os.getenv("HOSTNAME")
+    if hostname is not None:
+        return hostname
+    return os.getenv("POD_NAME", "unknown")
@@ -2,95 +2,131 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-from prometheus_client import Counter, Gauge, Histogram, Info
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, Info
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class EnvMetrics:
+    """``env``-labelled counter children for one environment.
+
+    Resolved once per environment so hot paths call ``.inc()`` directly
+    instead of going through ``.labels(env=...)`` on every bump.
+    """
+
+    restarts: Counter
+    errors: Counter
+    debounced: Counter
+    retries: Counter
+
+
+@dataclass(frozen=True, slots=True)
 class ControllerMetrics:
     """Prometheus metrics exported by the controller on ``/metrics``.
 
     All counters use an ``env`` label so operators can alert on per-environment
-    restart rates and error budgets independently.
+    restart rates and error budgets independently.  Build instances with
+    :meth:`create`; tests pass a private ``CollectorRegistry`` to observe
+    metrics without touching the process-wide one.
     """
 
-    restarts_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_restarts_total",
-            "Total deployment restarts triggered by ConfigMap changes",
-            ["env"],
-        )
-    )
-    errors_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_errors_total",
-            "Total deployment restart errors",
-            ["env"],
-        )
-    )
-    debounced_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_debounced_total",
-            "Total ConfigMap events suppressed by debounce",
-            ["env"],
-        )
-    )
-    watch_errors_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_watch_errors_total",
-            "Total Kubernetes watch errors",
-        )
-    )
-    watch_reconnects_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_watch_reconnects_total",
-            "Total watch stream reconnects after the initial connection",
-        )
-    )
-    leader_transitions_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_leader_transitions_total",
-            "Total leadership state transitions",
-            ["transition"],
-        )
-    )
-    leader_state: Gauge = field(
-        default_factory=lambda: Gauge(
-            "configmap_reload_leader_state",
-            "Whether this controller replica is currently leader (1=yes, 0=no)",
-        )
-    )
-    leader_acquire_latency_seconds: Histogram = field(
-        default_factory=lambda: Histogram(
-            "configmap_reload_leader_acquire_latency_seconds",
-            "Seconds spent waiting to acquire leadership",
-            buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, float("inf")),
-        )
-    )
-    pending_restarts: Gauge = field(
-        default_factory=lambda: Gauge(
-            "configmap_reload_pending_restarts",
-            "Current number of debounced restarts waiting to be processed",
-        )
-    )
-    retry_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_retry_total",
-            "Total restart retry attempts scheduled after failed patch operations",
-            ["env"],
-        )
-    )
-    dropped_restarts_total: Counter = field(
-        default_factory=lambda: Counter(
-            "configmap_reload_dropped_restarts_total",
-            "Total pending restarts dropped on shutdown",
-        )
-    )
-    build_info: Info = field(
-        default_factory=lambda: Info(
-            "configmap_reload",
-            "Build information for the controller",
+    restarts_total: Counter
+    errors_total: Counter
+    debounced_total: Counter
+    watch_errors_total: Counter
+    watch_reconnects_total: Counter
+    leader_transitions_total: Counter
+    leader_state: Gauge
+    leader_acquire_latency_seconds: Histogram
+    pending_restarts: Gauge
+    retry_total: Counter
+    dropped_restarts_total: Counter
+    build_info: Info
+    _env_children: dict[str, EnvMetrics] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def create(cls, registry: CollectorRegistry = REGISTRY) -> ControllerMetrics:
+        """Register the controller's metrics on *registry* and return them."""
+        return cls(
+            restarts_total=Counter(
+                "configmap_reload_restarts_total",
+                "Total deployment restarts triggered by ConfigMap changes",
+                ["env"],
+                registry=registry,
+            ),
+            errors_total=Counter(
+                "configmap_reload_errors_total",
+                "Total deployment restart errors",
+                ["env"],
+                registry=registry,
+            ),
+            debounced_total=Counter(
+                "configmap_reload_debounced_total",
+                "Total ConfigMap events suppressed by debounce",
+                ["env"],
+                registry=registry,
+            ),
+            watch_errors_total=Counter(
+                "configmap_reload_watch_errors_total",
+                "Total Kubernetes watch errors",
+                registry=registry,
+            ),
+            watch_reconnects_total=Counter(
+                "configmap_reload_watch_reconnects_total",
+                "Total watch stream reconnects after the initial connection",
+                registry=registry,
+            ),
+            leader_transitions_total=Counter(
+                "configmap_reload_leader_transitions_total",
+                "Total leadership state transitions",
+                ["transition"],
+                registry=registry,
+            ),
+            leader_state=Gauge(
+                "configmap_reload_leader_state",
+                "Whether this controller replica is currently leader (1=yes, 0=no)",
+                registry=registry,
+            ),
+            leader_acquire_latency_seconds=Histogram(
+                "configmap_reload_leader_acquire_latency_seconds",
+                "Seconds spent waiting to acquire leadership",
+                buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, float("inf")),
+                registry=registry,
+            ),
+            pending_restarts=Gauge(
+                "configmap_reload_pending_restarts",
+                "Current number of debounced restarts waiting to be processed",
+                registry=registry,
+            ),
+            retry_total=Counter(
+                "configmap_reload_retry_total",
+                "Total restart retry attempts scheduled after failed patch operations",
+                ["env"],
+                registry=registry,
+            ),
+            dropped_restarts_total=Counter(
+                "configmap_reload_dropped_restarts_total",
+                "Total pending restarts dropped on shutdown",
+                registry=registry,
+            ),
+            build_info=Info(
+                "configmap_reload",
+                "Build information for the controller",
+                registry=registry,
+            ),
         )
-    )
+
+    def for_env(self, env: str) -> EnvMetrics:
+        """Return the cached ``env``-labelled counter children for *env*."""
+        children = self._env_children.get(env)
+        if children is None:
+            children = EnvMetrics(
+                restarts=self.restarts_total.labels(env=env),
+                errors=self.errors_total.labels(env=env),
+                debounced=self.debounced_total.labels(env=env),
+                retries=self.retry_total.labels(env=env),
+            )
+            self._env_children[env] = children
+        return children
 
 
-METRICS = ControllerMetrics()
+METRICS = ControllerMetrics.create()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import threading
+
+
+class FakeEvent(threading.Event):
+    """``threading.Event`` whose ``wait`` never blocks.
+
+    Single-threaded run-loop tests set the flag themselves, so ``wait``
+    just reports it and records each timeout for backoff assertions.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.waits: list[float] = []
+
+    def wait(self, timeout: float | None = None) -> bool:
+        if timeout is not None:
+            self.waits.append(timeout)
+        return self.is_set()
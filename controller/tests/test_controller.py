@@ -1,19 +1,63 @@
 from __future__ import annotations
 
+import copy
+import functools
 import threading
-from datetime import UTC, datetime
+import time
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
-from kubernetes.client import ApiException
+from kubernetes.client.exceptions import ApiException
 
 from controller.src.controller import (
     ConfigMapReloader,
     build_controller_from_env,
     env_int,
 )
+from controller.src.kube import ConfigMapWatch
+from controller.tests.fakes import FakeEvent
+
+
+# Slotted stand-ins for the kubernetes client models, exposing only the
+# attributes the reloader reads.
+@dataclass(slots=True)
+class FakeObjectMeta:
+    name: str | None = None
+    labels: dict[str, str] | None = None
+    resource_version: str | None = None
+    annotations: dict[str, str] | None = None
+
+
+@dataclass(slots=True)
+class FakeConfigMap:
+    metadata: FakeObjectMeta
+    data: dict[str, str] | None
+
+
+@dataclass(slots=True)
+class FakePodTemplate:
+    metadata: FakeObjectMeta
+
+
+@dataclass(slots=True)
+class FakeDeploymentSpec:
+    template: FakePodTemplate
+
+
+@dataclass(slots=True)
+class FakeDeployment:
+    metadata: FakeObjectMeta
+    spec: FakeDeploymentSpec
+
+
+@dataclass(slots=True)
+class FakeList:
+    items: Sequence[Any]
+    metadata: FakeObjectMeta = field(default_factory=FakeObjectMeta)
 
 
 class FakeAppsApi:
@@ -24,29 +68,45 @@ class FakeAppsApi:
         fail_counts: dict[str, int] | None = None,
         template_annotations: dict[str, dict[str, str]] | None = None,
     ) -> None:
-        self.deployment_names = deployment_names
+        self.deployment_names: list[str] = []
+        self.last_selector = ""
+        self.patches: list[tuple[str, dict[str, Any]]] = []
+        self._record_patch = self.patches.append
+        self._items: list[FakeDeployment] = []
+        self.reset(deployment_names, fail_names, fail_counts, template_annotations)
+
+    def reset(
+        self,
+        deployment_names: list[str],
+        fail_names: set[str] | None = None,
+        fail_counts: dict[str, int] | None = None,
+        template_annotations: dict[str, dict[str, str]] | None = None,
+    ) -> None:
+        """Return to a freshly constructed state so one instance can serve many tests."""
         self.fail_names = fail_names or set()
         self.fail_counts = dict(fail_counts or {})
         self.template_annotations = template_annotations or {}
         self.last_selector = ""
-        self.patches: list[tuple[str, dict[str, Any]]] = []
+        self.patches.clear()
+        if deployment_names != self.deployment_names:
+            self.deployment_names = deployment_names
+            # Deployment names are fixed per test, so the object tree is built
+            # once; each list call only rebinds the current annotations.
+            self._items = [
+                FakeDeployment(
+                    metadata=FakeObjectMeta(name=name),
+                    spec=FakeDeploymentSpec(template=FakePodTemplate(metadata=FakeObjectMeta())),
+                )
+                for name in deployment_names
+            ]
 
-    def list_namespaced_deployment(self, namespace: str, label_selector: str) -> SimpleNamespace:
+    def list_namespaced_deployment(self, namespace: str, label_selector: str) -> FakeList:
         self.last_selector = label_selector
-        items = []
-        for name in self.deployment_names:
-            annotations = dict(self.template_annotations.get(name, {}))
-            items.append(
-                SimpleNamespace(
-                    metadata=SimpleNamespace(name=name),
-                    spec=SimpleNamespace(
-                        template=SimpleNamespace(
-                            metadata=SimpleNamespace(annotations=annotations)
-                        )
-                    ),
-                )
+        for item in self._items:
+            item.spec.template.metadata.annotations = self.template_annotations.get(
+                item.metadata.name or "", {}
             )
-        return SimpleNamespace(items=items)
+        return FakeList(items=self._items)
 
     def patch_namespaced_deployment(self, name: str, namespace: str, body: dict[str, Any]) -> None:
         remaining_failures = self.fail_counts.get(name, 0)
@@ -56,17 +116,31 @@ class FakeAppsApi:
         if name in self.fail_names:
             raise ApiException(status=500, reason="boom")
         annotations = (
-            body.get("spec", {})
-            .get("template", {})
-            .get("metadata", {})
-            .get("annotations", {})
+            body.get("spec", {}).get("template", {}).get("metadata", {}).get("annotations", {})
         )
-        if isinstance(annotations, dict):
-            existing = self.template_annotations.setdefault(name, {})
-            for key, value in annotations.items():
-                if isinstance(key, str):
-                    existing[key] = str(value)
-        self.patches.append((name, body))
+        # The reloader always sends str -> str annotations, so they merge as-is.
+        self.template_annotations.setdefault(name, {}).update(annotations)
+        self._record_patch((name, body))
+
+
+class FakeWatcher:
+    """Stand-in for ConfigMapWatch that delegates ``stream`` to a test callback."""
+
+    def __init__(self, stream: Callable[..., Iterator[Any]]) -> None:
+        self._stream = stream
+        self.stream_calls = 0
+        self.stop_calls = 0
+        self.reset_calls = 0
+
+    def stream(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        self.stream_calls += 1
+        return self._stream(*args, **kwargs)
+
+    def stop(self) -> None:
+        self.stop_calls += 1
+
+    def reset(self) -> None:
+        self.reset_calls += 1
 
 
 def make_config_map(
@@ -75,21 +149,96 @@ def make_config_map(
     name: str = "helloworld-config",
     data: dict[str, str] | None = None,
     resource_version: str = "1",
-) -> SimpleNamespace:
+) -> FakeConfigMap:
     labels: dict[str, str] = {}
     if app is not None:
         labels["app"] = app
     if env is not None:
         labels["env"] = env
 
-    return SimpleNamespace(
-        metadata=SimpleNamespace(name=name, labels=labels, resource_version=resource_version),
+    return FakeConfigMap(
+        metadata=FakeObjectMeta(name=name, labels=labels, resource_version=resource_version),
         data=data if data is not None else {"MESSAGE": "hello"},
     )
 
 
+KEY_TEST = ("test", "helloworld-config-test")
+
+# Shared ConfigMaps for the common before/after and v1..v3 event sequences.
+# The reloader only reads these, so tests must not mutate them in place.
+CM_BEFORE = make_config_map(
+    app="helloworld", env="test", name="helloworld-config-test", data={"MESSAGE": "before"}
+)
+CM_AFTER = make_config_map(
+    app="helloworld",
+    env="test",
+    name="helloworld-config-test",
+    data={"MESSAGE": "after"},
+    resource_version="2",
+)
+CM_V1 = make_config_map(
+    app="helloworld", env="test", name="helloworld-config-test", data={"MESSAGE": "v1"}
+)
+CM_V2 = make_config_map(
+    app="helloworld",
+    env="test",
+    name="helloworld-config-test",
+    data={"MESSAGE": "v2"},
+    resource_version="2",
+)
+CM_V3 = make_config_map(
+    app="helloworld",
+    env="test",
+    name="helloworld-config-test",
+    data={"MESSAGE": "v3"},
+    resource_version="3",
+)
+# v2 as returned by a startup list, for the drift reconciliation tests.
+CM_V2_LISTED = make_config_map(
+    app="helloworld",
+    env="test",
+    name="helloworld-config-test",
+    data={"MESSAGE": "v2"},
+    resource_version="200",
+)
+
+
+FIXED_NOW = "2026-01-01T00:00:00Z"
+
+# Read-only API sentinels for build_controller_from_env(), which only stores them.
+_DUMMY_CORE = SimpleNamespace()
+_DUMMY_APPS = SimpleNamespace()
+
+
 def fixed_now() -> str:
-    return datetime(2026, 1, 1, tzinfo=UTC).isoformat().replace("+00:00", "Z")
+    return FIXED_NOW
+
+
+@functools.cache
+def _parsed_selector(app_selector: str) -> dict[str, str]:
+    # The reloader copies the mapping it is given, so one parse per distinct
+    # selector can back every controller the tests build.
+    return ConfigMapReloader._parse_selector(app_selector)
+
+
+@functools.cache
+def _message_hash(message: str) -> str:
+    return ConfigMapReloader._config_hash({"MESSAGE": message})
+
+
+class Clock:
+    """Settable monotonic clock passed to the reloader as ``monotonic_fn``."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# Controllers built by _make_controller; closed after each test so patch
+# pools started by direct handle_configmap_event/drain calls do not leak.
+_open_controllers: list[ConfigMapReloader] = []
 
 
 def _make_controller(
@@ -97,6 +246,9 @@ def _make_controller(
     core_api: Any = None,
     debounce_seconds: int = 0,
     app_selector: str = "app=helloworld",
+    clock: Callable[[], float] = time.monotonic,
+    watch_factory: Callable[[], Any] = ConfigMapWatch,
+    jitter: Callable[[], float] | None = None,
 ) -> ConfigMapReloader:
     controller = ConfigMapReloader(
         core_api=core_api or SimpleNamespace(),
@@ -106,44 +258,75 @@ def _make_controller(
         config_map_name=None,
         rollout_annotation_key="shipshape.io/restartedAt",
         debounce_seconds=debounce_seconds,
+        parsed_selector=_parsed_selector(app_selector),
         now_fn=fixed_now,
+        monotonic_fn=clock,
+        watch_factory=watch_factory,
+        jitter_fn=jitter,
     )
+    _open_controllers.append(controller)
     return controller
 
 
-# ---------------------------------------------------------------------------
-# Core event logic tests
-# ---------------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def _close_controllers() -> Iterator[None]:
+    yield
+    while _open_controllers:
+        _open_controllers.pop().close()
 
 
-def test_ignores_configmaps_without_helloworld_label() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api)
+@pytest.fixture(scope="module")
+def _shared_apps_api() -> FakeAppsApi:
+    return FakeAppsApi(["helloworld-test"])
 
-    result = controller.handle_configmap_event(
-        event_type="MODIFIED",
-        config_map=make_config_map(app="other", env="test"),
-    )
 
-    assert result is None
-    assert apps_api.patches == []
+@pytest.fixture
+def apps_api(_shared_apps_api: FakeAppsApi) -> FakeAppsApi:
+    """A ``helloworld-test`` deployment API, reset rather than rebuilt per test."""
+    _shared_apps_api.reset(["helloworld-test"])
+    return _shared_apps_api
 
 
-def test_added_event_without_baseline_does_not_restart() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api)
+# ---------------------------------------------------------------------------
+# Core event logic tests
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("event_type", "app", "env", "app_selector", "seeds_baseline"),
+    [
+        pytest.param("MODIFIED", "other", "test", "app=helloworld", False, id="foreign-app"),
+        pytest.param("MODIFIED", "helloworld", "test", "app=myapp", False, id="custom-selector"),
+        pytest.param("MODIFIED", "helloworld", None, "app=helloworld", False, id="no-env-label"),
+        pytest.param("DELETED", "helloworld", "test", "app=helloworld", False, id="deleted"),
+        pytest.param("ADDED", "helloworld", "test", "app=helloworld", True, id="added-baseline"),
+    ],
+)
+def test_event_does_not_restart(
+    apps_api: FakeAppsApi,
+    event_type: str,
+    app: str,
+    env: str | None,
+    app_selector: str,
+    seeds_baseline: bool,
+) -> None:
+    """Non-matching, deleted and first-seen ConfigMaps never trigger a restart.
+
+    An ADDED event with no prior baseline seeds the hash for later comparisons.
+    """
+    controller = _make_controller(apps_api=apps_api, app_selector=app_selector)
 
     result = controller.handle_configmap_event(
-        event_type="ADDED",
-        config_map=make_config_map(app="helloworld", env="test", name="helloworld-config-test"),
+        event_type=event_type,
+        config_map=make_config_map(app=app, env=env),
     )
 
     assert result is None
     assert apps_api.patches == []
+    assert (("test", "helloworld-config") in controller._state) is seeds_baseline
 
 
-def test_restarts_only_on_meaningful_data_change() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
+def test_restarts_only_on_meaningful_data_change(apps_api: FakeAppsApi) -> None:
     controller = _make_controller(apps_api=apps_api)
 
     cm = make_config_map(
@@ -178,8 +361,7 @@ def test_restarts_only_on_meaningful_data_change() -> None:
     assert len(apps_api.patches) == 1
 
 
-def test_modified_without_prior_baseline_restarts() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
+def test_modified_without_prior_baseline_restarts(apps_api: FakeAppsApi) -> None:
     controller = _make_controller(apps_api=apps_api)
 
     result = controller.handle_configmap_event(
@@ -203,23 +385,12 @@ def test_restarts_only_matching_environment_deployments() -> None:
 
     controller.handle_configmap_event(
         event_type="ADDED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "before"},
-        ),
+        config_map=CM_BEFORE,
     )
 
     result = controller.handle_configmap_event(
         event_type="MODIFIED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "after"},
-            resource_version="2",
-        ),
+        config_map=CM_AFTER,
     )
 
     assert result is not None
@@ -258,9 +429,73 @@ def test_patch_contains_rollout_annotation() -> None:
     assert len(apps_api.patches) == 1
     _, body = apps_api.patches[0]
     annotations = body["spec"]["template"]["metadata"]["annotations"]
-    assert annotations["shipshape.io/restartedAt"] == "2026-01-01T00:00:00Z"
+    assert annotations["shipshape.io/restartedAt"] == FIXED_NOW
     hash_key = controller._config_hash_annotation_key("helloworld-config-prod")
-    assert annotations[hash_key] == controller._hash_data({"MESSAGE": "after"})
+    assert annotations[hash_key] == _message_hash("after")
+
+
+def test_restart_patches_multiple_deployments_concurrently() -> None:
+    apps_api = FakeAppsApi(deployment_names=["helloworld-a", "helloworld-b"])
+    barrier = threading.Barrier(2, timeout=5)
+    record_patch = apps_api.patch_namespaced_deployment
+
+    def patch_after_barrier(name: str, namespace: str, body: dict[str, Any]) -> None:
+        # Only passes if both patches are in flight at the same time.
+        barrier.wait()
+        record_patch(name=name, namespace=namespace, body=body)
+
+    apps_api.patch_namespaced_deployment = patch_after_barrier  # type: ignore[method-assign]
+    controller = _make_controller(apps_api=apps_api)
+
+    result = controller._restart_deployments_for_env(
+        env="test", config_map_names=["helloworld-config-test"]
+    )
+
+    assert result.restarted == 2
+    assert result.failed == 0
+    assert sorted(name for name, _ in apps_api.patches) == ["helloworld-a", "helloworld-b"]
+
+
+def test_unexpected_patch_error_waits_for_sibling_patches() -> None:
+    apps_api = FakeAppsApi(deployment_names=["helloworld-a", "helloworld-b"])
+    first_failed = threading.Event()
+    settled: list[str] = []
+    record_patch = apps_api.patch_namespaced_deployment
+
+    def patch_or_crash(name: str, namespace: str, body: dict[str, Any]) -> None:
+        if name == "helloworld-a":
+            first_failed.set()
+            raise RuntimeError("unexpected")
+        first_failed.wait(timeout=5)
+        time.sleep(0.05)
+        record_patch(name=name, namespace=namespace, body=body)
+        settled.append(name)
+
+    apps_api.patch_namespaced_deployment = patch_or_crash  # type: ignore[method-assign]
+    controller = _make_controller(apps_api=apps_api)
+
+    with pytest.raises(RuntimeError, match="unexpected"):
+        controller._restart_deployments_for_env(
+            env="test", config_map_names=["helloworld-config-test"]
+        )
+
+    # The sibling patch finished before the error propagated.
+    assert settled == ["helloworld-b"]
+
+
+def test_run_forever_closes_patch_pool_on_return() -> None:
+    controller = _make_controller()
+    pool = controller._patch_pool()
+    stop = FakeEvent()
+    stop.set()
+
+    controller.run_forever(shutdown_event=stop)
+
+    assert controller._patch_executor is None
+    with pytest.raises(RuntimeError, match="after shutdown"):
+        pool.submit(int)
+    # A later run gets a fresh pool.
+    assert controller._patch_pool() is not pool
 
 
 def test_controller_handles_patch_failures_and_continues() -> None:
@@ -272,30 +507,19 @@ def test_controller_handles_patch_failures_and_continues() -> None:
 
     controller.handle_configmap_event(
         event_type="ADDED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "before"},
-        ),
+        config_map=CM_BEFORE,
     )
 
     result = controller.handle_configmap_event(
         event_type="MODIFIED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "after"},
-            resource_version="2",
-        ),
+        config_map=CM_AFTER,
     )
 
     assert result is not None
     assert result.matched_deployments == 2
     assert result.restarted == 1
     assert result.failed == 1
-    assert ("test", "helloworld-config-test") in controller._pending_restarts
+    assert KEY_TEST in controller._pending_keys()
 
 
 def test_controller_retries_failed_restart_until_success() -> None:
@@ -303,41 +527,83 @@ def test_controller_retries_failed_restart_until_success() -> None:
         deployment_names=["helloworld-test"],
         fail_counts={"helloworld-test": 1},
     )
-    controller = _make_controller(apps_api=apps_api)
+    clock = Clock()
+    controller = _make_controller(apps_api=apps_api, clock=clock)
+
+    controller.handle_configmap_event(
+        event_type="ADDED",
+        config_map=CM_BEFORE,
+    )
 
+    clock.now = 100.0
+    failed = controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_AFTER,
+    )
+
+    assert failed is not None
+    assert failed.failed == 1
+    assert KEY_TEST in controller._pending_keys()
+    assert controller._state[KEY_TEST].last_restart is None
+
+    clock.now = 101.0
+    controller._drain_pending_restarts(now_monotonic=101.0)
+
+    assert len(apps_api.patches) == 1
+    assert controller._pending_keys() == []
+    assert controller._state[KEY_TEST].last_restart is not None
+
+
+def test_handle_event_uses_supplied_monotonic_tick(apps_api: FakeAppsApi) -> None:
+    monotonic = MagicMock()
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=5, clock=monotonic)
     controller.handle_configmap_event(
         event_type="ADDED",
+        config_map=make_config_map(
+            app="helloworld", env="test", name=KEY_TEST[1], data={"MESSAGE": "before"}
+        ),
+    )
+    controller._key_state(KEY_TEST).last_restart = 100.0
+
+    controller.handle_configmap_event(
+        event_type="MODIFIED",
         config_map=make_config_map(
             app="helloworld",
             env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "before"},
+            name=KEY_TEST[1],
+            data={"MESSAGE": "after"},
+            resource_version="2",
         ),
+        now_monotonic=102.0,
     )
 
-    with patch("controller.src.controller.time.monotonic", return_value=100.0):
-        failed = controller.handle_configmap_event(
-            event_type="MODIFIED",
-            config_map=make_config_map(
-                app="helloworld",
-                env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "after"},
-                resource_version="2",
-            ),
-        )
+    monotonic.assert_not_called()
+    assert controller._state[KEY_TEST].pending_due == pytest.approx(105.0)
+    assert apps_api.patches == []
 
-    assert failed is not None
-    assert failed.failed == 1
-    assert ("test", "helloworld-config-test") in controller._pending_restarts
-    assert ("test", "helloworld-config-test") not in controller._last_restart
 
-    with patch("controller.src.controller.time.monotonic", return_value=101.0):
-        controller._drain_pending_restarts(now_monotonic=101.0)
+def test_drain_batches_due_configmaps_in_same_env(apps_api: FakeAppsApi) -> None:
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=5)
+    names = ["helloworld-config-a", "helloworld-config-b"]
+    controller._sync_cache_from_list(
+        FakeList(items=[make_config_map(app="helloworld", env="test", name=name) for name in names])
+    )
+    for name in names:
+        controller._schedule_pending_restart(
+            env="test", config_map_name=name, now_monotonic=100.0, delay_seconds=5.0
+        )
+
+    with patch.object(
+        apps_api, "list_namespaced_deployment", wraps=apps_api.list_namespaced_deployment
+    ) as list_deployments:
+        controller._drain_pending_restarts(now_monotonic=106.0)
 
+    assert list_deployments.call_count == 1
     assert len(apps_api.patches) == 1
-    assert controller._pending_restarts == {}
-    assert ("test", "helloworld-config-test") in controller._last_restart
+    annotations = apps_api.template_annotations["helloworld-test"]
+    for name in names:
+        assert controller._config_hash_annotation_key(name) in annotations
+    assert controller._pending_keys() == []
 
 
 def test_shutdown_flush_drops_pending_intent_when_restart_keeps_failing() -> None:
@@ -345,73 +611,45 @@ def test_shutdown_flush_drops_pending_intent_when_restart_keeps_failing() -> Non
         deployment_names=["helloworld-test"],
         fail_names={"helloworld-test"},
     )
-    controller = _make_controller(apps_api=apps_api)
+    clock = Clock()
+    controller = _make_controller(apps_api=apps_api, clock=clock)
 
     controller.handle_configmap_event(
         event_type="ADDED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "before"},
-        ),
+        config_map=CM_BEFORE,
     )
 
-    with patch("controller.src.controller.time.monotonic", return_value=100.0):
-        failed = controller.handle_configmap_event(
-            event_type="MODIFIED",
-            config_map=make_config_map(
-                app="helloworld",
-                env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "after"},
-                resource_version="2",
-            ),
-        )
+    clock.now = 100.0
+    failed = controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_AFTER,
+    )
 
     assert failed is not None
     assert failed.failed == 1
-    assert len(controller._pending_restarts) == 1
+    assert len(controller._pending_keys()) == 1
 
-    with patch("controller.src.controller.time.monotonic", return_value=101.0):
-        controller._flush_pending_restarts_on_shutdown()
+    clock.now = 101.0
+    controller._flush_pending_restarts_on_shutdown()
 
-    assert controller._pending_restarts == {}
+    assert controller._pending_keys() == []
 
 
-def test_controller_debounces_fast_repeated_events() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
+def test_controller_debounces_fast_repeated_events(apps_api: FakeAppsApi) -> None:
     controller = _make_controller(apps_api=apps_api, debounce_seconds=60)
 
     controller.handle_configmap_event(
         event_type="ADDED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "v1"},
-        ),
+        config_map=CM_V1,
     )
 
     first = controller.handle_configmap_event(
         event_type="MODIFIED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "v2"},
-            resource_version="2",
-        ),
+        config_map=CM_V2,
     )
     second = controller.handle_configmap_event(
         event_type="MODIFIED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "v3"},
-            resource_version="3",
-        ),
+        config_map=CM_V3,
     )
 
     assert first is not None
@@ -419,50 +657,67 @@ def test_controller_debounces_fast_repeated_events() -> None:
     assert len(apps_api.patches) == 1
 
 
-def test_controller_debounce_coalesces_and_retries_latest_state() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api, debounce_seconds=60)
+def test_controller_debounce_coalesces_and_retries_latest_state(apps_api: FakeAppsApi) -> None:
+    clock = Clock()
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=60, clock=clock)
 
     controller.handle_configmap_event(
         event_type="ADDED",
-        config_map=make_config_map(
-            app="helloworld",
-            env="test",
-            name="helloworld-config-test",
-            data={"MESSAGE": "v1"},
-        ),
+        config_map=CM_V1,
     )
 
-    with patch("controller.src.controller.time.monotonic", side_effect=[100.0, 110.0]):
-        first = controller.handle_configmap_event(
-            event_type="MODIFIED",
-            config_map=make_config_map(
-                app="helloworld",
-                env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "v2"},
-                resource_version="2",
-            ),
-        )
-        second = controller.handle_configmap_event(
-            event_type="MODIFIED",
-            config_map=make_config_map(
-                app="helloworld",
-                env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "v3"},
-                resource_version="3",
-            ),
-        )
+    clock.now = 100.0
+    first = controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_V2,
+    )
+    clock.now = 110.0
+    second = controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_V3,
+    )
 
     assert first is not None
     assert second is None
     assert len(apps_api.patches) == 1
-    assert ("test", "helloworld-config-test") in controller._pending_restarts
+    assert KEY_TEST in controller._pending_keys()
 
     controller._drain_pending_restarts(now_monotonic=161.0)
     assert len(apps_api.patches) == 2
-    assert controller._pending_restarts == {}
+    assert controller._pending_keys() == []
+
+
+def test_adaptive_debounce_window_grows_during_bursts_and_resets_when_quiet() -> None:
+    controller = ConfigMapReloader(
+        core_api=SimpleNamespace(),
+        apps_api=FakeAppsApi([]),
+        namespace="shipshape",
+        app_selector="app=helloworld",
+        rollout_annotation_key="shipshape.io/restartedAt",
+        debounce_seconds=5,
+        debounce_max_seconds=30,
+        now_fn=fixed_now,
+    )
+    controller._key_state(KEY_TEST).last_restart = 100.0
+
+    windows = []
+    for now in (100.0, 101.0, 102.0, 103.0, 104.0):
+        controller._advance_debounce_window(*KEY_TEST, now_monotonic=now)
+        windows.append(controller._state[KEY_TEST].debounce_window)
+    assert windows == [5.0, 10.0, 20.0, 30.0, 30.0]
+    assert controller._debounce_remaining(*KEY_TEST, now_monotonic=104.0) == pytest.approx(26.0)
+
+    controller._advance_debounce_window(*KEY_TEST, now_monotonic=200.0)
+    assert controller._state[KEY_TEST].debounce_window == 5.0
+
+
+def test_fixed_debounce_window_when_max_not_configured() -> None:
+    controller = _make_controller(debounce_seconds=5)
+
+    controller._advance_debounce_window(*KEY_TEST, now_monotonic=100.0)
+    controller._advance_debounce_window(*KEY_TEST, now_monotonic=101.0)
+
+    assert controller._state[KEY_TEST].debounce_window == 5.0
 
 
 def test_custom_app_selector_matches_correctly() -> None:
@@ -488,74 +743,92 @@ def test_custom_app_selector_matches_correctly() -> None:
     assert result.restarted == 1
 
 
-def test_custom_app_selector_rejects_non_matching() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api, app_selector="app=myapp")
+def test_multi_label_selector_requires_every_pair() -> None:
+    controller = _make_controller(app_selector="app=helloworld,tier=web")
 
-    result = controller.handle_configmap_event(
-        event_type="MODIFIED",
-        config_map=make_config_map(app="helloworld", env="test"),
+    assert controller._matches_app_labels({"app": "helloworld", "tier": "web", "env": "test"})
+    assert not controller._matches_app_labels({"app": "helloworld", "env": "test"})
+    assert not controller._matches_app_labels({"app": "helloworld", "tier": "db"})
+
+
+def test_hash_data_ignores_key_order_and_separates_entries() -> None:
+    assert ConfigMapReloader._hash_data({"a": "1", "b": "2"}) == ConfigMapReloader._hash_data(
+        {"b": "2", "a": "1"}
+    )
+    assert ConfigMapReloader._hash_data({"a": "1b2"}) != ConfigMapReloader._hash_data(
+        {"a": "1", "b": "2"}
     )
 
-    assert result is None
 
+def test_unchanged_data_does_not_recompute_config_hash() -> None:
+    controller = _make_controller()
+    cm = make_config_map(app="helloworld", env="test")
+    controller.handle_configmap_event(event_type="ADDED", config_map=cm)
 
-def test_ignores_deleted_events() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api)
+    cm.metadata.resource_version = "2"
 
-    result = controller.handle_configmap_event(
-        event_type="DELETED",
-        config_map=make_config_map(app="helloworld", env="test"),
-    )
+    with patch.object(ConfigMapReloader, "_config_hash") as config_hash_mock:
+        controller.handle_configmap_event(event_type="MODIFIED", config_map=cm)
 
-    assert result is None
-    assert apps_api.patches == []
+    config_hash_mock.assert_not_called()
 
 
-def test_ignores_configmap_without_env_label() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api)
+def test_unchanged_resource_version_skips_hashing() -> None:
+    controller = _make_controller()
+    cm = make_config_map(app="helloworld", env="test", resource_version="7")
+    controller.handle_configmap_event(event_type="ADDED", config_map=cm)
 
-    result = controller.handle_configmap_event(
-        event_type="MODIFIED",
-        config_map=make_config_map(app="helloworld", env=None),
-    )
+    with patch.object(ConfigMapReloader, "_hash_data") as hash_data_mock:
+        result = controller.handle_configmap_event(event_type="MODIFIED", config_map=cm)
 
     assert result is None
+    hash_data_mock.assert_not_called()
 
 
-# ---------------------------------------------------------------------------
-# Initial sync tests
-# ---------------------------------------------------------------------------
+def test_config_hash_annotation_key_sanitizes_and_truncates_long_names() -> None:
+    controller = _make_controller()
 
+    assert (
+        controller._config_hash_annotation_key("helloworld config/test")
+        == "shipshape.io/config-hash-helloworld-config-test"
+    )
+    long_key = controller._config_hash_annotation_key("x" * 80)
+    assert long_key.startswith("shipshape.io/config-hash-x")
+    assert len(long_key.partition("/")[2]) == 63
+    assert controller._config_hash_annotation_key("x" * 80) == long_key
+    assert ConfigMapReloader._compute_hash_annotation_key.cache_info().hits >= 1
 
-def test_added_event_seeds_baseline_without_restart() -> None:
-    """An ADDED event with no prior baseline seeds the hash but does not restart."""
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api)
 
-    result = controller.handle_configmap_event(
-        event_type="ADDED",
-        config_map=make_config_map(app="helloworld", env="test"),
-    )
+def test_deployment_template_annotations_cached_by_resource_version() -> None:
+    controller = _make_controller()
 
-    assert result is None
-    assert apps_api.patches == []
-    # Baseline should now be set
-    assert ("test", "helloworld-config") in controller._last_data_hash
+    def deployment(resource_version: str, value: str) -> FakeDeployment:
+        return FakeDeployment(
+            metadata=FakeObjectMeta(name="helloworld-test", resource_version=resource_version),
+            spec=FakeDeploymentSpec(
+                template=FakePodTemplate(metadata=FakeObjectMeta(annotations={"k": value}))
+            ),
+        )
+
+    first = controller._deployment_template_annotations(deployment("1", "a"))
+    assert controller._deployment_template_annotations(deployment("1", "ignored")) is first
+    assert controller._deployment_template_annotations(deployment("2", "b")) == {"k": "b"}
 
 
-def test_added_event_with_stale_baseline_triggers_restart() -> None:
+# ---------------------------------------------------------------------------
+# Initial sync tests
+# ---------------------------------------------------------------------------
+
+
+def test_added_event_with_stale_baseline_triggers_restart(apps_api: FakeAppsApi) -> None:
     """An ADDED event where data differs from the cached baseline triggers a restart.
 
     This covers the case where a ConfigMap is recreated mid-watch.
     """
-    apps_api = FakeAppsApi(["helloworld-test"])
     controller = _make_controller(apps_api=apps_api)
 
     cm = make_config_map(app="helloworld", env="test")
-    controller._last_data_hash[("test", "helloworld-config")] = "stale-hash"
+    controller._key_state(("test", "helloworld-config")).data_hash = 0
 
     result = controller.handle_configmap_event(
         event_type="ADDED",
@@ -566,9 +839,8 @@ def test_added_event_with_stale_baseline_triggers_restart() -> None:
     assert result.restarted == 1
 
 
-def test_added_event_mid_watch_new_configmap_seeds_baseline() -> None:
+def test_added_event_mid_watch_new_configmap_seeds_baseline(apps_api: FakeAppsApi) -> None:
     """A brand-new ConfigMap appearing mid-watch seeds the baseline (no prior hash)."""
-    apps_api = FakeAppsApi(["helloworld-test"])
     controller = _make_controller(apps_api=apps_api)
 
     # Simulate mid-watch: no prior hash exists for this ConfigMap
@@ -581,7 +853,7 @@ def test_added_event_mid_watch_new_configmap_seeds_baseline() -> None:
 
     # First ADDED with no baseline should seed, not restart
     assert result is None
-    assert ("test", "helloworld-config-new") in controller._last_data_hash
+    assert ("test", "helloworld-config-new") in controller._state
 
     # Subsequent MODIFIED with changed data should restart
     result = controller.handle_configmap_event(
@@ -599,14 +871,8 @@ def test_added_event_mid_watch_new_configmap_seeds_baseline() -> None:
 
 
 def test_startup_reconciliation_restarts_when_deployment_hash_is_stale() -> None:
-    config_map = make_config_map(
-        app="helloworld",
-        env="test",
-        name="helloworld-config-test",
-        data={"MESSAGE": "v2"},
-        resource_version="200",
-    )
-    stale_hash = ConfigMapReloader._hash_data({"MESSAGE": "v1"})
+    config_map = CM_V2_LISTED
+    stale_hash = _message_hash("v1")
 
     apps_api = FakeAppsApi(
         ["helloworld-test"],
@@ -620,41 +886,30 @@ def test_startup_reconciliation_restarts_when_deployment_hash_is_stale() -> None
     hash_key = controller._config_hash_annotation_key("helloworld-config-test")
     apps_api.template_annotations["helloworld-test"][hash_key] = stale_hash
 
-    listing = SimpleNamespace(items=[config_map])
+    listing = FakeList(items=[config_map])
     controller._sync_cache_from_list(listing, restart_on_change=False)
     controller._reconcile_startup_drift(listing)
 
     assert len(apps_api.patches) == 1
-    expected_hash = ConfigMapReloader._hash_data({"MESSAGE": "v2"})
+    expected_hash = _message_hash("v2")
     assert apps_api.template_annotations["helloworld-test"][hash_key] == expected_hash
 
 
-def test_startup_reconciliation_skips_deployments_without_hash_or_restart_annotation() -> None:
-    config_map = make_config_map(
-        app="helloworld",
-        env="test",
-        name="helloworld-config-test",
-        data={"MESSAGE": "v2"},
-        resource_version="200",
-    )
-    apps_api = FakeAppsApi(["helloworld-test"])
+def test_startup_reconciliation_skips_deployments_without_hash_or_restart_annotation(
+    apps_api: FakeAppsApi,
+) -> None:
+    config_map = CM_V2_LISTED
     controller = _make_controller(apps_api=apps_api)
 
-    listing = SimpleNamespace(items=[config_map])
+    listing = FakeList(items=[config_map])
     controller._sync_cache_from_list(listing, restart_on_change=False)
     controller._reconcile_startup_drift(listing)
 
-    assert len(apps_api.patches) == 0
-
-
-def test_startup_reconciliation_repairs_legacy_restart_annotation_without_hash() -> None:
-    config_map = make_config_map(
-        app="helloworld",
-        env="test",
-        name="helloworld-config-test",
-        data={"MESSAGE": "v2"},
-        resource_version="200",
-    )
+    assert len(apps_api.patches) == 0
+
+
+def test_startup_reconciliation_repairs_legacy_restart_annotation_without_hash() -> None:
+    config_map = CM_V2_LISTED
     apps_api = FakeAppsApi(
         ["helloworld-test"],
         template_annotations={
@@ -666,7 +921,7 @@ def test_startup_reconciliation_repairs_legacy_restart_annotation_without_hash()
     controller = _make_controller(apps_api=apps_api)
     hash_key = controller._config_hash_annotation_key("helloworld-config-test")
 
-    listing = SimpleNamespace(items=[config_map])
+    listing = FakeList(items=[config_map])
     controller._sync_cache_from_list(listing, restart_on_change=False)
     controller._reconcile_startup_drift(listing)
 
@@ -676,33 +931,53 @@ def test_startup_reconciliation_repairs_legacy_restart_annotation_without_hash()
 
 # ---------------------------------------------------------------------------
 # Watch loop tests
+#
+# Every substitution below goes through constructor injection, monkeypatch or
+# a per-test fake, so these tests share no state and need no xdist grouping
+# under `pytest -n`.
 # ---------------------------------------------------------------------------
 
 
-def _fake_core_api(
-    resource_versions: list[str] | None = None,
-    item_sets: list[list[SimpleNamespace]] | None = None,
-) -> SimpleNamespace:
-    versions = resource_versions or ["100"]
-    items_by_call = item_sets or [[]]
-    call_count = 0
+@functools.cache
+def _empty_listing(resource_version: str) -> FakeList:
+    # Shared by every FakeCoreApi; the tuple keeps it immutable.
+    return FakeList(items=(), metadata=FakeObjectMeta(resource_version=resource_version))
 
-    def fake_list(**kwargs: Any) -> SimpleNamespace:
-        nonlocal call_count
-        index = min(call_count, len(versions) - 1)
-        items_index = min(call_count, len(items_by_call) - 1)
-        call_count += 1
-        return SimpleNamespace(
-            metadata=SimpleNamespace(resource_version=versions[index]),
-            items=items_by_call[items_index],
-        )
 
-    return SimpleNamespace(list_namespaced_config_map=fake_list)
+def _listing(items: list[FakeConfigMap], resource_version: str) -> FakeList:
+    if not items:
+        return _empty_listing(resource_version)
+    return FakeList(items=items, metadata=FakeObjectMeta(resource_version=resource_version))
+
+
+class FakeCoreApi:
+    """ConfigMap lister replaying prebuilt listings; the last one repeats."""
+
+    __slots__ = ("_listings", "calls")
+
+    def __init__(
+        self,
+        resource_versions: list[str] | None = None,
+        item_sets: list[list[FakeConfigMap]] | None = None,
+    ) -> None:
+        versions = resource_versions or ["100"]
+        items_by_call = item_sets or [[]]
+        self._listings = [
+            _listing(
+                items_by_call[min(index, len(items_by_call) - 1)],
+                versions[min(index, len(versions) - 1)],
+            )
+            for index in range(max(len(versions), len(items_by_call)))
+        ]
+        self.calls = 0
 
+    def list_namespaced_config_map(self, **kwargs: Any) -> FakeList:
+        listing = self._listings[min(self.calls, len(self._listings) - 1)]
+        self.calls += 1
+        return listing
 
-def test_run_forever_processes_events_and_tracks_resource_version() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
 
+def test_run_forever_processes_events_and_tracks_resource_version(apps_api: FakeAppsApi) -> None:
     initial = make_config_map(
         app="helloworld",
         env="test",
@@ -719,11 +994,9 @@ def test_run_forever_processes_events_and_tracks_resource_version() -> None:
     )
     fake_event = {"type": "MODIFIED", "object": event_obj}
 
-    core_api = _fake_core_api(resource_versions=["100"], item_sets=[[initial]])
-    controller = _make_controller(apps_api=apps_api, core_api=core_api)
+    core_api = FakeCoreApi(resource_versions=["100"], item_sets=[[initial]])
 
-    shutdown_event = threading.Event()
-    mock_watcher = MagicMock()
+    shutdown_event = FakeEvent()
     call_count = 0
 
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
@@ -734,13 +1007,45 @@ def test_run_forever_processes_events_and_tracks_resource_version() -> None:
         shutdown_event.set()
         return iter([])
 
-    mock_watcher.stream.side_effect = patched_stream
+    mock_watcher = FakeWatcher(patched_stream)
 
-    with patch("controller.src.controller.watch.Watch", return_value=mock_watcher):
-        controller.run_forever(shutdown_event=shutdown_event)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=core_api,
+        watch_factory=lambda: mock_watcher,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
     assert len(apps_api.patches) == 1
-    assert mock_watcher.stop.call_count >= 1
+    assert mock_watcher.stop_calls >= 1
+
+
+def test_run_forever_applies_app_selector_server_side() -> None:
+    list_selectors: list[str | None] = []
+
+    def fake_list(**kwargs: Any) -> FakeList:
+        list_selectors.append(kwargs.get("label_selector"))
+        return FakeList(items=[], metadata=FakeObjectMeta(resource_version="100"))
+
+    shutdown_event = FakeEvent()
+    stream_selectors: list[str | None] = []
+
+    def patched_stream(*args: Any, **kwargs: Any) -> Any:
+        stream_selectors.append(kwargs.get("label_selector"))
+        shutdown_event.set()
+        return iter([])
+
+    mock_watcher = FakeWatcher(patched_stream)
+
+    controller = _make_controller(
+        core_api=SimpleNamespace(list_namespaced_config_map=fake_list),
+        app_selector="app=helloworld,tier=web",
+        watch_factory=lambda: mock_watcher,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
+
+    assert list_selectors == ["app=helloworld,tier=web"]
+    assert stream_selectors == ["app=helloworld,tier=web"]
 
 
 def test_run_forever_reconciles_startup_drift_before_watch() -> None:
@@ -759,36 +1064,165 @@ def test_run_forever_reconciles_startup_drift_before_watch() -> None:
             }
         },
     )
+    shutdown_event = FakeEvent()
+
+    def patched_stream(*args: Any, **kwargs: Any) -> Any:
+        shutdown_event.set()
+        return iter([])
+
+    mock_watcher = FakeWatcher(patched_stream)
     controller = _make_controller(
         apps_api=apps_api,
-        core_api=_fake_core_api(resource_versions=["100"], item_sets=[[initial]]),
+        core_api=FakeCoreApi(resource_versions=["100"], item_sets=[[initial]]),
+        watch_factory=lambda: mock_watcher,
     )
     hash_key = controller._config_hash_annotation_key("helloworld-config-test")
-    apps_api.template_annotations["helloworld-test"][hash_key] = ConfigMapReloader._hash_data(
-        {"MESSAGE": "before-downtime"}
+    apps_api.template_annotations["helloworld-test"][hash_key] = _message_hash("before-downtime")
+
+    controller.run_forever(shutdown_event=shutdown_event)
+
+    assert len(apps_api.patches) == 1
+    assert apps_api.template_annotations["helloworld-test"][hash_key] == _message_hash(
+        "after-downtime"
     )
 
-    shutdown_event = threading.Event()
-    mock_watcher = MagicMock()
 
-    def patched_stream(*args: Any, **kwargs: Any) -> Any:
-        shutdown_event.set()
-        return iter([])
+def test_startup_drift_lists_deployments_once_per_env(apps_api: FakeAppsApi) -> None:
+    controller = _make_controller(apps_api=apps_api)
+    listing = FakeList(
+        items=[
+            make_config_map(app="helloworld", env="test", name=name, data={"MESSAGE": name})
+            for name in ("helloworld-config-a", "helloworld-config-b")
+        ]
+    )
+    controller._sync_cache_from_list(listing)
+    apps_api.template_annotations["helloworld-test"] = {
+        controller._config_hash_annotation_key(item.metadata.name): ConfigMapReloader._config_hash(
+            item.data
+        )
+        for item in listing.items
+    }
 
-    mock_watcher.stream.side_effect = patched_stream
+    with patch.object(
+        apps_api, "list_namespaced_deployment", wraps=apps_api.list_namespaced_deployment
+    ) as list_deployments:
+        controller._reconcile_startup_drift(listing)
 
-    with patch("controller.src.controller.watch.Watch", return_value=mock_watcher):
-        controller.run_forever(shutdown_event=shutdown_event)
+    assert list_deployments.call_count == 1
+    assert apps_api.patches == []
 
-    assert len(apps_api.patches) == 1
-    assert (
-        apps_api.template_annotations["helloworld-test"][hash_key]
-        == ConfigMapReloader._hash_data({"MESSAGE": "after-downtime"})
+
+def test_persisted_hash_state_skips_startup_drift_for_unchanged_configmaps(
+    apps_api: FakeAppsApi, tmp_path: Any
+) -> None:
+    state_path = str(tmp_path / "hash-state.json")
+    listing = FakeList(
+        items=[
+            make_config_map(app="helloworld", env="test", name=name, data={"MESSAGE": name})
+            for name in ("helloworld-config-a", "helloworld-config-b")
+        ]
+    )
+    previous = _make_controller()
+    previous.hash_state_path = state_path
+    previous._sync_cache_from_list(listing)
+    previous._reconcile_startup_drift(listing)
+    previous._save_hash_state(exclude={("test", "helloworld-config-b")})
+
+    controller = _make_controller(apps_api=apps_api)
+    controller.hash_state_path = state_path
+    controller._sync_cache_from_list(listing)
+    controller._load_hash_state()
+
+    with patch.object(
+        apps_api, "list_namespaced_deployment", wraps=apps_api.list_namespaced_deployment
+    ) as list_deployments:
+        controller._reconcile_startup_drift(listing)
+
+    # Only the ConfigMap excluded from the persisted state is drift-checked.
+    assert list_deployments.call_count == 1
+
+
+def test_hash_state_is_consumed_so_a_crash_cannot_replay_it(
+    apps_api: FakeAppsApi, tmp_path: Any
+) -> None:
+    state_path = str(tmp_path / "hash-state.json")
+    deployment = "helloworld-test"
+    original = FakeList(
+        items=[make_config_map(app="helloworld", env="test", data={"MESSAGE": "one"})]
+    )
+    config_map_name = original.items[0].metadata.name
+
+    # Run 1 reconciles H1 and shuts down cleanly.
+    first = _make_controller()
+    first.hash_state_path = state_path
+    first._sync_cache_from_list(original)
+    first._reconcile_startup_drift(original)
+    first._save_hash_state(exclude=set())
+
+    # Run 2 consumes the state, restarts the deployment to H2, then is killed
+    # before it can persist anything.
+    second = _make_controller(apps_api=apps_api)
+    second.hash_state_path = state_path
+    second._load_hash_state()
+    assert second._persisted_config_hashes
+    hash_key = second._config_hash_annotation_key(config_map_name)
+    apps_api.template_annotations[deployment] = {hash_key: _message_hash("two")}
+
+    # The ConfigMap is reverted to H1 while no controller is running.
+    third = _make_controller(apps_api=apps_api)
+    third.hash_state_path = state_path
+    third._sync_cache_from_list(original)
+    third._load_hash_state()
+    third._reconcile_startup_drift(original)
+
+    assert third._persisted_config_hashes == {}
+    assert apps_api.template_annotations[deployment][hash_key] == _message_hash("one")
+
+
+def test_hash_state_omits_configmaps_whose_startup_drift_check_failed(
+    apps_api: FakeAppsApi, tmp_path: Any
+) -> None:
+    state_path = str(tmp_path / "hash-state.json")
+    listing = FakeList(
+        items=[
+            make_config_map(
+                app="helloworld", env=env, name=f"helloworld-config-{env}", data={"MESSAGE": env}
+            )
+            for env in ("test", "prod")
+        ]
     )
+    controller = _make_controller(apps_api=apps_api)
+    controller.hash_state_path = state_path
+    controller._sync_cache_from_list(listing)
+
+    def list_deployments(namespace: str, label_selector: str) -> FakeList:
+        if label_selector.endswith("env=prod"):
+            raise ApiException(status=500, reason="boom")
+        return FakeList(items=[])
+
+    with patch.object(apps_api, "list_namespaced_deployment", side_effect=list_deployments):
+        controller._reconcile_startup_drift(listing)
+    controller._save_hash_state(exclude=set())
+
+    # The next run must still drift-check the ConfigMap whose listing failed.
+    restarted = _make_controller(apps_api=apps_api)
+    restarted.hash_state_path = state_path
+    restarted._load_hash_state()
+    assert list(restarted._persisted_config_hashes) == [("test", "helloworld-config-test")]
+
+
+def test_unreadable_hash_state_is_ignored(tmp_path: Any) -> None:
+    state_file = tmp_path / "hash-state.json"
+    state_file.write_text("{not json", encoding="utf-8")
+    controller = _make_controller()
+    controller.hash_state_path = str(state_file)
+
+    controller._load_hash_state()
 
+    assert controller._persisted_config_hashes == {}
 
-def test_run_forever_resets_resource_version_on_410() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
+
+def test_run_forever_resets_resource_version_on_410(apps_api: FakeAppsApi) -> None:
     initial = make_config_map(
         app="helloworld",
         env="test",
@@ -796,17 +1230,14 @@ def test_run_forever_resets_resource_version_on_410() -> None:
         data={"MESSAGE": "same"},
         resource_version="100",
     )
-    core_api = _fake_core_api(
+    core_api = FakeCoreApi(
         resource_versions=["100", "200"],
         item_sets=[[initial], [initial]],
     )
 
-    controller = _make_controller(apps_api=apps_api, core_api=core_api)
-
     call_count = 0
     resource_versions_seen: list[Any] = []
-    shutdown_event = threading.Event()
-    mock_watcher = MagicMock()
+    shutdown_event = FakeEvent()
 
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
         nonlocal call_count
@@ -817,18 +1248,26 @@ def test_run_forever_resets_resource_version_on_410() -> None:
         shutdown_event.set()
         return iter([])
 
-    mock_watcher.stream.side_effect = patched_stream
+    mock_watcher = FakeWatcher(patched_stream)
+
+    built: list[FakeWatcher] = []
+
+    def watch_factory() -> FakeWatcher:
+        built.append(mock_watcher)
+        return mock_watcher
 
-    with patch("controller.src.controller.watch.Watch", return_value=mock_watcher):
-        controller.run_forever(shutdown_event=shutdown_event)
+    controller = _make_controller(apps_api=apps_api, core_api=core_api, watch_factory=watch_factory)
+    controller.run_forever(shutdown_event=shutdown_event)
 
     assert resource_versions_seen[0] == "100"
     assert resource_versions_seen[1] == "200"
+    # The same watcher is re-armed for the reconnect rather than rebuilt.
+    assert built == [mock_watcher]
+    assert mock_watcher.reset_calls == 2
+    assert controller._active_watcher is None
 
 
-def test_run_forever_relist_restarts_when_data_drift_detected() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-
+def test_run_forever_relist_restarts_when_data_drift_detected(apps_api: FakeAppsApi) -> None:
     initial = make_config_map(
         app="helloworld",
         env="test",
@@ -844,14 +1283,12 @@ def test_run_forever_relist_restarts_when_data_drift_detected() -> None:
         resource_version="200",
     )
 
-    core_api = _fake_core_api(
+    core_api = FakeCoreApi(
         resource_versions=["100", "200"],
         item_sets=[[initial], [relist]],
     )
-    controller = _make_controller(apps_api=apps_api, core_api=core_api)
 
-    shutdown_event = threading.Event()
-    mock_watcher = MagicMock()
+    shutdown_event = FakeEvent()
     call_count = 0
 
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
@@ -862,18 +1299,20 @@ def test_run_forever_relist_restarts_when_data_drift_detected() -> None:
         shutdown_event.set()
         return iter([])
 
-    mock_watcher.stream.side_effect = patched_stream
+    mock_watcher = FakeWatcher(patched_stream)
 
-    with patch("controller.src.controller.watch.Watch", return_value=mock_watcher):
-        controller.run_forever(shutdown_event=shutdown_event)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=core_api,
+        watch_factory=lambda: mock_watcher,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
     assert len(apps_api.patches) == 1
 
 
-def test_run_forever_retries_initial_list_on_transient_error() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    shutdown_event = threading.Event()
-    wait_values: list[float] = []
+def test_run_forever_retries_initial_list_on_transient_error(apps_api: FakeAppsApi) -> None:
+    shutdown_event = FakeEvent()
 
     initial = make_config_map(
         app="helloworld",
@@ -885,137 +1324,133 @@ def test_run_forever_retries_initial_list_on_transient_error() -> None:
 
     list_attempts = 0
 
-    def fake_list(**kwargs: Any) -> SimpleNamespace:
+    def fake_list(**kwargs: Any) -> FakeList:
         nonlocal list_attempts
         list_attempts += 1
         if list_attempts == 1:
             raise ApiException(status=500, reason="temporary startup failure")
-        return SimpleNamespace(metadata=SimpleNamespace(resource_version="100"), items=[initial])
+        return FakeList(items=[initial], metadata=FakeObjectMeta(resource_version="100"))
 
     core_api = SimpleNamespace(list_namespaced_config_map=fake_list)
-    controller = _make_controller(apps_api=apps_api, core_api=core_api)
-
-    mock_watcher = MagicMock()
 
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
         shutdown_event.set()
         return iter([])
 
-    mock_watcher.stream.side_effect = patched_stream
-
-    def fake_wait(timeout: float | None = None) -> bool:
-        if timeout is not None:
-            wait_values.append(timeout)
-        return False
+    mock_watcher = FakeWatcher(patched_stream)
 
-    with (
-        patch("controller.src.controller.watch.Watch", return_value=mock_watcher),
-        patch("controller.src.controller.threading.Event.wait", side_effect=fake_wait),
-        patch("controller.src.controller.random.random", return_value=0.5),
-    ):
-        controller.run_forever(shutdown_event=shutdown_event)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=core_api,
+        watch_factory=lambda: mock_watcher,
+        jitter=lambda: 0.5,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
     assert list_attempts == 2
-    assert wait_values == [pytest.approx(1.0)]
-    assert mock_watcher.stream.call_count == 1
+    assert shutdown_event.waits == [pytest.approx(1.0)]
+    assert mock_watcher.stream_calls == 1
+
+
+def test_sleep_backoff_jitters_and_doubles_to_cap() -> None:
+    controller = _make_controller(jitter=lambda: 0.25)
+    stop = FakeEvent()
+
+    sequence = [1]
+    while sequence[-1] < 30:
+        sequence.append(controller._sleep_backoff(stop, sequence[-1]))
 
+    assert sequence == [1, 2, 4, 8, 16, 30]
+    assert stop.waits[0] == pytest.approx(0.75)
 
-def test_run_forever_exits_fast_on_startup_rbac_denied() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
 
-    def fake_list(**kwargs: Any) -> SimpleNamespace:
+@pytest.mark.parametrize(("current", "expected_next"), [(1, 2), (2, 4), (4, 8)])
+def test_sleep_backoff_waits_current_interval_at_mid_jitter(
+    current: int, expected_next: int
+) -> None:
+    controller = _make_controller(jitter=lambda: 0.5)
+    stop = FakeEvent()
+
+    assert controller._sleep_backoff(stop, current) == expected_next
+    assert stop.waits == [pytest.approx(float(current))]
+
+
+def test_controllers_draw_backoff_jitter_from_independent_rngs() -> None:
+    first = _make_controller()
+    second = _make_controller()
+
+    assert first._rng is not second._rng
+    assert [first._rand() for _ in range(4)] != [second._rand() for _ in range(4)]
+
+
+def test_run_forever_exits_fast_on_startup_rbac_denied(apps_api: FakeAppsApi) -> None:
+    def fake_list(**kwargs: Any) -> FakeList:
         raise ApiException(status=403, reason="forbidden")
 
     core_api = SimpleNamespace(list_namespaced_config_map=fake_list)
-    controller = _make_controller(apps_api=apps_api, core_api=core_api)
-    watch_factory = MagicMock()
+    built: list[FakeWatcher] = []
 
-    with patch("controller.src.controller.watch.Watch", watch_factory):
-        controller.run_forever(shutdown_event=threading.Event())
-
-    watch_factory.assert_not_called()
-    assert not controller.ready.is_set()
+    def watch_factory() -> FakeWatcher:
+        built.append(FakeWatcher(lambda **kwargs: iter([])))
+        return built[-1]
 
+    controller = _make_controller(apps_api=apps_api, core_api=core_api, watch_factory=watch_factory)
+    controller.run_forever(shutdown_event=FakeEvent())
 
-def test_run_forever_exits_fast_on_watch_rbac_denied() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    shutdown_event = threading.Event()
-    wait_values: list[float] = []
+    assert built == []
+    assert not controller.ready.is_set()
 
-    controller = _make_controller(apps_api=apps_api, core_api=_fake_core_api())
 
-    mock_watcher = MagicMock()
+def test_run_forever_exits_fast_on_watch_rbac_denied(apps_api: FakeAppsApi) -> None:
+    shutdown_event = FakeEvent()
 
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
         raise ApiException(status=401, reason="unauthorized")
 
-    mock_watcher.stream.side_effect = patched_stream
-
-    def fake_wait(timeout: float | None = None) -> bool:
-        if timeout is not None:
-            wait_values.append(timeout)
-        return False
+    mock_watcher = FakeWatcher(patched_stream)
 
-    with (
-        patch("controller.src.controller.watch.Watch", return_value=mock_watcher),
-        patch("controller.src.controller.threading.Event.wait", side_effect=fake_wait),
-    ):
-        controller.run_forever(shutdown_event=shutdown_event)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=FakeCoreApi(),
+        watch_factory=lambda: mock_watcher,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
-    assert wait_values == []
+    assert shutdown_event.waits == []
     assert not controller.ready.is_set()
 
 
-def test_run_forever_applies_exponential_backoff_on_api_error() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    shutdown_event = threading.Event()
-    wait_values: list[float] = []
-
-    controller = _make_controller(apps_api=apps_api, core_api=_fake_core_api())
+def test_run_forever_backs_off_after_api_error(apps_api: FakeAppsApi) -> None:
+    shutdown_event = FakeEvent()
 
     call_count = 0
 
-    mock_watcher = MagicMock()
-
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
         nonlocal call_count
         call_count += 1
-        if call_count <= 3:
+        if call_count == 1:
             raise ApiException(status=500, reason="Internal Server Error")
         shutdown_event.set()
         return iter([])
 
-    mock_watcher.stream.side_effect = patched_stream
+    mock_watcher = FakeWatcher(patched_stream)
 
-    def fake_wait(timeout: float | None = None) -> bool:
-        if timeout is not None:
-            wait_values.append(timeout)
-        return False
-
-    with (
-        patch("controller.src.controller.watch.Watch", return_value=mock_watcher),
-        patch("controller.src.controller.threading.Event.wait", side_effect=fake_wait),
-        patch("controller.src.controller.random.random", return_value=0.5),
-    ):
-        controller.run_forever(shutdown_event=shutdown_event)
-
-    assert len(wait_values) == 3
-    assert wait_values[0] == pytest.approx(1.0)
-    assert wait_values[1] == pytest.approx(2.0)
-    assert wait_values[2] == pytest.approx(4.0)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=FakeCoreApi(),
+        watch_factory=lambda: mock_watcher,
+        jitter=lambda: 0.5,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
+    assert shutdown_event.waits == [pytest.approx(1.0)]
 
-def test_run_forever_resets_backoff_after_successful_stream() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    shutdown_event = threading.Event()
-    wait_values: list[float] = []
 
-    controller = _make_controller(apps_api=apps_api, core_api=_fake_core_api())
+def test_run_forever_resets_backoff_after_successful_stream(apps_api: FakeAppsApi) -> None:
+    shutdown_event = FakeEvent()
 
     call_count = 0
 
-    mock_watcher = MagicMock()
-
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
         nonlocal call_count
         call_count += 1
@@ -1028,36 +1463,26 @@ def test_run_forever_resets_backoff_after_successful_stream() -> None:
         shutdown_event.set()
         return iter([])
 
-    mock_watcher.stream.side_effect = patched_stream
-
-    def fake_wait(timeout: float | None = None) -> bool:
-        if timeout is not None:
-            wait_values.append(timeout)
-        return False
-
-    with (
-        patch("controller.src.controller.watch.Watch", return_value=mock_watcher),
-        patch("controller.src.controller.threading.Event.wait", side_effect=fake_wait),
-        patch("controller.src.controller.random.random", return_value=0.5),
-    ):
-        controller.run_forever(shutdown_event=shutdown_event)
+    mock_watcher = FakeWatcher(patched_stream)
 
-    assert len(wait_values) == 2
-    assert wait_values[0] == pytest.approx(1.0)
-    assert wait_values[1] == pytest.approx(1.0)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=FakeCoreApi(),
+        watch_factory=lambda: mock_watcher,
+        jitter=lambda: 0.5,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
+    assert len(shutdown_event.waits) == 2
+    assert shutdown_event.waits[0] == pytest.approx(1.0)
+    assert shutdown_event.waits[1] == pytest.approx(1.0)
 
-def test_run_forever_handles_unexpected_exception_with_backoff() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    shutdown_event = threading.Event()
-    wait_values: list[float] = []
 
-    controller = _make_controller(apps_api=apps_api, core_api=_fake_core_api())
+def test_run_forever_handles_unexpected_exception_with_backoff(apps_api: FakeAppsApi) -> None:
+    shutdown_event = FakeEvent()
 
     call_count = 0
 
-    mock_watcher = MagicMock()
-
     def patched_stream(*args: Any, **kwargs: Any) -> Any:
         nonlocal call_count
         call_count += 1
@@ -1066,34 +1491,89 @@ def test_run_forever_handles_unexpected_exception_with_backoff() -> None:
         shutdown_event.set()
         return iter([])
 
-    mock_watcher.stream.side_effect = patched_stream
+    mock_watcher = FakeWatcher(patched_stream)
+
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=FakeCoreApi(),
+        watch_factory=lambda: mock_watcher,
+        jitter=lambda: 0.5,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
+
+    assert len(shutdown_event.waits) == 1
+
+
+def test_run_forever_skips_drains_while_nothing_pending(monkeypatch: pytest.MonkeyPatch) -> None:
+    shutdown_event = FakeEvent()
+    events = [
+        {"type": "ADDED", "object": make_config_map(app="helloworld", env="test")},
+    ]
+
+    def patched_stream(*args: Any, **kwargs: Any) -> Any:
+        shutdown_event.set()
+        return iter(events)
+
+    mock_watcher = FakeWatcher(patched_stream)
+
+    controller = _make_controller(core_api=FakeCoreApi(), watch_factory=lambda: mock_watcher)
+    drains: list[float] = []
+
+    def record_drain(now_monotonic: float) -> None:
+        drains.append(now_monotonic)
+
+    monkeypatch.setattr(controller, "_drain_pending_restarts", record_drain)
+    controller.run_forever(shutdown_event=shutdown_event)
+
+    assert drains == []
+
+
+def test_request_stop_interrupts_active_watcher() -> None:
+    controller = _make_controller()
+    watcher = FakeWatcher(lambda **kwargs: iter([]))
+    controller._active_watcher = watcher
+
+    controller.request_stop()
+
+    assert watcher.stop_calls == 1
+    assert controller._should_stop(FakeEvent())
 
-    def fake_wait(timeout: float | None = None) -> bool:
-        if timeout is not None:
-            wait_values.append(timeout)
-        return False
 
-    with (
-        patch("controller.src.controller.watch.Watch", return_value=mock_watcher),
-        patch("controller.src.controller.threading.Event.wait", side_effect=fake_wait),
-        patch("controller.src.controller.random.random", return_value=0.5),
-    ):
-        controller.run_forever(shutdown_event=shutdown_event)
+def test_request_stop_wakes_backoff_sleep_immediately() -> None:
+    listed = threading.Event()
 
-    assert len(wait_values) == 1
+    def failing_list(**kwargs: Any) -> FakeList:
+        listed.set()
+        raise ApiException(status=500, reason="unavailable")
 
+    controller = _make_controller(
+        core_api=SimpleNamespace(list_namespaced_config_map=failing_list),
+        jitter=lambda: 1.0,  # first backoff sleeps 1.5 s
+    )
+    runner = threading.Thread(
+        target=controller.run_forever, kwargs={"shutdown_event": threading.Event()}
+    )
+    runner.start()
+
+    assert listed.wait(timeout=2)
+    controller.request_stop()
+    runner.join(timeout=0.5)
 
-def test_run_forever_shutdown_event_stops_loop() -> None:
-    apps_api = FakeAppsApi(["helloworld-test"])
-    shutdown_event = threading.Event()
+    assert not runner.is_alive()
+
+
+def test_run_forever_shutdown_event_stops_loop(apps_api: FakeAppsApi) -> None:
+    shutdown_event = FakeEvent()
     shutdown_event.set()
-    controller = _make_controller(apps_api=apps_api, core_api=_fake_core_api())
 
-    mock_watcher = MagicMock()
-    mock_watcher.stream.return_value = iter([])
+    mock_watcher = FakeWatcher(lambda **kwargs: iter([]))
 
-    with patch("controller.src.controller.watch.Watch", return_value=mock_watcher):
-        controller.run_forever(shutdown_event=shutdown_event)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=FakeCoreApi(),
+        watch_factory=lambda: mock_watcher,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
     assert apps_api.patches == []
 
@@ -1105,52 +1585,109 @@ def test_next_watch_timeout_defaults_without_pending_restarts() -> None:
 
 def test_next_watch_timeout_tracks_pending_restart_deadline() -> None:
     controller = _make_controller()
-    controller._pending_restarts[("test", "helloworld-config-test")] = 105.2
+    controller._schedule_pending_restart(
+        env="test",
+        config_map_name="helloworld-config-test",
+        now_monotonic=100.0,
+        delay_seconds=5.2,
+    )
     assert controller._next_watch_timeout_seconds(now_monotonic=100.0) == 6
 
 
-# ---------------------------------------------------------------------------
-# env_int() tests
-# ---------------------------------------------------------------------------
+def test_next_watch_timeout_skips_superseded_heap_entries() -> None:
+    controller = _make_controller()
+    controller._schedule_pending_restart(
+        env="test", config_map_name=KEY_TEST[1], now_monotonic=100.0, delay_seconds=2.0
+    )
+    controller._schedule_pending_restart(
+        env="test", config_map_name=KEY_TEST[1], now_monotonic=100.0, delay_seconds=8.0
+    )
 
+    assert controller._next_watch_timeout_seconds(now_monotonic=100.0) == 8
+    assert controller._pop_due_pending(now_monotonic=105.0) == []
+    assert controller._pop_due_pending(now_monotonic=108.0) == [KEY_TEST]
 
-def test_env_int_returns_default_when_not_set(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.delenv("TEST_ENV_INT", raising=False)
-    assert env_int("TEST_ENV_INT", 42) == 42
 
+def test_pending_gauge_only_updated_when_count_changes() -> None:
+    controller = _make_controller()
 
-def test_env_int_parses_valid_integer(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("TEST_ENV_INT", "10")
-    assert env_int("TEST_ENV_INT", 42) == 10
+    with patch("controller.src.controller.METRICS") as metrics:
+        for delay_seconds in (2.0, 4.0, 8.0):
+            controller._schedule_pending_restart(
+                env="test",
+                config_map_name=KEY_TEST[1],
+                now_monotonic=100.0,
+                delay_seconds=delay_seconds,
+            )
+        controller._clear_pending(controller._state[KEY_TEST])
+        controller._clear_pending(controller._state[KEY_TEST])
 
+    assert [c.args for c in metrics.pending_restarts.set.call_args_list] == [(1,), (0,)]
 
-def test_env_int_raises_on_non_numeric(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("TEST_ENV_INT", "abc")
-    with pytest.raises(ValueError, match="TEST_ENV_INT must be an integer"):
-        env_int("TEST_ENV_INT", 42)
 
+def test_restart_counters_use_cached_env_children(apps_api: FakeAppsApi) -> None:
+    from controller.src.metrics import METRICS
 
-def test_env_int_raises_on_empty_string(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("TEST_ENV_INT", "")
-    with pytest.raises(ValueError, match="TEST_ENV_INT must be an integer"):
-        env_int("TEST_ENV_INT", 42)
+    controller = _make_controller(apps_api=apps_api)
+    counters = METRICS.for_env("test")
+    before = counters.restarts._value.get()
 
+    controller.handle_configmap_event("ADDED", make_config_map(app="helloworld", env="test"))
+    controller.handle_configmap_event(
+        "MODIFIED",
+        make_config_map(
+            app="helloworld", env="test", data={"MESSAGE": "new"}, resource_version="2"
+        ),
+    )
 
-def test_env_int_parses_negative_without_minimum(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("TEST_ENV_INT", "-5")
-    assert env_int("TEST_ENV_INT", 42) == -5
+    assert METRICS.for_env("test") is counters
+    assert counters.restarts is METRICS.restarts_total.labels(env="test")
+    assert counters.restarts._value.get() - before == 1
 
 
-def test_env_int_enforces_minimum(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("TEST_ENV_INT", "-1")
-    with pytest.raises(ValueError, match="TEST_ENV_INT must be >= 0, got: -1"):
-        env_int("TEST_ENV_INT", 42, minimum=0)
+# ---------------------------------------------------------------------------
+# env_int() tests
+# ---------------------------------------------------------------------------
 
 
-def test_env_int_enforces_maximum(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setenv("TEST_ENV_INT", "70000")
-    with pytest.raises(ValueError, match="TEST_ENV_INT must be <= 65535, got: 70000"):
-        env_int("TEST_ENV_INT", 42, maximum=65535)
+@pytest.mark.parametrize(
+    ("value", "kwargs", "expected"),
+    [
+        pytest.param(None, {}, 42, id="unset-uses-default"),
+        pytest.param("10", {}, 10, id="valid"),
+        pytest.param("-5", {}, -5, id="negative-without-minimum"),
+    ],
+)
+def test_env_int_parses(
+    monkeypatch: pytest.MonkeyPatch, value: str | None, kwargs: dict[str, int], expected: int
+) -> None:
+    if value is None:
+        monkeypatch.delenv("TEST_ENV_INT", raising=False)
+    else:
+        monkeypatch.setenv("TEST_ENV_INT", value)
+    assert env_int("TEST_ENV_INT", 42, **kwargs) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "kwargs", "match"),
+    [
+        pytest.param("abc", {}, "TEST_ENV_INT must be an integer", id="non-numeric"),
+        pytest.param("", {}, "TEST_ENV_INT must be an integer", id="empty"),
+        pytest.param("-1", {"minimum": 0}, "TEST_ENV_INT must be >= 0, got: -1", id="minimum"),
+        pytest.param(
+            "70000",
+            {"maximum": 65535},
+            "TEST_ENV_INT must be <= 65535, got: 70000",
+            id="maximum",
+        ),
+    ],
+)
+def test_env_int_rejects(
+    monkeypatch: pytest.MonkeyPatch, value: str, kwargs: dict[str, int], match: str
+) -> None:
+    monkeypatch.setenv("TEST_ENV_INT", value)
+    with pytest.raises(ValueError, match=match):
+        env_int("TEST_ENV_INT", 42, **kwargs)
 
 
 # ---------------------------------------------------------------------------
@@ -1163,16 +1700,15 @@ def test_build_controller_from_env_defaults(monkeypatch: pytest.MonkeyPatch) ->
     monkeypatch.delenv("APP_SELECTOR", raising=False)
     monkeypatch.delenv("ROLLOUT_ANNOTATION_KEY", raising=False)
     monkeypatch.delenv("DEBOUNCE_SECONDS", raising=False)
+    monkeypatch.delenv("DEBOUNCE_MAX_SECONDS", raising=False)
 
-    core_api = SimpleNamespace()
-    apps_api = SimpleNamespace()
-
-    controller = build_controller_from_env(core_api=core_api, apps_api=apps_api)
+    controller = build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
 
     assert controller.namespace == "shipshape"
     assert controller.app_selector == "app=helloworld"
     assert controller.rollout_annotation_key == "shipshape.io/restartedAt"
     assert controller.debounce_seconds == 5
+    assert controller.debounce_max_seconds == 5
 
 
 def test_build_controller_from_env_custom_values(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -1181,10 +1717,7 @@ def test_build_controller_from_env_custom_values(monkeypatch: pytest.MonkeyPatch
     monkeypatch.setenv("ROLLOUT_ANNOTATION_KEY", "custom.io/restart")
     monkeypatch.setenv("DEBOUNCE_SECONDS", "15")
 
-    core_api = SimpleNamespace()
-    apps_api = SimpleNamespace()
-
-    controller = build_controller_from_env(core_api=core_api, apps_api=apps_api)
+    controller = build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
 
     assert controller.namespace == "custom-ns"
     assert controller.app_selector == "app=myapp"
@@ -1192,20 +1725,40 @@ def test_build_controller_from_env_custom_values(monkeypatch: pytest.MonkeyPatch
     assert controller.debounce_seconds == 15
 
 
+def test_build_controller_from_env_parses_selector_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("APP_SELECTOR", "app=myapp,tier=web")
+
+    with patch.object(
+        ConfigMapReloader, "_parse_selector", wraps=ConfigMapReloader._parse_selector
+    ) as parse:
+        controller = build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
+
+    parse.assert_called_once_with("app=myapp,tier=web")
+    assert controller._app_label_filters == {"app": "myapp", "tier": "web"}
+
+
 def test_build_controller_from_env_invalid_debounce(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("DEBOUNCE_SECONDS", "not-a-number")
 
-    core_api = SimpleNamespace()
-    apps_api = SimpleNamespace()
-
     with pytest.raises(ValueError, match="DEBOUNCE_SECONDS must be an integer"):
-        build_controller_from_env(core_api=core_api, apps_api=apps_api)
+        build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
 
 
 def test_build_controller_from_env_negative_debounce(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("DEBOUNCE_SECONDS", "-1")
     with pytest.raises(ValueError, match="DEBOUNCE_SECONDS must be >= 0, got: -1"):
-        build_controller_from_env(core_api=SimpleNamespace(), apps_api=SimpleNamespace())
+        build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
+
+
+def test_build_controller_from_env_debounce_max_below_base(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("DEBOUNCE_SECONDS", "10")
+    monkeypatch.setenv("DEBOUNCE_MAX_SECONDS", "5")
+    with pytest.raises(ValueError, match="DEBOUNCE_MAX_SECONDS must be >= 10, got: 5"):
+        build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
 
 
 # ---------------------------------------------------------------------------
@@ -1213,19 +1766,43 @@ def test_build_controller_from_env_negative_debounce(monkeypatch: pytest.MonkeyP
 # ---------------------------------------------------------------------------
 
 
-def test_parse_selector_single_label() -> None:
-    result = ConfigMapReloader._parse_selector("app=helloworld")
-    assert result == {"app": "helloworld"}
+@pytest.mark.parametrize(
+    ("selector", "expected"),
+    [
+        pytest.param("app=helloworld", {"app": "helloworld"}, id="single"),
+        pytest.param(
+            "app=helloworld,tier=frontend",
+            {"app": "helloworld", "tier": "frontend"},
+            id="multiple",
+        ),
+        pytest.param(
+            "app = helloworld , tier = frontend",
+            {"app": "helloworld", "tier": "frontend"},
+            id="whitespace",
+        ),
+        pytest.param(
+            "app=helloworld,legacy, tier = a=b ",
+            {"app": "helloworld", "tier": "a=b"},
+            id="clause-without-equals",
+        ),
+    ],
+)
+def test_parse_selector(selector: str, expected: dict[str, str]) -> None:
+    assert ConfigMapReloader._parse_selector(selector) == expected
+
 
+def test_deployment_selector_keeps_pinned_env() -> None:
+    controller = _make_controller(app_selector=" app=helloworld , env=prod")
+    assert controller._deployment_selector_for_env("test") == "app=helloworld,env=prod"
 
-def test_parse_selector_multiple_labels() -> None:
-    result = ConfigMapReloader._parse_selector("app=helloworld,tier=frontend")
-    assert result == {"app": "helloworld", "tier": "frontend"}
 
+def test_deployment_selector_memoized_per_env() -> None:
+    controller = _make_controller()
+    selector = controller._deployment_selector_for_env("test")
 
-def test_parse_selector_with_spaces() -> None:
-    result = ConfigMapReloader._parse_selector("app = helloworld , tier = frontend")
-    assert result == {"app": "helloworld", "tier": "frontend"}
+    assert selector == "app=helloworld,env=test"
+    assert controller._deployment_selector_for_env("test") is selector
+    assert controller._deployment_selector_for_env("prod") == "app=helloworld,env=prod"
 
 
 # ---------------------------------------------------------------------------
@@ -1233,157 +1810,189 @@ def test_parse_selector_with_spaces() -> None:
 # ---------------------------------------------------------------------------
 
 
-def test_shutdown_drains_due_pending_restarts() -> None:
+def test_shutdown_drains_due_pending_restarts(apps_api: FakeAppsApi) -> None:
     """Pending restarts that are past their due-at time are drained on shutdown."""
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api, debounce_seconds=60)
+    clock = Clock()
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=60, clock=clock)
 
     # Seed baseline
     controller.handle_configmap_event(
         event_type="ADDED",
-        config_map=make_config_map(
-            app="helloworld", env="test", name="helloworld-config-test", data={"MESSAGE": "v1"}
-        ),
+        config_map=CM_V1,
     )
 
     # Trigger change + debounce
-    with patch("controller.src.controller.time.monotonic", return_value=100.0):
+    clock.now = 100.0
+    controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_V2,
+    )
+
+    # First event restarts immediately; second change would be debounced
+    clock.now = 105.0
+    controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_V3,
+    )
+
+    assert len(controller._pending_keys()) == 1
+
+    # Simulate shutdown after debounce window elapses
+    clock.now = 200.0
+    controller._drain_pending_restarts(now_monotonic=200.0)
+
+    assert controller._pending_keys() == []
+    assert len(apps_api.patches) == 2
+
+
+def test_reloader_leaves_shared_configmaps_untouched() -> None:
+    """The CM_* constants are shared across tests, so the reloader must not mutate them."""
+    snapshot = copy.deepcopy([CM_V1, CM_V2, CM_V3])
+    controller = _make_controller(apps_api=FakeAppsApi(["helloworld-test"]), debounce_seconds=60)
+
+    controller._sync_cache_from_list(FakeList(items=[CM_V1]), restart_on_change=False)
+    for tick, config_map in enumerate((CM_V2, CM_V3), start=1):
         controller.handle_configmap_event(
-            event_type="MODIFIED",
-            config_map=make_config_map(
-                app="helloworld",
-                env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "v2"},
-                resource_version="2",
-            ),
+            event_type="MODIFIED", config_map=config_map, now_monotonic=100.0 + tick
         )
+    controller._flush_pending_restarts_on_shutdown()
 
-    # First event restarts immediately; second change would be debounced
-    with patch("controller.src.controller.time.monotonic", return_value=105.0):
+    assert snapshot == [CM_V1, CM_V2, CM_V3]
+
+
+def test_debounced_counts_are_batched_until_drain(apps_api: FakeAppsApi) -> None:
+    from controller.src.metrics import METRICS
+
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=60)
+    counter = METRICS.for_env("test").debounced
+    before = counter._value.get()
+
+    for version in range(1, 5):
         controller.handle_configmap_event(
             event_type="MODIFIED",
             config_map=make_config_map(
                 app="helloworld",
                 env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "v3"},
-                resource_version="3",
+                data={"MESSAGE": f"v{version}"},
+                resource_version=str(version),
             ),
+            now_monotonic=100.0 + version,
         )
 
-    assert len(controller._pending_restarts) == 1
+    assert controller._debounced_counts == {"test": 3}
+    assert counter._value.get() == before
+
+    controller._drain_pending_restarts(now_monotonic=1000.0)
+
+    assert controller._debounced_counts == {}
+    assert counter._value.get() - before == 3
+
+
+def test_run_forever_publishes_debounced_counts_after_immediate_restart(
+    apps_api: FakeAppsApi,
+) -> None:
+    from controller.src.metrics import METRICS
+
+    shutdown_event = FakeEvent()
+    clock = Clock()
+    counter = METRICS.for_env("test").debounced
+    before = counter._value.get()
+    published: list[float] = []
+
+    def patched_stream(*args: Any, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        for version, now in enumerate((100.0, 100.1, 100.5, 100.9, 200.0), start=2):
+            clock.now = now
+            yield {
+                "type": "MODIFIED",
+                "object": make_config_map(
+                    app="helloworld",
+                    env="test",
+                    data={"MESSAGE": f"v{version}"},
+                    resource_version=str(version),
+                ),
+            }
+        published.append(counter._value.get() - before)
+        shutdown_event.set()
 
-    # Simulate shutdown after debounce window elapses
-    with patch("controller.src.controller.time.monotonic", return_value=200.0):
-        controller._drain_pending_restarts(now_monotonic=200.0)
+    mock_watcher = FakeWatcher(patched_stream)
+    controller = _make_controller(
+        apps_api=apps_api,
+        core_api=FakeCoreApi(item_sets=[[make_config_map(app="helloworld", env="test")]]),
+        debounce_seconds=1,
+        clock=clock,
+        watch_factory=lambda: mock_watcher,
+    )
+    controller.run_forever(shutdown_event=shutdown_event)
 
-    assert controller._pending_restarts == {}
-    assert len(apps_api.patches) == 2
+    # The restart at t=200 runs immediately and clears the pending key; the
+    # counts debounced since the last flush are still published before
+    # shutdown.
+    assert published == [3]
 
 
-def test_shutdown_forces_not_yet_due_pending_restarts() -> None:
+def test_shutdown_forces_not_yet_due_pending_restarts(apps_api: FakeAppsApi) -> None:
     """Pending restarts are forced during shutdown, even inside debounce."""
-    apps_api = FakeAppsApi(["helloworld-test"])
-    controller = _make_controller(apps_api=apps_api, debounce_seconds=60)
+    clock = Clock()
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=60, clock=clock)
 
     controller.handle_configmap_event(
         event_type="ADDED",
-        config_map=make_config_map(
-            app="helloworld", env="test", name="helloworld-config-test", data={"MESSAGE": "v1"}
-        ),
+        config_map=CM_V1,
     )
 
-    with patch("controller.src.controller.time.monotonic", return_value=100.0):
-        controller.handle_configmap_event(
-            event_type="MODIFIED",
-            config_map=make_config_map(
-                app="helloworld",
-                env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "v2"},
-                resource_version="2",
-            ),
-        )
+    clock.now = 100.0
+    controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_V2,
+    )
 
-    with patch("controller.src.controller.time.monotonic", return_value=105.0):
-        controller.handle_configmap_event(
-            event_type="MODIFIED",
-            config_map=make_config_map(
-                app="helloworld",
-                env="test",
-                name="helloworld-config-test",
-                data={"MESSAGE": "v3"},
-                resource_version="3",
-            ),
-        )
+    clock.now = 105.0
+    controller.handle_configmap_event(
+        event_type="MODIFIED",
+        config_map=CM_V3,
+    )
 
     assert len(apps_api.patches) == 1
-    assert len(controller._pending_restarts) == 1
+    assert len(controller._pending_keys()) == 1
 
-    with patch("controller.src.controller.time.monotonic", return_value=106.0):
-        controller._flush_pending_restarts_on_shutdown()
+    clock.now = 106.0
+    controller._flush_pending_restarts_on_shutdown()
 
     assert len(apps_api.patches) == 2
-    assert controller._pending_restarts == {}
+    assert controller._pending_keys() == []
 
 
-def test_leader_handoff_flushes_pending_restart_before_new_leader_baseline_sync() -> None:
+def test_old_leader_flushes_pending_restart_on_shutdown(apps_api: FakeAppsApi) -> None:
     """A pending restart is executed by the old leader before handoff."""
-    old_apps_api = FakeAppsApi(["helloworld-test"])
-    old_controller = _make_controller(apps_api=old_apps_api, debounce_seconds=60)
+    clock = Clock()
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=60, clock=clock)
 
-    cm_v1 = make_config_map(
-        app="helloworld",
-        env="test",
-        name="helloworld-config-test",
-        data={"MESSAGE": "v1"},
-    )
-    cm_v2 = make_config_map(
-        app="helloworld",
-        env="test",
-        name="helloworld-config-test",
-        data={"MESSAGE": "v2"},
-        resource_version="2",
-    )
-    cm_v3 = make_config_map(
-        app="helloworld",
-        env="test",
-        name="helloworld-config-test",
-        data={"MESSAGE": "v3"},
-        resource_version="3",
-    )
+    controller.handle_configmap_event(event_type="ADDED", config_map=CM_V1)
+    clock.now = 100.0
+    controller.handle_configmap_event(event_type="MODIFIED", config_map=CM_V2)
+    clock.now = 105.0
+    controller.handle_configmap_event(event_type="MODIFIED", config_map=CM_V3)
+
+    assert len(apps_api.patches) == 1
+    assert len(controller._pending_keys()) == 1
 
-    old_controller.handle_configmap_event(event_type="ADDED", config_map=cm_v1)
-    with patch("controller.src.controller.time.monotonic", return_value=100.0):
-        old_controller.handle_configmap_event(event_type="MODIFIED", config_map=cm_v2)
-    with patch("controller.src.controller.time.monotonic", return_value=105.0):
-        old_controller.handle_configmap_event(event_type="MODIFIED", config_map=cm_v3)
+    clock.now = 106.0
+    controller._flush_pending_restarts_on_shutdown()
 
-    assert len(old_apps_api.patches) == 1
-    assert len(old_controller._pending_restarts) == 1
+    assert len(apps_api.patches) == 2
+    assert controller._pending_keys() == []
 
-    with patch("controller.src.controller.time.monotonic", return_value=106.0):
-        old_controller._flush_pending_restarts_on_shutdown()
 
-    assert len(old_apps_api.patches) == 2
-    assert old_controller._pending_restarts == {}
+def test_new_leader_baseline_sync_dedupes_unchanged_data(apps_api: FakeAppsApi) -> None:
+    """The new leader's baseline sync absorbs state the old leader already rolled out."""
+    controller = _make_controller(apps_api=apps_api, debounce_seconds=60)
+    controller._sync_cache_from_list(FakeList(items=[CM_V3]), restart_on_change=False)
 
-    new_apps_api = FakeAppsApi(["helloworld-test"])
-    new_controller = _make_controller(apps_api=new_apps_api, debounce_seconds=60)
-    new_controller._sync_cache_from_list(
-        SimpleNamespace(items=[cm_v3]),
-        restart_on_change=False,
-    )
+    assert apps_api.patches == []
 
-    assert len(new_apps_api.patches) == 0
+    assert controller.handle_configmap_event(event_type="MODIFIED", config_map=CM_V3) is None
+    assert apps_api.patches == []
 
-    same_data_result = new_controller.handle_configmap_event(
-        event_type="MODIFIED",
-        config_map=cm_v3,
-    )
-    assert same_data_result is None
-    assert len(new_apps_api.patches) == 0
 
 # ---------------------------------------------------------------------------
 # Config validation tests
@@ -1393,11 +2002,11 @@ def test_leader_handoff_flushes_pending_restart_before_new_leader_baseline_sync(
 def test_build_controller_from_env_empty_namespace_raises(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("WATCH_NAMESPACE", "")
     with pytest.raises(ValueError, match="WATCH_NAMESPACE must be a non-empty string"):
-        build_controller_from_env(core_api=SimpleNamespace(), apps_api=SimpleNamespace())
+        build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
 
 
 def test_build_controller_from_env_invalid_selector_raises(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv("WATCH_NAMESPACE", raising=False)
     monkeypatch.setenv("APP_SELECTOR", "no-equals-sign")
     with pytest.raises(ValueError, match="APP_SELECTOR must contain at least one key=value pair"):
-        build_controller_from_env(core_api=SimpleNamespace(), apps_api=SimpleNamespace())
+        build_controller_from_env(core_api=_DUMMY_CORE, apps_api=_DUMMY_APPS)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from controller.src import fastpath
+from controller.src.fastpath import (
+    config_hash,
+    deployment_template_annotations,
+    dumps_json,
+    hash_data,
+    matches_labels,
+    normalize_data,
+    resource_version,
+)
+
+
+def test_normalize_data_drops_non_string_keys_and_blanks_none() -> None:
+    assert normalize_data({"A": None, "B": 1, 2: "x"}) == {"A": "", "B": "1"}
+    assert normalize_data(None) == {}
+
+
+def test_hash_data_is_128_bit_int_independent_of_key_order() -> None:
+    digest = hash_data({"b": "2", "a": "1"})
+    assert isinstance(digest, int)
+    assert 0 <= digest < 2**128
+    assert digest == hash_data({"a": "1", "b": "2"})
+
+
+def test_config_hash_is_stable_sha256_over_canonical_json() -> None:
+    # Persisted in deployment annotations, so the format must never drift.
+    assert config_hash({"b": "2", "a": "1"}) == config_hash({"a": "1", "b": "2"})
+    assert config_hash({}) == "44136fa355b3678a1146ad16f7e8649e94fb4fc21fe77e8310c060f61caaff8a"
+
+
+def _stdlib_payload(data: dict[str, str]) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def test_hash_data_uses_xxh3_when_installed() -> None:
+    xxhash = pytest.importorskip("xxhash")
+    digest = xxhash.xxh3_128()
+    for chunk in ((1).to_bytes(4, "big"), b"a", (1).to_bytes(8, "big"), b"1"):
+        digest.update(chunk)
+    assert hash_data({"a": "1"}) == int.from_bytes(digest.digest(), "big")
+
+
+def test_orjson_payload_matches_stdlib_for_printable_ascii() -> None:
+    pytest.importorskip("orjson")
+    assert fastpath._orjson_dumps is not None
+    data = {"QUOTE": 'say "hi"\n', "MESSAGE": "hello", "CONTROL": "\t\x01\\"}
+    assert fastpath._orjson_dumps(data) == _stdlib_payload(data)
+
+
+@pytest.mark.parametrize("value", ["héllo wörld", "\x7f"])
+def test_orjson_payload_diverges_from_stdlib_outside_printable_ascii(value: str) -> None:
+    # Why config_hash falls back to json.dumps for these payloads.
+    pytest.importorskip("orjson")
+    assert fastpath._orjson_dumps is not None
+    assert fastpath._orjson_dumps({"K": value}) != _stdlib_payload({"K": value})
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"MESSAGE": "hello", "QUOTE": 'say "hi"\n'},
+        {"GREETING": "héllo wörld"},
+        {"CONTROL": "\x01\x7f"},
+    ],
+)
+def test_config_hash_independent_of_serializer(
+    data: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("orjson")
+    expected = hashlib.sha256(_stdlib_payload(data)).hexdigest()
+    assert config_hash(data) == expected
+    monkeypatch.setattr(fastpath, "_orjson_dumps", None)
+    assert config_hash(data) == expected
+
+
+def test_dumps_json_is_compact_and_sorted(monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = {"test/b": "2", "prod/a": "1"}
+    accelerated = dumps_json(payload)
+    monkeypatch.setattr(fastpath, "_orjson_dumps", None)
+    assert dumps_json(payload) == accelerated == b'{"prod/a":"1","test/b":"2"}'
+
+
+def test_deployment_template_annotations_tolerates_missing_fields() -> None:
+    assert deployment_template_annotations(SimpleNamespace(spec=None)) == {}
+    deployment = SimpleNamespace(
+        spec=SimpleNamespace(
+            template=SimpleNamespace(metadata=SimpleNamespace(annotations={"k": None}))
+        )
+    )
+    assert deployment_template_annotations(deployment) == {"k": ""}
+
+
+def test_matches_labels_requires_subset() -> None:
+    required = frozenset({("app", "helloworld"), ("tier", "web")})
+    assert matches_labels({"app": "helloworld", "tier": "web", "env": "test"}, required)
+    assert not matches_labels({"app": "helloworld"}, required)
+
+
+def test_resource_version_tolerates_missing_metadata() -> None:
+    assert resource_version(SimpleNamespace(metadata=SimpleNamespace(resource_version="7"))) == "7"
+    assert resource_version(SimpleNamespace(metadata=None)) is None
+    assert resource_version(object()) is None
@@ -1,147 +1,380 @@
 from __future__ import annotations
 
+import contextlib
+import http.client
+import socket
 import threading
-import time
-import urllib.request
+from collections.abc import Iterator
+from dataclasses import dataclass
 
 import pytest
 
-from controller.src.health import start_health_server
+from controller.src import health
+from controller.src.health import HealthServer, start_health_server
 
+# Loopback answers in well under a millisecond, so a hung server fails a
+# test quickly instead of stalling it for seconds.
+_TIMEOUT = 0.2
 
-def _get(url: str, timeout: float = 2) -> tuple[int, str]:
-    """Helper to make a GET request and return (status_code, body)."""
+
+def _get(connection: http.client.HTTPConnection, path: str) -> tuple[int, str]:
+    """Send a GET over *connection* and return (status_code, body)."""
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read().decode()
+    except Exception:
+        # Drop a possibly half-read connection; the next request reconnects.
+        connection.close()
+        raise
+
+
+@dataclass
+class Served:
+    server: HealthServer
+    ready: threading.Event
+    leader: threading.Event | None
+    # Keep-alive client shared by every test using this server.
+    client: http.client.HTTPConnection
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def get(self, path: str) -> tuple[int, str]:
+        return _get(self.client, path)
+
+    def reset(self) -> None:
+        self.ready.clear()
+        if self.leader is not None:
+            self.leader.clear()
+
+
+def _serve(leader: threading.Event | None) -> Iterator[Served]:
+    ready = threading.Event()
+    server = start_health_server(ready=ready, port=0, leader=leader)
+    client = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=_TIMEOUT)
     try:
-        with urllib.request.urlopen(url, timeout=timeout) as response:  # noqa: S310
-            return response.status, response.read().decode()
-    except urllib.error.HTTPError as exc:
-        return exc.code, exc.read().decode()
-
-
-class TestHealthServerWithLeadership:
-    """Tests for the health server's leadership-aware readiness probe."""
-
-    def setup_method(self) -> None:
-        self.ready = threading.Event()
-        self.leader = threading.Event()
-        self.server = start_health_server(
-            ready=self.ready, port=0, leader=self.leader
-        )
-        self.port = self.server.server_address[1]
-        self.base_url = f"http://127.0.0.1:{self.port}"
-
-    def teardown_method(self) -> None:
-        self.server.shutdown()
-
-    def test_healthz_always_returns_200(self) -> None:
-        status, body = _get(f"{self.base_url}/healthz")
-        assert status == 200
-        assert body == "ok"
-
-    def test_readyz_returns_503_when_not_ready(self) -> None:
-        status, body = _get(f"{self.base_url}/readyz")
-        assert status == 503
-        assert "ready=false" in body
-
-    def test_readyz_returns_503_when_ready_but_not_leader(self) -> None:
-        self.ready.set()
-        status, body = _get(f"{self.base_url}/readyz")
-        assert status == 503
-        assert "leader=false" in body
-
-    def test_readyz_returns_200_when_ready_and_leader(self) -> None:
-        self.ready.set()
-        self.leader.set()
-        status, body = _get(f"{self.base_url}/readyz")
-        assert status == 200
-        assert "leader=true" in body
-
-    def test_readyz_returns_503_after_leadership_lost(self) -> None:
-        self.ready.set()
-        self.leader.set()
-        status, _ = _get(f"{self.base_url}/readyz")
-        assert status == 200
-
-        self.leader.clear()
-        status, body = _get(f"{self.base_url}/readyz")
-        assert status == 503
-        assert "leader=false" in body
-
-    def test_leadz_returns_503_when_not_leader(self) -> None:
-        status, body = _get(f"{self.base_url}/leadz")
-        assert status == 503
-        assert body == "not leader"
-
-    def test_leadz_returns_200_when_leader(self) -> None:
-        self.leader.set()
-        status, body = _get(f"{self.base_url}/leadz")
-        assert status == 200
-        assert body == "ok"
-
-    def test_404_for_unknown_path(self) -> None:
-        status, _ = _get(f"{self.base_url}/unknown")
-        assert status == 404
-
-    def test_healthz_stays_responsive_during_slow_metrics_scrape(
-        self, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        import prometheus_client
-
-        self.ready.set()
-        self.leader.set()
-
-        original_generate_latest = prometheus_client.generate_latest
-        metrics_started = threading.Event()
-
-        def slow_generate_latest() -> bytes:
-            metrics_started.set()
-            time.sleep(1.2)
-            return original_generate_latest()
-
-        monkeypatch.setattr(prometheus_client, "generate_latest", slow_generate_latest)
-
-        metrics_result: dict[str, object] = {}
-
-        def _scrape_metrics() -> None:
+        yield Served(server, ready, leader, client)
+    finally:
+        client.close()
+        server.shutdown()
+
+
+# One server per module; each test starts from ready/leader cleared.
+@pytest.fixture(scope="module")
+def _leader_election_server() -> Iterator[Served]:
+    yield from _serve(leader=threading.Event())
+
+
+@pytest.fixture(scope="module")
+def _no_leader_election_server() -> Iterator[Served]:
+    # leader=None simulates leader election disabled
+    yield from _serve(leader=None)
+
+
+@pytest.fixture
+def served(_leader_election_server: Served) -> Served:
+    _leader_election_server.reset()
+    return _leader_election_server
+
+
+@pytest.fixture
+def served_without_leader(_no_leader_election_server: Served) -> Served:
+    _no_leader_election_server.reset()
+    return _no_leader_election_server
+
+
+@pytest.fixture(scope="module")
+def _registry_snapshot() -> bytes:
+    import prometheus_client
+
+    return prometheus_client.generate_latest()
+
+
+@pytest.fixture
+def frozen_metrics(_registry_snapshot: bytes, monkeypatch: pytest.MonkeyPatch) -> bytes:
+    """Serve one registry snapshot per module instead of re-walking the registry.
+
+    Opt-in: tests that swap ``generate_latest`` themselves do not request it.
+    """
+    import prometheus_client
+
+    monkeypatch.setattr(prometheus_client, "generate_latest", lambda: _registry_snapshot)
+    monkeypatch.setattr(health, "_metrics_cache", None)
+    return _registry_snapshot
+
+
+# ---------------------------------------------------------------------------
+# Leadership-aware readiness probe
+# ---------------------------------------------------------------------------
+
+
+def test_healthz_always_returns_200(served: Served) -> None:
+    status, body = served.get("/healthz")
+    assert status == 200
+    assert body == "ok"
+
+
+def test_readyz_returns_503_when_not_ready(served: Served) -> None:
+    status, body = served.get("/readyz")
+    assert status == 503
+    assert "ready=false" in body
+
+
+def test_readyz_returns_503_when_ready_but_not_leader(served: Served) -> None:
+    served.ready.set()
+    status, body = served.get("/readyz")
+    assert status == 503
+    assert "leader=false" in body
+
+
+def test_readyz_returns_200_when_ready_and_leader(served: Served) -> None:
+    assert served.leader is not None
+    served.ready.set()
+    served.leader.set()
+    status, body = served.get("/readyz")
+    assert status == 200
+    assert "leader=true" in body
+
+
+def test_readyz_returns_503_after_leadership_lost(served: Served) -> None:
+    assert served.leader is not None
+    served.ready.set()
+    served.leader.set()
+    status, _ = served.get("/readyz")
+    assert status == 200
+
+    served.leader.clear()
+    status, body = served.get("/readyz")
+    assert status == 503
+    assert "leader=false" in body
+
+
+def test_leadz_returns_503_when_not_leader(served: Served) -> None:
+    status, body = served.get("/leadz")
+    assert status == 503
+    assert body == "not leader"
+
+
+def test_leadz_returns_200_when_leader(served: Served) -> None:
+    assert served.leader is not None
+    served.leader.set()
+    status, body = served.get("/leadz")
+    assert status == 200
+    assert body == "ok"
+
+
+def test_probes_reuse_keep_alive_connection(served: Served) -> None:
+    assert served.leader is not None
+    served.leader.set()
+    connection = http.client.HTTPConnection("127.0.0.1", served.port, timeout=_TIMEOUT)
+    try:
+        for path, expected in (("/healthz", b"ok"), ("/leadz", b"ok"), ("/unknown", b"")):
+            connection.request("GET", path)
+            response = connection.getresponse()
+            assert response.read() == expected
+            assert not response.will_close
+    finally:
+        connection.close()
+
+
+def test_probe_honours_connection_close(served: Served) -> None:
+    with socket.create_connection(("127.0.0.1", served.port), timeout=_TIMEOUT) as sock:
+        sock.sendall(b"GET /healthz HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        received = b""
+        while chunk := sock.recv(4096):
+            received += chunk
+
+    assert received.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert received.endswith(b"\r\n\r\nok")
+
+
+def test_probe_honours_mixed_case_connection_close(served: Served) -> None:
+    with socket.create_connection(("127.0.0.1", served.port), timeout=_TIMEOUT) as sock:
+        sock.sendall(b"GET /healthz HTTP/1.1\r\nHost: x\r\nConnection: CLOSE\r\n\r\n")
+        received = b""
+        while chunk := sock.recv(4096):
+            received += chunk
+
+    assert received.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert received.endswith(b"\r\n\r\nok")
+
+
+def test_connection_at_cap_evicts_oldest_idle_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Own server: connections left by other tests on the shared one may
+    # still be closing and would count against the cap.
+    monkeypatch.setattr(health, "_MAX_CONNECTIONS", 1)
+    server = start_health_server(ready=threading.Event(), port=0)
+    port = server.server_address[1]
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=_TIMEOUT) as held:
+            held.sendall(b"GET /healthz HTTP/1.1\r\nHost: x\r\n\r\n")
+            assert held.recv(4096).endswith(b"\r\n\r\nok")
+
+            extra = http.client.HTTPConnection("127.0.0.1", port, timeout=_TIMEOUT)
+            try:
+                assert _get(extra, "/healthz") == (200, "ok")
+            finally:
+                extra.close()
+            # The idle keep-alive connection gave up its slot.
+            with contextlib.suppress(ConnectionResetError):
+                assert held.recv(4096) == b""
+    finally:
+        server.shutdown()
+
+
+def test_idle_connections_at_cap_do_not_block_probes() -> None:
+    server = start_health_server(ready=threading.Event(), port=0)
+    port = server.server_address[1]
+    idle: list[socket.socket] = []
+    try:
+        for _ in range(health._MAX_CONNECTIONS):
+            sock = socket.create_connection(("127.0.0.1", port), timeout=_TIMEOUT)
+            idle.append(sock)
+            # One request each so the server has registered the connection.
+            sock.sendall(b"GET /healthz HTTP/1.1\r\nHost: x\r\n\r\n")
+            assert sock.recv(4096).endswith(b"\r\n\r\nok")
+
+        probe = http.client.HTTPConnection("127.0.0.1", port, timeout=_TIMEOUT)
+        try:
+            assert _get(probe, "/healthz") == (200, "ok")
+        finally:
+            probe.close()
+    finally:
+        for sock in idle:
+            sock.close()
+        server.shutdown()
+
+
+def test_idle_connection_is_closed_after_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(health, "_IDLE_TIMEOUT_SECONDS", 0.05)
+    server = start_health_server(ready=threading.Event(), port=0)
+    try:
+        address = ("127.0.0.1", server.server_address[1])
+        with (
+            socket.create_connection(address, timeout=1) as sock,
+            contextlib.suppress(ConnectionResetError),
+        ):
+            assert sock.recv(4096) == b""
+    finally:
+        server.shutdown()
+
+
+def test_404_for_unknown_path(served: Served) -> None:
+    status, _ = served.get("/unknown")
+    assert status == 404
+
+
+def test_non_get_method_returns_501(served: Served) -> None:
+    connection = http.client.HTTPConnection("127.0.0.1", served.port, timeout=_TIMEOUT)
+    try:
+        connection.request("POST", "/healthz", body=b"")
+        assert connection.getresponse().status == 501
+    finally:
+        connection.close()
+
+
+def test_metrics_serves_registry_exposition(served: Served, frozen_metrics: bytes) -> None:
+    status, body = served.get("/metrics")
+    assert status == 200
+    assert body.encode() == frozen_metrics
+
+
+def test_metrics_scrapes_within_ttl_share_one_serialisation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import prometheus_client
+
+    calls: list[int] = []
+
+    def counting_generate_latest() -> bytes:
+        calls.append(1)
+        return b"metric 1\n"
+
+    now = [100.0]
+    monkeypatch.setattr(prometheus_client, "generate_latest", counting_generate_latest)
+    monkeypatch.setattr(health, "_metrics_cache", None)
+
+    first = health._render_metrics(now_fn=lambda: now[0])
+    now[0] = 100.5
+    assert health._render_metrics(now_fn=lambda: now[0]) is first
+    assert len(calls) == 1
+    now[0] = 101.5
+    health._render_metrics(now_fn=lambda: now[0])
+    assert len(calls) == 2
+    assert first.endswith(b"metric 1\n")
+
+
+def test_healthz_stays_responsive_during_slow_metrics_scrape(
+    served: Served, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import prometheus_client
+
+    assert served.leader is not None
+    served.ready.set()
+    served.leader.set()
+
+    original_generate_latest = prometheus_client.generate_latest
+    metrics_started = threading.Event()
+    release = threading.Event()
+
+    def slow_generate_latest() -> bytes:
+        metrics_started.set()
+        release.wait(timeout=5)
+        return original_generate_latest()
+
+    monkeypatch.setattr(prometheus_client, "generate_latest", slow_generate_latest)
+    monkeypatch.setattr(health, "_metrics_cache", None)
+
+    metrics_result: dict[str, object] = {}
+
+    def _scrape_metrics() -> None:
+        try:
+            # Separate connection so the shared client stays free for /healthz.
+            connection = http.client.HTTPConnection("127.0.0.1", served.port, timeout=3)
             try:
-                status, _ = _get(f"{self.base_url}/metrics", timeout=3)
-                metrics_result["status"] = status
-            except Exception as exc:
-                metrics_result["error"] = exc
-
-        metrics_thread = threading.Thread(target=_scrape_metrics)
-        metrics_thread.start()
-
-        assert metrics_started.wait(timeout=1)
-        status, body = _get(f"{self.base_url}/healthz", timeout=1)
-
-        metrics_thread.join(timeout=4)
-        assert not metrics_thread.is_alive()
-        assert "error" not in metrics_result
-        assert metrics_result.get("status") == 200
-        assert status == 200
-        assert body == "ok"
-
-
-class TestHealthServerWithoutLeaderElection:
-    """When leader election is disabled, readiness should only depend on ready_event."""
-
-    def setup_method(self) -> None:
-        self.ready = threading.Event()
-        # leader=None simulates leader election disabled
-        self.server = start_health_server(ready=self.ready, port=0, leader=None)
-        self.port = self.server.server_address[1]
-        self.base_url = f"http://127.0.0.1:{self.port}"
-
-    def teardown_method(self) -> None:
-        self.server.shutdown()
-
-    def test_readyz_returns_200_when_ready_without_leader_election(self) -> None:
-        self.ready.set()
-        status, body = _get(f"{self.base_url}/readyz")
-        assert status == 200
-        assert "leader=true" in body
-
-    def test_readyz_returns_503_when_not_ready(self) -> None:
-        status, _ = _get(f"{self.base_url}/readyz")
-        assert status == 503
+                status, _ = _get(connection, "/metrics")
+            finally:
+                connection.close()
+            metrics_result["status"] = status
+        except Exception as exc:
+            metrics_result["error"] = exc
+
+    metrics_thread = threading.Thread(target=_scrape_metrics)
+    metrics_thread.start()
+
+    assert metrics_started.wait(timeout=1)
+    status, body = served.get("/healthz")
+    # /healthz answered while the scrape is still blocked; now let it finish.
+    release.set()
+
+    metrics_thread.join(timeout=4)
+    assert not metrics_thread.is_alive()
+    assert "error" not in metrics_result
+    assert metrics_result.get("status") == 200
+    assert status == 200
+    assert body == "ok"
+
+
+# ---------------------------------------------------------------------------
+# Leader election disabled: readiness depends only on the ready event
+# ---------------------------------------------------------------------------
+
+
+def test_readyz_returns_200_when_ready_without_leader_election(
+    served_without_leader: Served,
+) -> None:
+    served_without_leader.ready.set()
+    status, body = served_without_leader.get("/readyz")
+    assert status == 200
+    assert "leader=true" in body
+
+
+def test_readyz_returns_503_when_not_ready_without_leader_election(
+    served_without_leader: Served,
+) -> None:
+    status, _ = served_without_leader.get("/readyz")
+    assert status == 503
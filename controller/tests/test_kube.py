@@ -4,15 +4,39 @@ from types import SimpleNamespace
 from typing import Any
 from unittest.mock import MagicMock, patch
 
-from controller.src.kube import build_clients, load_kube_configuration, patch_deployment_restart
+from controller.src.kube import (
+    ConfigMapWatch,
+    build_clients,
+    load_kube_configuration,
+    patch_deployment_restart,
+)
+
+EXPECTED_BODY: dict[str, Any] = {
+    "spec": {
+        "template": {
+            "metadata": {"annotations": {"shipshape.io/restartedAt": "2026-01-01T00:00:00Z"}}
+        }
+    }
+}
+EXPECTED_BODY_MERGED: dict[str, Any] = {
+    "spec": {
+        "template": {
+            "metadata": {
+                "annotations": {
+                    "shipshape.io/restartedAt": "2026-01-01T00:00:00Z",
+                    "shipshape.io/config-hash-helloworld-config-test": "abc123",
+                }
+            }
+        }
+    }
+}
 
 
 def test_load_kube_configuration_in_cluster() -> None:
-    with (
-        patch("controller.src.kube.config.load_incluster_config") as mock_incluster,
-        patch("controller.src.kube.config.load_kube_config") as mock_kubeconfig,
-    ):
-        load_kube_configuration()
+    mock_incluster = MagicMock()
+    mock_kubeconfig = MagicMock()
+
+    load_kube_configuration(load_incluster=mock_incluster, load_kubeconfig=mock_kubeconfig)
 
     mock_incluster.assert_called_once()
     mock_kubeconfig.assert_not_called()
@@ -21,14 +45,10 @@ def test_load_kube_configuration_in_cluster() -> None:
 def test_load_kube_configuration_local_fallback() -> None:
     from kubernetes.config.config_exception import ConfigException
 
-    with (
-        patch(
-            "controller.src.kube.config.load_incluster_config",
-            side_effect=ConfigException("not in cluster"),
-        ),
-        patch("controller.src.kube.config.load_kube_config") as mock_kubeconfig,
-    ):
-        load_kube_configuration()
+    mock_incluster = MagicMock(side_effect=ConfigException("not in cluster"))
+    mock_kubeconfig = MagicMock()
+
+    load_kube_configuration(load_incluster=mock_incluster, load_kubeconfig=mock_kubeconfig)
 
     mock_kubeconfig.assert_called_once()
 
@@ -58,9 +78,7 @@ def test_patch_deployment_restart_sends_correct_body() -> None:
     call_kwargs = mock_apps_api.patch_namespaced_deployment.call_args
     assert call_kwargs.kwargs["name"] == "helloworld-test"
     assert call_kwargs.kwargs["namespace"] == "shipshape"
-    body: dict[str, Any] = call_kwargs.kwargs["body"]
-    annotations = body["spec"]["template"]["metadata"]["annotations"]
-    assert annotations["shipshape.io/restartedAt"] == "2026-01-01T00:00:00Z"
+    assert call_kwargs.kwargs["body"] == EXPECTED_BODY
 
 
 def test_patch_deployment_restart_merges_extra_annotations() -> None:
@@ -75,7 +93,47 @@ def test_patch_deployment_restart_merges_extra_annotations() -> None:
         extra_annotations={"shipshape.io/config-hash-helloworld-config-test": "abc123"},
     )
 
-    body: dict[str, Any] = mock_apps_api.patch_namespaced_deployment.call_args.kwargs["body"]
-    annotations = body["spec"]["template"]["metadata"]["annotations"]
-    assert annotations["shipshape.io/restartedAt"] == "2026-01-01T00:00:00Z"
-    assert annotations["shipshape.io/config-hash-helloworld-config-test"] == "abc123"
+    body = mock_apps_api.patch_namespaced_deployment.call_args.kwargs["body"]
+    assert body == EXPECTED_BODY_MERGED
+
+
+def test_configmap_watch_decodes_events_into_lightweight_view() -> None:
+    watcher = ConfigMapWatch()
+    line = (
+        '{"type":"MODIFIED","object":{"kind":"ConfigMap","metadata":{"name":"cfg",'
+        '"labels":{"app":"helloworld","env":"test"},"resourceVersion":"42"},'
+        '"data":{"MESSAGE":"hi"}}}'
+    )
+
+    event = watcher.unmarshal_event(line, return_type="V1ConfigMap")
+
+    assert event is not None
+    config_map = event["object"]
+    assert config_map.metadata.name == "cfg"
+    assert config_map.metadata.labels == {"app": "helloworld", "env": "test"}
+    assert config_map.metadata.resource_version == "42"
+    assert config_map.data == {"MESSAGE": "hi"}
+    assert watcher.resource_version == "42"
+    assert event["raw_object"] is None
+
+
+def test_configmap_watch_keeps_raw_error_events() -> None:
+    watcher = ConfigMapWatch()
+
+    event = watcher.unmarshal_event(
+        '{"type":"ERROR","object":{"code":410,"reason":"Gone","message":"too old"}}',
+        return_type="V1ConfigMap",
+    )
+
+    assert event is not None
+    assert event["raw_object"]["code"] == 410
+    assert watcher.unmarshal_event("not json", return_type=None) is None
+
+
+def test_configmap_watch_reset_rearms_stopped_watcher() -> None:
+    watcher = ConfigMapWatch()
+    watcher.stop()
+
+    watcher.reset()
+
+    assert watcher._stop is False
@@ -1,16 +1,116 @@
 from __future__ import annotations
 
-import threading
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 from kubernetes.client import V1Lease, V1LeaseSpec, V1ObjectMeta
 from kubernetes.client.exceptions import ApiException
+from prometheus_client import CollectorRegistry
 
 from controller.src.leader import LeaseLeaderElector, default_identity
-from controller.src.metrics import METRICS
+from controller.src.metrics import ControllerMetrics
+from controller.tests.fakes import FakeEvent
+
+# Private registry so leader tests never touch the process-wide metrics.
+_METRICS = ControllerMetrics.create(CollectorRegistry())
+
+
+def _lease(metadata: V1ObjectMeta, **spec: Any) -> V1Lease:
+    return V1Lease(metadata=metadata, spec=V1LeaseSpec(**spec))
+
+
+def _ok(**kwargs: Any) -> None:
+    return None
+
+
+def _raising(exc: Exception) -> Callable[..., Any]:
+    def handler(**kwargs: Any) -> Any:
+        raise exc
+
+    return handler
+
+
+def _returning(*values: Any) -> Callable[..., Any]:
+    """Answer successive calls with *values*, repeating the last one."""
+    remaining = list(values)
+
+    def handler(**kwargs: Any) -> Any:
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return handler
+
+
+# Raised from shared instances: tests only inspect the status.
+_NOT_FOUND = ApiException(status=404, reason="Not Found")
+_CONFLICT = ApiException(status=409, reason="Conflict")
+
+_not_found = _raising(_NOT_FOUND)
+
+
+class FakeCoordinationAPI:
+    """Coordination API stub: each verb records its call and defers to a handler.
+
+    Reads record their kwargs; writes record only the ``body`` they sent.
+
+    Handlers are plain attributes so tests swap them directly; reads default
+    to 404 (no lease yet) and writes succeed.
+    """
+
+    __slots__ = (
+        "create",
+        "create_bodies",
+        "patch",
+        "patch_bodies",
+        "read",
+        "read_calls",
+        "replace",
+        "replace_bodies",
+    )
+
+    def __init__(self, read: Callable[..., Any] = _not_found) -> None:
+        self.read = read
+        self.create: Callable[..., Any] = _ok
+        self.replace: Callable[..., Any] = _ok
+        self.patch: Callable[..., Any] = _ok
+        self.read_calls: list[dict[str, Any]] = []
+        self.create_bodies: list[Any] = []
+        self.replace_bodies: list[Any] = []
+        self.patch_bodies: list[Any] = []
+
+    def read_namespaced_lease(self, **kwargs: Any) -> Any:
+        self.read_calls.append(kwargs)
+        return self.read(**kwargs)
+
+    def create_namespaced_lease(self, **kwargs: Any) -> Any:
+        self.create_bodies.append(kwargs["body"])
+        return self.create(**kwargs)
+
+    def replace_namespaced_lease(self, **kwargs: Any) -> Any:
+        self.replace_bodies.append(kwargs["body"])
+        return self.replace(**kwargs)
+
+    def patch_namespaced_lease(self, **kwargs: Any) -> Any:
+        self.patch_bodies.append(kwargs["body"])
+        return self.patch(**kwargs)
+
+
+# Every elector reads this instead of the wall clock; the exact instant is
+# irrelevant as long as lease timestamps are built relative to it.
+_FROZEN_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture(scope="module")
+def frozen_now() -> datetime:
+    return _FROZEN_NOW
+
+
+@pytest.fixture(scope="module")
+def lease_meta() -> V1ObjectMeta:
+    # Never mutated by the elector, so every lease in the module can share it.
+    return V1ObjectMeta(name="test-lease", namespace="shipshape")
 
 
 def _make_elector(
@@ -21,116 +121,167 @@ def _make_elector(
     lease_duration_seconds: int = 15,
     renew_deadline_seconds: int = 10,
     retry_period_seconds: int = 0,
+    now: datetime = _FROZEN_NOW,
+    metrics: ControllerMetrics = _METRICS,
 ) -> LeaseLeaderElector:
     return LeaseLeaderElector(
-        coordination_api=coordination_api or MagicMock(),
+        coordination_api=coordination_api or FakeCoordinationAPI(),
         namespace=namespace,
         lease_name=lease_name,
         identity=identity,
         lease_duration_seconds=lease_duration_seconds,
         renew_deadline_seconds=renew_deadline_seconds,
         retry_period_seconds=retry_period_seconds,
+        now_fn=lambda: now,
+        metrics=metrics,
     )
 
 
-def test_creates_lease_when_not_found() -> None:
-    api = MagicMock()
-    api.read_namespaced_lease.side_effect = ApiException(status=404, reason="Not Found")
-    api.create_namespaced_lease.return_value = None
+@pytest.fixture(scope="module")
+def _standby() -> LeaseLeaderElector:
+    return _make_elector(identity="pod-1")
 
-    elector = _make_elector(coordination_api=api, identity="pod-1")
-    result = elector._try_acquire_or_renew()
+
+@pytest.fixture
+def standby_elector(_standby: LeaseLeaderElector) -> Callable[[Any], LeaseLeaderElector]:
+    """Bind the module's shared non-leader elector to a test's API stub.
+
+    ``_try_acquire_or_renew`` leaves the elector itself untouched while it
+    is not leading, so single-cycle standby tests need not build their own.
+    """
+
+    def bind(api: Any) -> LeaseLeaderElector:
+        _standby.coordination_api = api
+        return _standby
+
+    return bind
+
+
+def test_creates_lease_when_not_found(standby_elector: Callable[[Any], LeaseLeaderElector]) -> None:
+    api = FakeCoordinationAPI()
+
+    result = standby_elector(api)._try_acquire_or_renew()
 
     assert result is True
-    api.create_namespaced_lease.assert_called_once()
-    body = api.create_namespaced_lease.call_args.kwargs["body"]
+    assert len(api.create_bodies) == 1
+    body = api.create_bodies[0]
     assert body.spec.holder_identity == "pod-1"
 
 
-def test_renews_lease_when_already_holder() -> None:
-    now = datetime.now(UTC)
-    existing = V1Lease(
-        metadata=V1ObjectMeta(name="test-lease", namespace="shipshape"),
-        spec=V1LeaseSpec(
-            holder_identity="pod-1",
-            lease_duration_seconds=15,
-            renew_time=now - timedelta(seconds=5),
-            acquire_time=now - timedelta(seconds=30),
-        ),
+def test_renews_lease_when_already_holder(
+    frozen_now: datetime,
+    lease_meta: V1ObjectMeta,
+    standby_elector: Callable[[Any], LeaseLeaderElector],
+) -> None:
+    existing = _lease(
+        lease_meta,
+        holder_identity="pod-1",
+        lease_duration_seconds=15,
+        renew_time=frozen_now - timedelta(seconds=5),
+        acquire_time=frozen_now - timedelta(seconds=30),
     )
-    api = MagicMock()
-    api.read_namespaced_lease.return_value = existing
-    api.replace_namespaced_lease.return_value = None
+    api = FakeCoordinationAPI(read=_returning(existing))
 
-    elector = _make_elector(coordination_api=api, identity="pod-1")
-    result = elector._try_acquire_or_renew()
+    result = standby_elector(api)._try_acquire_or_renew()
 
     assert result is True
-    api.replace_namespaced_lease.assert_called_once()
-
-
-def test_does_not_acquire_when_another_holder_active() -> None:
-    now = datetime.now(UTC)
-    existing = V1Lease(
-        metadata=V1ObjectMeta(name="test-lease", namespace="shipshape"),
-        spec=V1LeaseSpec(
-            holder_identity="pod-2",
-            lease_duration_seconds=15,
-            renew_time=now - timedelta(seconds=2),
-            acquire_time=now - timedelta(seconds=10),
-        ),
-    )
-    api = MagicMock()
-    api.read_namespaced_lease.return_value = existing
+    assert len(api.replace_bodies) == 1
+
 
+def test_leader_renews_with_single_guarded_patch() -> None:
+    api = FakeCoordinationAPI()
     elector = _make_elector(coordination_api=api, identity="pod-1")
-    result = elector._try_acquire_or_renew()
+    elector._is_leader = True
+
+    assert elector._try_acquire_or_renew() is True
+
+    assert api.read_calls == []
+    assert api.replace_bodies == []
+    body = api.patch_bodies[-1]
+    assert body[0] == {"op": "test", "path": "/spec/holderIdentity", "value": "pod-1"}
+    assert body[1]["path"] == "/spec/renewTime"
+    assert body[1]["value"].endswith("Z")
+
+
+def test_leader_falls_back_to_read_when_renew_patch_rejected(
+    frozen_now: datetime, lease_meta: V1ObjectMeta
+) -> None:
+    api = FakeCoordinationAPI(
+        read=_returning(
+            _lease(
+                lease_meta,
+                holder_identity="pod-2",
+                lease_duration_seconds=15,
+                renew_time=frozen_now,
+            )
+        )
+    )
+    api.patch = _raising(ApiException(status=422, reason="test failed"))
+    elector = _make_elector(coordination_api=api, identity="pod-1", now=frozen_now)
+    elector._is_leader = True
+
+    assert elector._try_acquire_or_renew() is False
+    assert len(api.read_calls) == 1
+    assert api.replace_bodies == []
+
+
+def test_does_not_acquire_when_another_holder_active(
+    frozen_now: datetime,
+    lease_meta: V1ObjectMeta,
+    standby_elector: Callable[[Any], LeaseLeaderElector],
+) -> None:
+    existing = _lease(
+        lease_meta,
+        holder_identity="pod-2",
+        lease_duration_seconds=15,
+        renew_time=frozen_now - timedelta(seconds=2),
+        acquire_time=frozen_now - timedelta(seconds=10),
+    )
+    api = FakeCoordinationAPI(read=_returning(existing))
+
+    result = standby_elector(api)._try_acquire_or_renew()
 
     assert result is False
-    api.replace_namespaced_lease.assert_not_called()
-
-
-def test_acquires_expired_lease_from_another_holder() -> None:
-    now = datetime.now(UTC)
-    existing = V1Lease(
-        metadata=V1ObjectMeta(name="test-lease", namespace="shipshape"),
-        spec=V1LeaseSpec(
-            holder_identity="pod-2",
-            lease_duration_seconds=15,
-            renew_time=now - timedelta(seconds=60),
-            acquire_time=now - timedelta(seconds=120),
-        ),
+    assert api.replace_bodies == []
+
+
+def test_acquires_expired_lease_from_another_holder(
+    frozen_now: datetime,
+    lease_meta: V1ObjectMeta,
+    standby_elector: Callable[[Any], LeaseLeaderElector],
+) -> None:
+    existing = _lease(
+        lease_meta,
+        holder_identity="pod-2",
+        lease_duration_seconds=15,
+        renew_time=frozen_now - timedelta(seconds=60),
+        acquire_time=frozen_now - timedelta(seconds=120),
     )
-    api = MagicMock()
-    api.read_namespaced_lease.return_value = existing
-    api.replace_namespaced_lease.return_value = None
+    api = FakeCoordinationAPI(read=_returning(existing))
 
-    elector = _make_elector(coordination_api=api, identity="pod-1")
-    result = elector._try_acquire_or_renew()
+    result = standby_elector(api)._try_acquire_or_renew()
 
     assert result is True
 
 
-def test_handles_409_conflict_on_create() -> None:
-    api = MagicMock()
-    api.read_namespaced_lease.side_effect = ApiException(status=404, reason="Not Found")
-    api.create_namespaced_lease.side_effect = ApiException(status=409, reason="Conflict")
+def test_handles_409_conflict_on_create(
+    standby_elector: Callable[[Any], LeaseLeaderElector],
+) -> None:
+    api = FakeCoordinationAPI()
+    api.create = _raising(_CONFLICT)
 
-    elector = _make_elector(coordination_api=api, identity="pod-1")
-    result = elector._try_acquire_or_renew()
+    result = standby_elector(api)._try_acquire_or_renew()
 
     assert result is False
 
 
 def test_run_calls_on_started_leading() -> None:
-    api = MagicMock()
-    api.read_namespaced_lease.side_effect = ApiException(status=404, reason="Not Found")
-    api.create_namespaced_lease.return_value = None
+    api = FakeCoordinationAPI()
 
     elector = _make_elector(coordination_api=api, identity="pod-1", retry_period_seconds=0)
 
-    stop = threading.Event()
-    started = threading.Event()
+    stop = FakeEvent()
+    started = FakeEvent()
 
     def on_started() -> None:
         started.set()
@@ -146,78 +297,72 @@ def test_run_calls_on_started_leading() -> None:
     assert not elector.is_leader  # Stopped leading after stop_event
 
 
-def test_acquire_time_updated_on_takeover() -> None:
+def test_acquire_time_updated_on_takeover(
+    frozen_now: datetime,
+    lease_meta: V1ObjectMeta,
+    standby_elector: Callable[[Any], LeaseLeaderElector],
+) -> None:
     """When taking over a lease from another holder, acquire_time must be refreshed."""
-    now = datetime.now(UTC)
-    old_acquire = now - timedelta(seconds=120)
-    existing = V1Lease(
-        metadata=V1ObjectMeta(name="test-lease", namespace="shipshape"),
-        spec=V1LeaseSpec(
-            holder_identity="pod-2",
-            lease_duration_seconds=15,
-            renew_time=now - timedelta(seconds=60),
-            acquire_time=old_acquire,
-        ),
+    old_acquire = frozen_now - timedelta(seconds=120)
+    existing = _lease(
+        lease_meta,
+        holder_identity="pod-2",
+        lease_duration_seconds=15,
+        renew_time=frozen_now - timedelta(seconds=60),
+        acquire_time=old_acquire,
     )
-    api = MagicMock()
-    api.read_namespaced_lease.return_value = existing
-    api.replace_namespaced_lease.return_value = None
+    api = FakeCoordinationAPI(read=_returning(existing))
 
-    elector = _make_elector(coordination_api=api, identity="pod-1")
-    result = elector._try_acquire_or_renew()
+    result = standby_elector(api)._try_acquire_or_renew()
 
     assert result is True
-    body = api.replace_namespaced_lease.call_args.kwargs["body"]
+    body = api.replace_bodies[-1]
     # acquire_time must be updated (not the stale old_acquire from pod-2)
     assert body.spec.acquire_time != old_acquire
     assert body.spec.holder_identity == "pod-1"
 
 
-def test_acquire_time_preserved_on_renewal() -> None:
+def test_acquire_time_preserved_on_renewal(
+    frozen_now: datetime,
+    lease_meta: V1ObjectMeta,
+    standby_elector: Callable[[Any], LeaseLeaderElector],
+) -> None:
     """When renewing our own lease, acquire_time must not change."""
-    now = datetime.now(UTC)
-    original_acquire = now - timedelta(seconds=30)
-    existing = V1Lease(
-        metadata=V1ObjectMeta(name="test-lease", namespace="shipshape"),
-        spec=V1LeaseSpec(
-            holder_identity="pod-1",
-            lease_duration_seconds=15,
-            renew_time=now - timedelta(seconds=5),
-            acquire_time=original_acquire,
-        ),
+    original_acquire = frozen_now - timedelta(seconds=30)
+    existing = _lease(
+        lease_meta,
+        holder_identity="pod-1",
+        lease_duration_seconds=15,
+        renew_time=frozen_now - timedelta(seconds=5),
+        acquire_time=original_acquire,
     )
-    api = MagicMock()
-    api.read_namespaced_lease.return_value = existing
-    api.replace_namespaced_lease.return_value = None
+    api = FakeCoordinationAPI(read=_returning(existing))
 
-    elector = _make_elector(coordination_api=api, identity="pod-1")
-    result = elector._try_acquire_or_renew()
+    result = standby_elector(api)._try_acquire_or_renew()
 
     assert result is True
-    body = api.replace_namespaced_lease.call_args.kwargs["body"]
+    body = api.replace_bodies[-1]
     # acquire_time must be preserved (we are renewing, not acquiring)
     assert body.spec.acquire_time == original_acquire
 
 
 def test_non_api_exception_does_not_crash_election_loop() -> None:
     """Verify that a non-ApiException from the coordination API doesn't crash the loop."""
-    api = MagicMock()
     call_count = 0
 
-    def flaky_read(*args: Any, **kwargs: Any) -> Any:
+    def flaky_read(**kwargs: Any) -> Any:
         nonlocal call_count
         call_count += 1
         if call_count == 1:
             raise ConnectionError("network blip")
-        raise ApiException(status=404, reason="Not Found")
+        raise _NOT_FOUND
 
-    api.read_namespaced_lease.side_effect = flaky_read
-    api.create_namespaced_lease.return_value = None
+    api = FakeCoordinationAPI(read=flaky_read)
 
     elector = _make_elector(coordination_api=api, identity="pod-1", retry_period_seconds=0)
 
-    stop = threading.Event()
-    started = threading.Event()
+    stop = FakeEvent()
+    started = FakeEvent()
 
     def on_started() -> None:
         started.set()
@@ -233,38 +378,35 @@ def test_non_api_exception_does_not_crash_election_loop() -> None:
     assert started.is_set()
 
 
-def test_release_lease_on_shutdown() -> None:
+def test_release_lease_on_shutdown(frozen_now: datetime, lease_meta: V1ObjectMeta) -> None:
     """Verify the lease holderIdentity is cleared on graceful shutdown."""
-    now = datetime.now(UTC)
-    existing = V1Lease(
-        metadata=V1ObjectMeta(name="test-lease", namespace="shipshape"),
-        spec=V1LeaseSpec(
-            holder_identity="pod-1",
-            lease_duration_seconds=15,
-            renew_time=now,
-            acquire_time=now,
-        ),
+    existing = _lease(
+        lease_meta,
+        holder_identity="pod-1",
+        lease_duration_seconds=15,
+        renew_time=frozen_now,
+        acquire_time=frozen_now,
     )
-    api = MagicMock()
-    api.read_namespaced_lease.side_effect = [
-        # First call: _try_acquire_or_renew reads and renews
-        existing,
-        # Second call: _release_lease reads and clears
-        V1Lease(
-            metadata=V1ObjectMeta(name="test-lease", namespace="shipshape"),
-            spec=V1LeaseSpec(
+    api = FakeCoordinationAPI(
+        read=_returning(
+            # First call: _try_acquire_or_renew reads and renews
+            existing,
+            # Second call: _release_lease reads and clears
+            _lease(
+                lease_meta,
                 holder_identity="pod-1",
                 lease_duration_seconds=15,
-                renew_time=now,
-                acquire_time=now,
+                renew_time=frozen_now,
+                acquire_time=frozen_now,
             ),
-        ),
-    ]
-    api.replace_namespaced_lease.return_value = None
+        )
+    )
 
-    elector = _make_elector(coordination_api=api, identity="pod-1", retry_period_seconds=0)
+    elector = _make_elector(
+        coordination_api=api, identity="pod-1", retry_period_seconds=0, now=frozen_now
+    )
 
-    stop = threading.Event()
+    stop = FakeEvent()
 
     def on_started() -> None:
         stop.set()
@@ -276,8 +418,7 @@ def test_release_lease_on_shutdown() -> None:
     )
 
     # The last replace call should have cleared holderIdentity (lease release)
-    last_replace_call = api.replace_namespaced_lease.call_args_list[-1]
-    released_body = last_replace_call.kwargs["body"]
+    released_body = api.replace_bodies[-1]
     assert released_body.spec.holder_identity is None
 
 
@@ -307,105 +448,103 @@ def test_constructor_rejects_invalid_timing_relationships() -> None:
         _make_elector(lease_duration_seconds=15, renew_deadline_seconds=5, retry_period_seconds=5)
 
 
-def test_loses_leadership_after_renew_deadline_expires() -> None:
-    elector = _make_elector(renew_deadline_seconds=1, retry_period_seconds=0)
-    stop = threading.Event()
-    stopped_calls = 0
-
-    def on_started() -> None:
-        return None
-
-    def on_stopped() -> None:
-        nonlocal stopped_calls
-        stopped_calls += 1
-        stop.set()
-
-    with (
-        pytest.MonkeyPatch.context() as mp,
-        patch.object(elector, "_try_acquire_or_renew", side_effect=[True, False]),
-        patch.object(elector, "_release_lease") as release_mock,
-    ):
-        mp.setattr(
-            "controller.src.leader.time.monotonic",
-            MagicMock(side_effect=[0.0, 0.1, 1.5, 1.6]),
-        )
-        elector.run(
-            on_started_leading=on_started,
-            on_stopped_leading=on_stopped,
-            stop_event=stop,
-        )
-
-    assert stopped_calls == 1
-    release_mock.assert_not_called()
+def test_standby_poll_is_jittered_but_leader_renews_on_exact_period(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    elector = _make_elector(renew_deadline_seconds=5, retry_period_seconds=2)
+    elector._rng = MagicMock(random=MagicMock(return_value=0.5))
+    stop = MagicMock()
+    stop.is_set.side_effect = [False, False, True]
 
+    monkeypatch.setattr(elector, "_try_acquire_or_renew", iter([False, True]).__next__)
+    monkeypatch.setattr(elector, "_release_lease", lambda: None)
+    elector.run(
+        on_started_leading=lambda: None,
+        on_stopped_leading=lambda: None,
+        stop_event=stop,
+    )
 
-def test_keeps_leadership_when_failure_is_within_renew_deadline() -> None:
-    elector = _make_elector(renew_deadline_seconds=3, retry_period_seconds=0)
-    stop = threading.Event()
+    timeouts = [c.kwargs["timeout"] for c in stop.wait.call_args_list]
+    assert timeouts == [pytest.approx(2.2), 2]
+
+
+@pytest.mark.parametrize(
+    ("renew_deadline_seconds", "monotonic_ns", "expect_release"),
+    [
+        # Renewal fails 1.4s after acquiring with a 1s deadline: leadership lost.
+        (1, [0, 100_000_000, 1_500_000_000, 1_600_000_000], False),
+        # Elapsed exactly equal to the deadline also counts as lost.
+        (1, [0, 0, 1_000_000_000, 1_000_000_000], False),
+        # Failure 0.4s in with a 3s deadline: still leader, released on shutdown.
+        (3, [0, 100_000_000, 500_000_000], True),
+    ],
+    ids=["deadline-expired", "deadline-exact", "within-deadline"],
+)
+def test_renew_failure_after_acquire_respects_renew_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+    renew_deadline_seconds: int,
+    monotonic_ns: list[int],
+    expect_release: bool,
+) -> None:
+    elector = _make_elector(renew_deadline_seconds=renew_deadline_seconds, retry_period_seconds=0)
+    stop = FakeEvent()
     stopped_calls = 0
 
-    def on_started() -> None:
-        return None
-
     def on_stopped() -> None:
         nonlocal stopped_calls
         stopped_calls += 1
 
-    calls = 0
+    results = iter([True, False])
 
     def try_cycle() -> bool:
-        nonlocal calls
-        calls += 1
-        if calls == 1:
-            return True
-        stop.set()
-        return False
-
-    with (
-        pytest.MonkeyPatch.context() as mp,
-        patch.object(elector, "_try_acquire_or_renew", side_effect=try_cycle),
-        patch.object(elector, "_release_lease") as release_mock,
-    ):
-        mp.setattr("controller.src.leader.time.monotonic", MagicMock(side_effect=[0.0, 0.1, 0.5]))
-        elector.run(
-            on_started_leading=on_started,
-            on_stopped_leading=on_stopped,
-            stop_event=stop,
-        )
+        # Acquire, then fail one renewal and stop after that cycle.
+        acquired = next(results)
+        if not acquired:
+            stop.set()
+        return acquired
+
+    monkeypatch.setattr("controller.src.leader.time.monotonic_ns", iter(monotonic_ns).__next__)
+    monkeypatch.setattr(elector, "_try_acquire_or_renew", try_cycle)
+    releases: list[None] = []
+    monkeypatch.setattr(elector, "_release_lease", lambda: releases.append(None))
+    elector.run(
+        on_started_leading=lambda: None,
+        on_stopped_leading=on_stopped,
+        stop_event=stop,
+    )
 
     assert stopped_calls == 1
-    release_mock.assert_called_once()
-
-
-def test_leader_metrics_track_acquire_latency_and_transitions() -> None:
-    api = MagicMock()
-    api.read_namespaced_lease.side_effect = ApiException(status=404, reason="Not Found")
-    api.create_namespaced_lease.return_value = None
-
-    elector = _make_elector(coordination_api=api, identity="pod-1", retry_period_seconds=0)
-
-    stop = threading.Event()
-
-    acquired_before = METRICS.leader_transitions_total.labels(transition="acquired")._value.get()
-    lost_before = METRICS.leader_transitions_total.labels(transition="lost")._value.get()
-    latency_sum_before = METRICS.leader_acquire_latency_seconds._sum.get()
+    assert releases == ([None] if expect_release else [])
+    assert not elector.is_leader
+
+
+def test_leader_metrics_track_acquire_latency_and_transitions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    metrics = ControllerMetrics.create(CollectorRegistry())
+    elector = _make_elector(
+        coordination_api=FakeCoordinationAPI(),
+        identity="pod-1",
+        retry_period_seconds=0,
+        metrics=metrics,
+    )
+    stop = FakeEvent()
 
     def on_started() -> None:
         stop.set()
 
-    with pytest.MonkeyPatch.context() as mp:
-        mp.setattr("controller.src.leader.time.monotonic", MagicMock(side_effect=[10.0, 14.0]))
-        elector.run(
-            on_started_leading=on_started,
-            on_stopped_leading=lambda: None,
-            stop_event=stop,
-        )
-
-    acquired_after = METRICS.leader_transitions_total.labels(transition="acquired")._value.get()
-    lost_after = METRICS.leader_transitions_total.labels(transition="lost")._value.get()
-    latency_sum_after = METRICS.leader_acquire_latency_seconds._sum.get()
+    monkeypatch.setattr(
+        "controller.src.leader.time.monotonic_ns",
+        iter([10_000_000_000, 14_000_000_000]).__next__,
+    )
+    elector.run(
+        on_started_leading=on_started,
+        on_stopped_leading=lambda: None,
+        stop_event=stop,
+    )
 
-    assert acquired_after - acquired_before == 1
-    assert lost_after - lost_before == 1
-    assert latency_sum_after - latency_sum_before == pytest.approx(4.0)
-    assert METRICS.leader_state._value.get() == 0
+    transitions = metrics.leader_transitions_total
+    assert transitions.labels(transition="acquired")._value.get() == 1
+    assert transitions.labels(transition="lost")._value.get() == 1
+    assert metrics.leader_acquire_latency_seconds._sum.get() == pytest.approx(4.0)
+    assert metrics.leader_state._value.get() == 0
@@ -149,6 +149,7 @@ class TestMainEntrypoint:
 
         mock_controller = MagicMock()
         mock_controller.ready = threading.Event()
+        mock_controller.hash_state_path = "/state/hash-state.json"
 
         # run_forever should set the shutdown event to exit immediately
         def fake_run_forever(shutdown_event: threading.Event | None = None) -> None:
@@ -173,6 +174,7 @@ class TestMainEntrypoint:
             main()
 
         mock_controller.run_forever.assert_called_once()
+        assert mock_controller.hash_state_path == "/state/hash-state.json"
         assert mock_health.call_args.kwargs["leader"] is None
         mock_health.return_value.shutdown.assert_called_once()
 
@@ -187,6 +189,7 @@ class TestMainEntrypoint:
 
         mock_controller = MagicMock()
         mock_controller.ready = threading.Event()
+        mock_controller.hash_state_path = "/state/hash-state.json"
 
         def fake_run_forever(shutdown_event: threading.Event | None = None) -> None:
             if shutdown_event is not None:
@@ -236,6 +239,8 @@ class TestMainEntrypoint:
         assert ctor_kwargs["lease_duration_seconds"] == 20
         assert ctor_kwargs["renew_deadline_seconds"] == 12
         assert ctor_kwargs["retry_period_seconds"] == 3
+        # A term-less hash state file is unsafe across leadership changes.
+        assert mock_controller.hash_state_path is None
         mock_health.return_value.shutdown.assert_called_once()
 
     def test_main_registers_signal_handlers(self, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -311,7 +316,7 @@ class TestMainEntrypoint:
             ),
             patch(
                 "controller.src.__main__.build_controller_from_env",
-                return_value=SimpleNamespace(ready=threading.Event()),
+                return_value=SimpleNamespace(ready=threading.Event(), hash_state_path=None),
             ),
             patch("controller.src.__main__.start_health_server") as mock_health,
         ):
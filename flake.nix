@@ -45,7 +45,7 @@
             ];
             shellHook = ''
               export PIP_DISABLE_PIP_VERSION_CHECK=1
-              echo "Shipshape dev shell ready. Run: uv sync --extra dev"
+              echo "Shipshape dev shell ready. Run: uv sync --extra dev --extra speedups"
             '';
           };
         }
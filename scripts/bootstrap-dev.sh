@@ -265,7 +265,7 @@ log "Installing Python dependencies using uv in the Nix dev shell."
 nix_cmd develop "${REPO_ROOT}" --command env REPO_ROOT="${REPO_ROOT}" bash -lc '
   set -euo pipefail
   cd "$REPO_ROOT"
-  uv sync --extra dev
+  uv sync --extra dev --extra speedups
 '
 
 if [[ "${SKIP_VERIFY}" -eq 0 ]]; then
@@ -130,7 +130,7 @@ log "Running CI-core checks (lint, typecheck, metadata, coverage, manifests)."
 nix_cmd develop "${REPO_ROOT}" --command env REPO_ROOT="${REPO_ROOT}" bash -lc '
   set -euo pipefail
   cd "$REPO_ROOT"
-  uv sync --extra dev
+  uv sync --extra dev --extra speedups
   if command -v make >/dev/null 2>&1; then
     make check-ci-core
   elif command -v gmake >/dev/null 2>&1; then